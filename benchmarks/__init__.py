@@ -0,0 +1 @@
+"""Command-line benchmarks for the SmartCart engines (run from the repository root)."""
@@ -0,0 +1,47 @@
+"""Co-occurrence build time and memory, and related-item lookup latency, over streamed baskets.
+
+Usage: python -m benchmarks.basket_affinity --baskets 50000000 --skus 20000
+"""
+import argparse
+import resource
+import time
+
+import numpy as np
+
+from smartcart import affinity, datagen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baskets', type=int, default=50_000_000)
+    parser.add_argument('--skus', type=int, default=20_000)
+    parser.add_argument('--chunk-baskets', type=int, default=affinity.DEFAULT_CHUNK_BASKETS)
+    parser.add_argument('--k', type=int, default=affinity.DEFAULT_TOP_K)
+    parser.add_argument('--queries', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = datagen.SizeConfig(n_skus=args.skus)
+    chunks = affinity.iter_basket_chunks(config, args.seed, n_baskets=args.baskets, chunk_baskets=args.chunk_baskets)
+    start = time.perf_counter()
+    matrix = affinity.build_cooccurrence(chunks, args.skus)
+    seconds = time.perf_counter() - start
+    print(f"build:   {args.baskets:,} baskets in {seconds:.1f}s ({args.baskets / seconds:,.0f} baskets/s)")
+    print(f"         {len(matrix.indices):,} stored pairs, {matrix.nbytes / 2 ** 20:,.0f} MB matrix")
+
+    start = time.perf_counter()
+    index = matrix.top_k(args.k)
+    print(f"top-{args.k}:  index in {time.perf_counter() - start:.2f}s")
+
+    skus = np.random.default_rng(args.seed).integers(0, args.skus, args.queries)
+    start = time.perf_counter()
+    for sku in skus:
+        index.related(sku)
+    seconds = time.perf_counter() - start
+    print(f"lookup:  {seconds / args.queries * 1e6:.1f} us per query")
+    # ru_maxrss is in KiB on Linux
+    print(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 20:,.2f} GB")
+
+
+if __name__ == '__main__':
+    main()
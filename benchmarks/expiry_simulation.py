@@ -0,0 +1,35 @@
+"""Expiry and wastage simulation time over a full store x SKU catalogue.
+
+Usage: python -m benchmarks.expiry_simulation --stores 500 --skus 10000 --days 90
+"""
+import argparse
+import time
+
+from benchmarks.inventory_throughput import catalogue
+from smartcart import expiry, inventory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stores', type=int, default=500)
+    parser.add_argument('--skus', type=int, default=10_000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--block-rows', type=int, default=expiry.DEFAULT_BLOCK_ROWS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rows, stock, demand, std = catalogue(args.stores, args.skus, args.seed)
+    plan = inventory.plan_inventory(rows, stock, demand, std)
+    del rows
+
+    start = time.perf_counter()
+    result = expiry.simulate_plan(plan, n_days=args.days, block_rows=args.block_rows, seed=args.seed)
+    seconds = time.perf_counter() - start
+    n = len(plan)
+    print(f"{n:,} rows x {args.days} days in {seconds:.1f}s ({n * args.days / seconds:,.0f} row-days/s)")
+    for name, value in result.summary().items():
+        print(f"  {name:<14}{value:,.4f}" if isinstance(value, float) else f"  {name:<14}{value:,}")
+
+
+if __name__ == '__main__':
+    main()
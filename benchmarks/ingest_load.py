@@ -0,0 +1,97 @@
+"""Load generator for the order-event ingestion service.
+
+Usage: python -m benchmarks.ingest_load --source socket --rate 50000 --events 1000000 --stores 200 --skus 5000
+
+``socket`` streams events to the service at ``--rate`` events/s (0 for as
+fast as possible) and shows whether ingestion keeps up; ``file`` writes the
+events to a log first and measures how fast the backlog drains. Events are
+spread over ``--stores`` x ``--skus``, so the rows written per batch (one per
+distinct hour, store and SKU) grow with the key space as they would in
+production.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+import numpy as np
+
+from smartcart import datagen, forecasting, ingest, rollups
+from smartcart.storage import SalesStore
+
+
+def order_events(n_events, n_stores, n_skus, start, hours, seed):
+    """Time-ordered events spread evenly over ``hours`` hours after ``start``."""
+    rng = np.random.default_rng(seed)
+    start_seconds = np.datetime64(start, 's').astype(np.int64)
+    timestamp = start_seconds + np.sort(rng.integers(0, hours * 3600, n_events))
+    return ingest.encode_events(
+        timestamp,
+        rng.integers(0, n_stores, n_events),
+        rng.integers(0, n_skus, n_events),
+        rng.integers(1, 4, n_events),
+    )
+
+
+def build_service(source, root, args):
+    data = datagen.generate_demo_data(size_config(args), seed=args.seed)
+    start = data['hourly_data']['timestamp'].iloc[0]
+    forecaster = forecasting.SeasonalForecaster().fit(data['store_demand'], start)
+    cubes = rollups.RollupCubes(data['store_data']['name'], datagen.FORECAST_CATEGORIES, datagen.SEGMENT_NAMES)
+    updater = ingest.OnlineUpdater(forecaster, cubes)
+    service = ingest.IngestionService(source, SalesStore(root), [updater],
+                                      batch_events=args.batch_events, batch_seconds=args.batch_seconds)
+    return service, updater, forecaster.end + np.timedelta64(1, 'h')
+
+
+def size_config(args):
+    return datagen.SizeConfig(n_stores=args.stores, n_skus=args.skus)
+
+
+async def run_socket(args, root):
+    source = ingest.SocketSource(expected_connections=1)
+    service, updater, start = build_service(source, root, args)
+    records = order_events(args.events, args.stores, args.skus, start, args.hours, args.seed)
+    task = asyncio.ensure_future(service.run())
+    await source.ready.wait()
+    await ingest.send_events(source.host, source.port, records, rate=args.rate or None)
+    return await task, updater
+
+
+async def run_file(args, root):
+    path = os.path.join(root, 'orders.log')
+    source = ingest.FileSource(path, offset_path=f'{path}.offset')
+    service, updater, start = build_service(source, os.path.join(root, 'store'), args)
+    records = order_events(args.events, args.stores, args.skus, start, args.hours, args.seed)
+    with open(path, 'wb') as f:
+        f.write(records.tobytes())
+    return await service.run(), updater
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', choices=['socket', 'file'], default='socket')
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--rate', type=int, default=50_000, help='events/s sent over the socket (0 = unthrottled)')
+    parser.add_argument('--stores', type=int, default=200)
+    parser.add_argument('--skus', type=int, default=5_000)
+    parser.add_argument('--hours', type=int, default=12, help='simulated hours the events span')
+    parser.add_argument('--batch-events', type=int, default=ingest.DEFAULT_BATCH_EVENTS)
+    parser.add_argument('--batch-seconds', type=float, default=ingest.DEFAULT_BATCH_SECONDS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        run = run_socket if args.source == 'socket' else run_file
+        stats, updater = asyncio.run(run(args, root))
+
+    print(f"{stats['events']:,} events over {args.stores:,} stores x {args.skus:,} SKUs in {stats['seconds']:.2f}s "
+          f"({stats['events_per_s']:,.0f} events/s, {stats['rows_written'] / stats['seconds']:,.0f} rows/s)")
+    print(f"batches: {stats['batches']} ({stats['size_flushes']} by size, {stats['time_flushes']} by time), "
+          f"rows written: {stats['rows_written']:,}, max queue depth: {stats['max_queue_depth']}")
+    print(f"flush time: {stats['flush_seconds']:.2f}s, hours folded into the forecaster: {updater.forecaster.n_obs}, "
+          f"late events: {updater.late_events}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Inventory-planning throughput in catalogue rows per second.
+
+Usage: python -m benchmarks.inventory_throughput --stores 1000 --skus 200
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from smartcart import datagen, inventory
+
+
+def catalogue(n_stores, n_skus, seed):
+    """Store x SKU rows shaped like ``product_data`` plus their stock and demand."""
+    config = datagen.SizeConfig(n_stores=n_stores, n_skus=n_skus)
+    rngs = datagen.table_rngs(seed)
+    products = datagen.generate_product_data(config, rngs['product'])
+    stock = datagen.generate_stock_on_hand(config, products, rngs['stock'])
+
+    rows = products.iloc[np.tile(np.arange(n_skus), n_stores)].reset_index(drop=True)
+    demand = rows['avg_daily_sales'].to_numpy(dtype=np.float32) * rngs['store_demand'].uniform(0.7, 1.3, len(rows)).astype(np.float32)
+    return rows, stock.ravel(), demand, 0.25 * demand
+
+
+def row_wise_plan(rows, stock, demand):
+    """The original per-row apply/iterrows logic, for comparison."""
+    products = rows.copy()
+    products['current_stock'] = stock
+    products['optimal_stock'] = (demand * (1 + products['reorder_frequency'])).astype(int)
+    products['days_to_stockout'] = stock / np.maximum(demand, 1e-6)
+    products['stock_status'] = products.apply(
+        lambda x: 'Critical' if x['days_to_stockout'] <= 1 else
+                 'Low' if x['days_to_stockout'] <= 3 else
+                 'Good' if x['days_to_stockout'] <= 7 else 'Optimal',
+        axis=1
+    )
+    reorder_data = []
+    for i, row in products.iterrows():
+        if row['current_stock'] < row['optimal_stock']:
+            reorder_data.append({
+                'product': row['name'],
+                'reorder_quantity': row['optimal_stock'] - row['current_stock'],
+                'priority': 'High' if row['stock_status'] in ['Critical', 'Low'] else 'Medium'
+            })
+    return pd.DataFrame(reorder_data)
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def vectorized_plan(rows, stock, demand, std):
+    inventory.reorder_recommendations(inventory.plan_inventory(rows, stock, demand, std))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stores', type=int, default=1000)
+    parser.add_argument('--skus', type=int, default=200)
+    parser.add_argument('--row-wise-sample', type=int, default=5000,
+                        help='rows timed with the original row-wise logic')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rows, stock, demand, std = catalogue(args.stores, args.skus, args.seed)
+    n = len(rows)
+    seconds = best_of(args.repeat, vectorized_plan, rows, stock, demand, std)
+    print(f"vectorized: {n:,} rows in {seconds:.3f}s ({n / seconds:,.0f} rows/s)")
+
+    k = min(args.row_wise_sample, n)
+    sample_seconds = best_of(1, row_wise_plan, rows.iloc[:k], stock[:k], demand[:k])
+    print(f"row-wise:   {k:,} rows in {sample_seconds:.3f}s ({k / sample_seconds:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
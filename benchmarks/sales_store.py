@@ -0,0 +1,75 @@
+"""Cold-start load and last-24h-for-one-store query times against the columnar sales store.
+
+Usage: python -m benchmarks.sales_store --days 90 --stores 20 --skus 200
+
+The history is written once; before each cold measurement the store's
+files are dropped from the OS page cache, so reads come from disk the way
+they would for a freshly started app.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from smartcart import datagen, stream
+from smartcart.storage import SalesStore
+
+
+def drop_page_cache(root):
+    """Evict the store's files from the page cache (Linux; a no-op elsewhere)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    for directory, _, names in os.walk(root):
+        for name in names:
+            fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+    return True
+
+
+def disk_bytes(root):
+    return sum(os.path.getsize(os.path.join(d, n)) for d, _, names in os.walk(root) for n in names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--stores', type=int, default=20)
+    parser.add_argument('--skus', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = datagen.SizeConfig(n_stores=args.stores, n_skus=args.skus, horizon_days=args.days)
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        SalesStore(root).write_history(stream.iter_sales_chunks(config, args.seed))
+        n_rows = config.n_hours * args.stores * args.skus
+        print(f"write:      {n_rows:,} rows in {time.perf_counter() - start:.1f}s, "
+              f"{disk_bytes(root) / 2 ** 20:,.0f} MB on disk")
+
+        # Cold start: a new store object over files that are not in the page cache
+        cold = drop_page_cache(root)
+        start = time.perf_counter()
+        demand = SalesStore(root).hourly_demand()
+        print(f"cold load:  {args.days}-day network demand ({len(demand):,} hours) in "
+              f"{time.perf_counter() - start:.3f}s{'' if cold else ' (page cache not dropped)'}")
+
+        store = SalesStore(root)
+        stores = np.random.default_rng(args.seed).integers(0, args.stores, args.queries)
+        timings = []
+        for s in stores:
+            drop_page_cache(root)
+            start = time.perf_counter()
+            store.recent_hourly_demand(stores=[int(s)], hours=24)
+            timings.append(time.perf_counter() - start)
+        print(f"last 24h:   one store, cold, p50 {np.median(timings) * 1000:.1f} ms, "
+              f"max {max(timings) * 1000:.1f} ms over {args.queries} queries")
+
+
+if __name__ == '__main__':
+    main()
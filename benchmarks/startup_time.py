@@ -0,0 +1,65 @@
+"""Cold import and first-render time for each page of the app.
+
+Usage: python -m benchmarks.startup_time [--pages Dashboard "Demand Forecasting"]
+
+Every page is measured in a fresh interpreter, so imports, Streamlit caches
+and fitted models all start cold; a second run of the same page shows the
+warm rerun cost.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import views
+views.load_page({title!r})
+print(time.perf_counter() - start)
+"""
+
+RENDER_PROBE = """
+import time
+from streamlit.testing.v1 import AppTest
+script = "import sys\\nsys.path.insert(0, {root!r})\\nimport views\\nviews.render({title!r})\\n"
+app = AppTest.from_string(script, default_timeout=600)
+start = time.perf_counter()
+app.run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+app.run()
+rerun = time.perf_counter() - start
+if app.exception:
+    raise SystemExit(app.exception[0].value)
+print(first, rerun)
+"""
+
+
+def probe(code):
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'probe failed')
+    return [float(value) for value in result.stdout.split()[-2:] if value]
+
+
+def main(argv=None):
+    sys.path.insert(0, ROOT)
+    import views
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', nargs='+', default=views.page_titles(include_hidden=True))
+    args = parser.parse_args(argv)
+
+    print(f"{'page':<26}{'cold import':>12}{'first render':>14}{'rerun':>9}")
+    for title in args.pages:
+        import_seconds = probe(IMPORT_PROBE.format(root=ROOT, title=title))[0]
+        first, rerun = probe(RENDER_PROBE.format(root=ROOT, title=title))
+        print(f"{title:<26}{import_seconds:>11.2f}s{first:>13.2f}s{rerun:>8.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Nearest-store and delivery-radius lookups per second against the grid store index.
+
+Usage: python -m benchmarks.store_lookup --stores 5000 --addresses 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from smartcart import datagen, geo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stores', type=int, default=5000)
+    parser.add_argument('--addresses', type=int, default=1_000_000)
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--radius-km', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = datagen.SizeConfig(n_stores=args.stores, n_customers=args.addresses)
+    rngs = datagen.table_rngs(args.seed)
+    stores = datagen.generate_store_data(config, rngs['store'])
+    lat, lon = datagen.generate_customer_addresses(config, rngs['addresses'], stores['lat'], stores['lon'])
+
+    start = time.perf_counter()
+    index = geo.StoreIndex(stores['lat'], stores['lon'])
+    print(f"index:     {args.stores:,} stores in {time.perf_counter() - start:.3f}s ({index.cell_km:.2f} km cells)")
+
+    for k in sorted({1, args.k}):
+        start = time.perf_counter()
+        index.nearest(lat, lon, k=k)
+        seconds = time.perf_counter() - start
+        print(f"nearest-{k}: {args.addresses:,} addresses in {seconds:.2f}s ({args.addresses / seconds:,.0f}/s)")
+
+    start = time.perf_counter()
+    query, _, _ = index.within(lat, lon, args.radius_km)
+    seconds = time.perf_counter() - start
+    print(f"within {args.radius_km:g} km: {args.addresses:,} addresses in {seconds:.2f}s "
+          f"({len(query) / args.addresses:.1f} stores per address)")
+
+    store, km = geo.assign_orders(index, lat, lon)
+    counts = geo.delivery_buckets(geo.delivery_minutes(km[store >= 0]))
+    print("delivery:  " + ", ".join(f"{name} {count / counts.sum():.0%}" for name, count in zip(geo.DELIVERY_BUCKETS, counts)))
+    print(f"           {np.mean(store < 0):.1%} beyond {geo.SERVICE_RADIUS_KM:g} km")
+
+
+if __name__ == '__main__':
+    main()
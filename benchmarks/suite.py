@@ -0,0 +1,164 @@
+"""Benchmark suite for the data generation, forecasting, inventory and segmentation hot paths.
+
+Usage: python -m benchmarks.suite --stores 100 --skus 200 --days 28 --customers 200000 \
+           --output results.json [--baseline benchmarks/baseline.json] [--save-baseline]
+
+Each case is timed (best of ``--repeat``) and then run once more under
+tracemalloc for its peak memory. Results are written as JSON; against a
+baseline recorded at the same scale, any case slower (or hungrier) by more
+than ``--threshold`` is reported and the command exits non-zero.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from smartcart import datagen, forecasting, inventory, rollups, segmentation, stream
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+# Differences below these are timer / allocator noise, never regressions
+NOISE_FLOOR = {'seconds': 0.005, 'peak_mb': 1.0}
+
+
+def fit_sku_forecaster(config, seed, end):
+    """Store x SKU forecaster fit from the streamed sales history, as the app does."""
+    profile, = stream.consume(stream.iter_sales_chunks(config, seed, end=end),
+                              stream.WeeklyProfile(config.n_stores, config.n_skus, by='store_sku'))
+    return forecasting.SeasonalForecaster().fit_weekly(profile.mean(), end, profile.counts, profile.square_mean())
+
+
+def build_cases(config, seed):
+    """Name -> zero-argument callable; setup happens here, outside the timings."""
+    rngs = datagen.table_rngs(seed)
+    data = datagen.generate_demo_data(config, seed=seed)
+    start = data['hourly_data']['timestamp'].iloc[0]
+    store_model = forecasting.SeasonalForecaster().fit(data['store_demand'], start)
+    features = datagen.generate_customer_features(config, rngs['customers'])
+    orders = datagen.generate_order_log(config, datagen.table_rngs(seed)['orders'])
+    product_rows = data['product_data'].iloc[np.tile(np.arange(config.n_skus), config.n_stores)]
+    end = data['hourly_data']['timestamp'].iloc[-1]
+    sku_model = fit_sku_forecaster(config, seed, end)
+
+    def plan_network_inventory():
+        plan = inventory.plan_inventory(product_rows, data['stock_on_hand'].ravel(),
+                                        daily_quantiles=sku_model.predict_quantiles(24, total=True),
+                                        quantile_levels=forecasting.DEFAULT_QUANTILES)
+        return inventory.reorder_recommendations(plan)
+
+    def segment_heatmap():
+        cubes = rollups.RollupCubes(data['store_data']['name'], datagen.FORECAST_CATEGORIES, datagen.SEGMENT_NAMES)
+        cubes.update_orders(orders)
+        return cubes.segment.by_hour_range()
+
+    def segment_behavior():
+        behavior = rollups.SegmentBehavior(datagen.SEGMENT_NAMES, datagen.ORDER_CATEGORIES).update(orders)
+        return behavior.by_hour_range(), behavior.category_preferences()
+
+    return {
+        'datagen.demo_data': lambda: datagen.generate_demo_data(config, seed=seed),
+        'datagen.order_log': lambda: datagen.generate_order_log(config, datagen.table_rngs(seed)['orders']),
+        'stream.sku_forecaster': lambda: fit_sku_forecaster(config, seed, end),
+        'forecast.fit': lambda: forecasting.SeasonalForecaster().fit(data['store_demand'], start),
+        'forecast.predict_day': lambda: store_model.predict(24),
+        'forecast.quantiles_day': lambda: store_model.predict_quantiles(24),
+        'forecast.update_hour': lambda: forecasting.SeasonalForecaster.from_state(store_model.state_dict()).update(data['store_demand'][:, -1]),
+        'inventory.plan_network': plan_network_inventory,
+        'segmentation.fit': lambda: segmentation.MiniBatchKMeans(seed=seed).fit(segmentation.FeatureChunks([features])),
+        'segmentation.heatmap': segment_heatmap,
+        'segmentation.behavior': segment_behavior,
+    }
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': min(timings), 'peak_mb': peak / 2 ** 20}
+
+
+def compare(results, baseline, threshold):
+    """Cases whose time or peak memory grew by more than ``threshold`` over the baseline."""
+    regressions = []
+    for name, current in results['cases'].items():
+        previous = baseline['cases'].get(name)
+        if previous is None:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            grown = current[metric] - previous[metric]
+            if grown > NOISE_FLOOR[metric] and grown > previous[metric] * threshold:
+                regressions.append((name, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stores', type=int, default=100)
+    parser.add_argument('--skus', type=int, default=200)
+    parser.add_argument('--days', type=int, default=28)
+    parser.add_argument('--customers', type=int, default=200_000)
+    parser.add_argument('--orders', type=int, default=500_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cases', nargs='+', help='only run cases starting with these prefixes')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed relative slowdown before a case counts as a regression')
+    args = parser.parse_args(argv)
+
+    config = datagen.SizeConfig(n_stores=args.stores, n_skus=args.skus, horizon_days=args.days,
+                                n_customers=args.customers, n_orders=args.orders)
+    cases = build_cases(config, args.seed)
+    if args.cases:
+        cases = {name: func for name, func in cases.items() if name.startswith(tuple(args.cases))}
+
+    results = {
+        'config': {'stores': args.stores, 'skus': args.skus, 'days': args.days,
+                   'customers': args.customers, 'orders': args.orders, 'seed': args.seed},
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine()},
+        'cases': {},
+    }
+    print(f"{'case':<26}{'seconds':>10}{'peak MB':>10}")
+    for name, func in cases.items():
+        results['cases'][name] = measure(func, args.repeat)
+        print(f"{name:<26}{results['cases'][name]['seconds']:>10.4f}{results['cases'][name]['peak_mb']:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['config'] != results['config']:
+        print(f"baseline was recorded at {baseline['config']}; not comparing")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name} {metric}: {before:.4f} -> {after:.4f} ({after / before - 1:+.0%})")
+    if not regressions:
+        print(f"no regressions over {args.threshold:.0%} against the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
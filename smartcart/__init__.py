@@ -0,0 +1 @@
+"""SmartCart AI engines shared by the Streamlit demo and batch tooling."""
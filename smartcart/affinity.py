@@ -0,0 +1,234 @@
+"""Product affinity from order baskets: sparse SKU x SKU co-occurrence, lift and PMI.
+
+Baskets arrive in CSR-style chunks (``offsets``, ``sku``). The distinct
+SKUs of every basket in a chunk are paired with ``np.repeat`` and each
+unordered pair is packed into one int64 key. Keys are buffered and then
+folded into one sorted (key, count) run, so memory follows the number of
+distinct pairs rather than the number of baskets. ``build`` turns the run
+into a CSR matrix over the upper triangle, with int32 indices and counts
+and each pair stored once, in the row of its lower SKU. Lift and PMI over
+the matrix take a few array passes. The top-k related-items index mirrors
+only the pairs with enough support, and a lookup in it is a row slice.
+"""
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from smartcart import datagen
+
+DEFAULT_CHUNK_BASKETS = 1_000_000
+
+# Larger baskets (bulk or B2B orders) would add quadratically many pairs that say little about affinity
+MAX_BASKET_ITEMS = 64
+
+# Buffered pair keys folded into the sorted run at a time
+PENDING_PAIRS = 16_000_000
+
+# Pairs bought together in fewer baskets than this are too noisy to recommend
+DEFAULT_MIN_SUPPORT = 5
+
+DEFAULT_TOP_K = 10
+
+METRICS = ('lift', 'pmi')
+
+
+class BasketChunk(NamedTuple):
+    """A batch of baskets: basket ``i`` holds ``sku[offsets[i]:offsets[i + 1]]``."""
+    offsets: np.ndarray  # int64, n_baskets + 1
+    sku: np.ndarray      # int32 SKU index
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def iter_basket_chunks(config=None, seed=None, n_baskets=None, chunk_baskets=DEFAULT_CHUNK_BASKETS):
+    """Yield ``BasketChunk`` batches of ``datagen.generate_baskets`` orders over ``config``'s catalogue."""
+    config = config or datagen.SizeConfig()
+    n = config.n_orders if n_baskets is None else n_baskets
+    rngs = datagen.table_rngs(seed)
+    product_data = datagen.generate_product_data(config, rngs['product'])
+    # One child generator per chunk keeps chunks reproducible and independently regenerable
+    chunk_rngs = rngs['baskets'].spawn(-(-n // chunk_baskets))
+    for rng, lo in zip(chunk_rngs, range(0, n, chunk_baskets)):
+        yield BasketChunk(*datagen.generate_baskets(config, rng, product_data, min(chunk_baskets, n - lo)))
+
+
+class CooccurrenceBuilder:
+    """Streaming pair and item counts over baskets of SKU indices.
+
+    Pair counts are int32, which bounds a build at 2**31 baskets. Pair keys
+    are uint32 while ``n_skus ** 2`` fits, halving the run's memory.
+    """
+
+    def __init__(self, n_skus, max_basket_items=MAX_BASKET_ITEMS, pending_pairs=PENDING_PAIRS):
+        self.n_skus = n_skus
+        self.max_basket_items = max_basket_items
+        self.pending_pairs = pending_pairs
+        self.item_counts = np.zeros(n_skus, dtype=np.int64)
+        self.n_baskets = 0
+        self.skipped_baskets = 0
+        self._key_dtype = np.uint32 if n_skus ** 2 <= 2 ** 32 else np.int64
+        self._keys = np.empty(0, dtype=self._key_dtype)
+        self._counts = np.empty(0, dtype=np.int32)
+        self._pending = []
+        self._pending_size = 0
+
+    def update(self, chunk):
+        offsets = np.asarray(chunk.offsets, dtype=np.int64)
+        n = len(offsets) - 1
+        key = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets)) * self.n_skus
+        key += chunk.sku
+        # Distinct SKUs per basket in ascending order, so each pair comes out once as (low, high)
+        key.sort()
+        basket, sku = np.divmod(key[np.r_[True, key[1:] != key[:-1]]], self.n_skus)
+        sizes = np.bincount(basket, minlength=n)
+        kept = sizes <= self.max_basket_items
+        if not kept.all():
+            basket, sku = basket[kept[basket]], sku[kept[basket]]
+            sizes = np.where(kept, sizes, 0)
+        self.n_baskets += int(kept.sum())
+        self.skipped_baskets += int(n - kept.sum())
+        self.item_counts += np.bincount(sku, minlength=self.n_skus)
+
+        # Each item pairs with the items after it in its basket
+        position = np.arange(len(sku))
+        partners = np.repeat(np.cumsum(sizes), sizes) - 1 - position
+        left = np.repeat(position, partners)
+        right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(partners) - partners, partners)
+        self._pending.append((sku[left] * self.n_skus + sku[right]).astype(self._key_dtype))
+        self._pending_size += len(left)
+        if self._pending_size >= self.pending_pairs:
+            self._flush()
+        return self
+
+    def _flush(self):
+        keys = np.concatenate(self._pending)
+        keys.sort()
+        first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        keys, counts = keys[first], np.diff(np.r_[first, len(keys)])
+        self._pending, self._pending_size = [], 0
+        position = np.searchsorted(self._keys, keys)
+        found = position < len(self._keys)
+        found[found] = self._keys[position[found]] == keys[found]
+        self._counts[position[found]] += counts[found].astype(np.int32)
+        # Sorted keys inserted at their sorted positions keep the run sorted, in one linear pass
+        new = ~found
+        self._keys = np.insert(self._keys, position[new], keys[new])
+        self._counts = np.insert(self._counts, position[new], counts[new].astype(np.int32))
+
+    def build(self):
+        """The ``Cooccurrence`` matrix of everything seen so far."""
+        if self._pending:
+            self._flush()
+        # Keys sort by (low, high), so the run already is the upper triangle in row order
+        row_starts = (np.arange(self.n_skus, dtype=np.int64) * self.n_skus).astype(self._key_dtype)
+        indptr = np.r_[np.searchsorted(self._keys, row_starts), len(self._keys)]
+        indices = (self._keys % self.n_skus).astype(np.int32)
+        return Cooccurrence(indptr, indices, self._counts.copy(), self.item_counts.copy(), self.n_baskets)
+
+
+@dataclass
+class Cooccurrence:
+    """SKU x SKU basket co-occurrence counts as an upper-triangular CSR matrix.
+
+    Row ``a`` holds the partners ``b > a``; ``pair_count`` and ``top_k``
+    treat the matrix as symmetric.
+    """
+    indptr: np.ndarray       # int64, n_skus + 1
+    indices: np.ndarray      # int32 higher SKU of the pair, ascending within a row
+    counts: np.ndarray       # int32 baskets holding both SKUs
+    item_counts: np.ndarray  # int64 baskets holding each SKU
+    n_baskets: int
+
+    @property
+    def n_skus(self):
+        return len(self.indptr) - 1
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.counts.nbytes + self.item_counts.nbytes
+
+    def rows(self):
+        """Row (SKU) of every stored entry, aligned with ``indices``."""
+        return np.repeat(np.arange(self.n_skus, dtype=np.int32), np.diff(self.indptr))
+
+    def pair_count(self, a, b):
+        """Baskets holding both ``a`` and ``b``."""
+        a, b = min(a, b), max(a, b)
+        lo, hi = self.indptr[a], self.indptr[a + 1]
+        position = lo + np.searchsorted(self.indices[lo:hi], b)
+        return int(self.counts[position]) if position < hi and self.indices[position] == b else 0
+
+    def scores(self, metric='lift'):
+        """``metric`` for every stored pair, aligned with ``indices``.
+
+        Lift is P(a, b) / (P(a) P(b)): how much more often the two share a
+        basket than if they were bought independently. PMI is its log.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+        item_share = (self.item_counts / max(self.n_baskets, 1)).astype(np.float32)
+        lift = self.counts.astype(np.float32)
+        lift /= item_share[self.rows()] * item_share[self.indices] * np.float32(max(self.n_baskets, 1))
+        return lift if metric == 'lift' else np.log(lift)
+
+    def top_k(self, k=DEFAULT_TOP_K, metric='lift', min_support=DEFAULT_MIN_SUPPORT):
+        """``RelatedItems`` index of each SKU's ``k`` best-scoring partners with at least ``min_support`` baskets."""
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+        keep = np.flatnonzero(self.counts >= min_support)
+        lift = self.scores('lift')[keep]
+        low, high, counts = self.rows()[keep], self.indices[keep], self.counts[keep]
+        # Both directions of every supported pair, ranked best first within each SKU. PMI ranks
+        # like lift, and positive float32 bits order like their values, so one packed key sorts both
+        rows, partners = np.r_[low, high], np.r_[high, low]
+        lift, counts = np.r_[lift, lift], np.r_[counts, counts]
+        order = np.argsort((rows.astype(np.uint64) << 32) | (~lift.view(np.uint32)).astype(np.uint64))
+        scores = lift if metric == 'lift' else np.log(lift)
+        rows = rows[order]
+        row_start = np.r_[0, np.cumsum(np.bincount(rows, minlength=self.n_skus))][:-1]
+        rank = np.arange(len(order)) - row_start[rows]
+        top = rank < k
+        order, rows, rank = order[top], rows[top], rank[top]
+
+        items = np.full((self.n_skus, k), -1, dtype=np.int32)
+        top_scores = np.full((self.n_skus, k), np.nan, dtype=np.float32)
+        support = np.zeros((self.n_skus, k), dtype=np.int32)
+        items[rows, rank] = partners[order]
+        top_scores[rows, rank] = scores[order]
+        support[rows, rank] = counts[order]
+        return RelatedItems(items, top_scores, support, metric)
+
+
+@dataclass
+class RelatedItems:
+    """Each SKU's best partners, best first; rows with fewer partners are padded with -1."""
+    items: np.ndarray    # (n_skus, k) int32
+    scores: np.ndarray   # (n_skus, k) float32
+    support: np.ndarray  # (n_skus, k) int32 baskets holding both
+    metric: str
+
+    def related(self, sku, k=None):
+        """Partner SKUs of ``sku`` and their scores, best first."""
+        items = self.items[sku, :k]
+        found = items >= 0
+        return items[found], self.scores[sku, :k][found]
+
+    def frame(self, sku, names=None, k=None):
+        """Partners of ``sku`` as a DataFrame, with product names when ``names`` is given."""
+        n = int((self.items[sku, :k] >= 0).sum())
+        items = self.items[sku, :n]
+        frame = pd.DataFrame({'sku': items, self.metric: self.scores[sku, :n], 'baskets': self.support[sku, :n]})
+        if names is not None:
+            frame.insert(1, 'name', np.asarray(names)[items])
+        return frame
+
+
+def build_cooccurrence(chunks, n_skus, **kwargs):
+    """Fold ``BasketChunk`` batches into a ``Cooccurrence`` matrix."""
+    builder = CooccurrenceBuilder(n_skus, **kwargs)
+    for chunk in chunks:
+        builder.update(chunk)
+    return builder.build()
@@ -0,0 +1,178 @@
+"""Inter-store transfer and warehouse dispatch planning.
+
+Stores holding more of a SKU than their target lend it to nearby stores
+that are short, and the warehouse covers what transfers cannot. The solver
+is a greedy over a precomputed nearest-neighbour list: in round ``r`` every
+short store asks its ``r``-th nearest donor for its remaining gap, and a
+donor asked for more than its surplus fills requests pro rata. Each round
+is a few matrix operations over all stores and SKUs at once, so closer
+(cheaper) transfers are always settled before farther ones without a
+per-edge Python loop. SKU blocks are solved in parallel threads.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+
+# City warehouse that replenishes every dark store
+WAREHOUSE_LAT = 12.9716
+WAREHOUSE_LON = 77.5946
+
+# Nearest stores each short store may borrow from
+DEFAULT_NEIGHBOURS = 8
+
+# Rupees lost per unit of unmet demand and per unit moved one kilometre
+STOCKOUT_COST_PER_UNIT = 40.0
+TRAVEL_COST_PER_UNIT_KM = 1.5
+
+# SKUs per block handed to each solver thread
+SKU_BLOCK = 2048
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance; broadcasts like any NumPy ufunc."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def distance_matrix(lat, lon):
+    """Pairwise store distances in km as an (n_stores, n_stores) float32 matrix."""
+    lat, lon = np.asarray(lat), np.asarray(lon)
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :]).astype(np.float32)
+
+
+def nearest_neighbours(distances, k):
+    """Indices of each store's ``k`` nearest other stores, closest first."""
+    k = min(k, len(distances) - 1)
+    masked = distances + np.diag(np.full(len(distances), np.inf, dtype=np.float32))
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(distances), 0), dtype=np.int64)
+    order = np.take_along_axis(masked, nearest, axis=1).argsort(axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+@dataclass
+class AllocationPlan:
+    transfers: pd.DataFrame
+    unmet: np.ndarray
+    shortfall_before: int
+
+    def summary(self):
+        moved = self.transfers['units'].to_numpy().sum(dtype=np.int64)
+        travel_cost = (self.transfers['units'] * self.transfers['distance_km']).sum() * TRAVEL_COST_PER_UNIT_KM
+        unmet = int(self.unmet.sum(dtype=np.float64))
+        return {
+            'shortfall_before': self.shortfall_before,
+            'shortfall_after': unmet,
+            'units_moved': int(moved),
+            'store_transfer_units': int(self.transfers.loc[self.transfers['from_store'] >= 0, 'units'].sum()),
+            'warehouse_units': int(self.transfers.loc[self.transfers['from_store'] < 0, 'units'].sum()),
+            'travel_cost': float(travel_cost),
+            'expected_stockout_cost': unmet * STOCKOUT_COST_PER_UNIT,
+        }
+
+
+def _solve_block(surplus, deficit, neighbours, neighbour_ok, warehouse_stock):
+    """Allocate one block of SKU columns; returns transfer triples and unmet deficit."""
+    n_stores = len(surplus)
+    receivers, donors, skus, units = [], [], [], []
+
+    for r in range(neighbours.shape[1]):
+        donor_of = neighbours[:, r]
+        request = np.where(neighbour_ok[:, r, None], deficit, 0)
+        # Route every request to its donor row with one (n_stores x n_stores) product
+        routing = np.zeros((n_stores, n_stores), dtype=np.float32)
+        routing[donor_of, np.arange(n_stores)] = 1
+        asked = routing @ request
+        fill = np.divide(surplus, asked, out=np.zeros_like(surplus), where=asked > 0)
+        granted = np.floor(request * np.minimum(fill, 1)[donor_of])
+
+        deficit -= granted
+        surplus -= routing @ granted
+        j, s = np.nonzero(granted)
+        receivers.append(j)
+        donors.append(donor_of[j])
+        skus.append(s)
+        units.append(granted[j, s])
+
+    # Warehouse covers the remaining gap, pro rata across stores when short
+    if warehouse_stock is None:
+        dispatched = deficit.copy()
+    else:
+        total = deficit.sum(axis=0)
+        fill = np.divide(warehouse_stock, total, out=np.zeros_like(total), where=total > 0)
+        dispatched = np.floor(deficit * np.minimum(fill, 1))
+    deficit -= dispatched
+    j, s = np.nonzero(dispatched)
+    receivers.append(j)
+    donors.append(np.full(len(j), -1))
+    skus.append(s)
+    units.append(dispatched[j, s])
+
+    return (np.concatenate(receivers), np.concatenate(donors), np.concatenate(skus),
+            np.concatenate(units), deficit)
+
+
+def plan_allocation(lat, lon, on_hand, target, warehouse_stock=None,
+                    n_neighbours=DEFAULT_NEIGHBOURS, n_jobs=None):
+    """Plan transfers that bring every store up to ``target`` at the least travel.
+
+    ``on_hand`` and ``target`` are ``(n_stores, n_skus)``; ``warehouse_stock``
+    is per SKU (``None`` for an unconstrained warehouse). A store only
+    borrows from a neighbour that is closer than the warehouse and whose
+    travel cost stays below the cost of the stockout it prevents.
+    """
+    on_hand = np.asarray(on_hand, dtype=np.float32)
+    target = np.asarray(target, dtype=np.float32)
+    surplus = np.maximum(on_hand - target, 0)
+    deficit = np.maximum(target - on_hand, 0)
+    shortfall_before = int(deficit.sum(dtype=np.float64))
+
+    distances = distance_matrix(lat, lon)
+    warehouse_km = haversine_km(lat, lon, WAREHOUSE_LAT, WAREHOUSE_LON).astype(np.float32)
+    neighbours = nearest_neighbours(distances, n_neighbours)
+    neighbour_km = np.take_along_axis(distances, neighbours, axis=1)
+    neighbour_ok = (neighbour_km < warehouse_km[:, None]) & (neighbour_km * TRAVEL_COST_PER_UNIT_KM < STOCKOUT_COST_PER_UNIT)
+
+    n_skus = on_hand.shape[1]
+    blocks = [slice(lo, min(lo + SKU_BLOCK, n_skus)) for lo in range(0, n_skus, SKU_BLOCK)]
+    stock = None if warehouse_stock is None else np.asarray(warehouse_stock, dtype=np.float32)
+
+    def solve(block):
+        return _solve_block(surplus[:, block].copy(), deficit[:, block].copy(), neighbours, neighbour_ok,
+                            None if stock is None else stock[block])
+
+    # NumPy releases the GIL inside the heavy kernels, so threads overlap
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        results = list(pool.map(solve, blocks))
+
+    unmet = np.concatenate([r[4] for r in results], axis=1)
+    receivers = np.concatenate([r[0] for r in results])
+    donors = np.concatenate([r[1] for r in results])
+    skus = np.concatenate([r[2] + b.start for r, b in zip(results, blocks)])
+    units = np.concatenate([r[3] for r in results])
+
+    distance_km = np.where(donors >= 0, distances[np.maximum(donors, 0), receivers], warehouse_km[receivers])
+    transfers = pd.DataFrame({
+        'sku': skus.astype(np.int32),
+        'from_store': donors.astype(np.int32),
+        'to_store': receivers.astype(np.int32),
+        'units': units.astype(np.int32),
+        'distance_km': distance_km.astype(np.float32),
+    })
+    return AllocationPlan(transfers=transfers, unmet=unmet, shortfall_before=shortfall_before)
+
+
+def label_transfers(transfers, store_names, product_names):
+    """Readable transfer table with store and product names (warehouse rows labelled)."""
+    store_names = np.append(np.asarray(store_names, dtype=object), 'Warehouse')
+    return pd.DataFrame({
+        'product': np.asarray(product_names, dtype=object)[transfers['sku']],
+        'from': store_names[transfers['from_store']],
+        'to': store_names[transfers['to_store']],
+        'units': transfers['units'].to_numpy(),
+        'distance_km': transfers['distance_km'].round(1).to_numpy(),
+    })
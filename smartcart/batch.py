@@ -0,0 +1,186 @@
+"""Headless batch job: store forecasts, reorder plans and segment assignments.
+
+Usage: python -m smartcart.batch --out runs/nightly --stores 500 --skus 2000 --days 28 --customers 1000000
+
+Runs the same engines as the app over the full catalogue without importing
+Streamlit or plotly. The store forecaster is trained sharded by store,
+inventory plans are computed for blocks of stores in parallel processes,
+and customers are segmented out of core. Every output is written beside
+its final name and renamed into place, so re-running an interrupted job
+with the same ``--out`` skips whatever already finished. The simulated
+history ends at ``--end`` (default: the first run's current hour, kept in
+``config.json``), so a resumed job regenerates exactly the same data.
+
+    out/config.json
+    out/model/store_forecaster.npz, out/model/segments.npz
+    out/forecasts/part-00000.csv   store, timestamp, forecast, p90, p99
+    out/reorders/part-00000.csv    store, product, category, current_stock, reorder_quantity, priority
+    out/segments/labels.npy        segment index per customer id (int8)
+    out/segments/summary.csv
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from smartcart import datagen, inventory, segmentation, training
+from smartcart.forecasting import DEFAULT_QUANTILES, SeasonalForecaster
+
+HORIZON_HOURS = 24
+
+# Stores planned per worker task
+STORE_BLOCK = 64
+
+
+def _atomic_csv(frame, path):
+    tmp = f'{path}.tmp'
+    frame.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _plan_block(task):
+    """Forecast rows and reorder recommendations for one block of stores."""
+    (forecast_path, reorder_path, store_names, forecast_index, forecast, quantiles,
+     daily_quantiles, history, stock, product_data) = task
+    n_stores, n_skus = stock.shape
+
+    _atomic_csv(pd.DataFrame({
+        'store': np.repeat(store_names, len(forecast_index)),
+        'timestamp': np.tile(forecast_index, n_stores),
+        'forecast': np.round(forecast, 1).ravel(),
+        'p90': np.round(quantiles[..., DEFAULT_QUANTILES.index(0.9)], 1).ravel(),
+        'p99': np.round(quantiles[..., DEFAULT_QUANTILES.index(0.99)], 1).ravel(),
+    }), forecast_path)
+
+    sku_quantiles = inventory.product_demand_quantiles(
+        product_data['avg_daily_sales'], daily_quantiles, history)
+    rows = product_data.iloc[np.tile(np.arange(n_skus), n_stores)].reset_index(drop=True)
+    plan = inventory.plan_inventory(rows, stock.ravel(), daily_quantiles=sku_quantiles.reshape(n_stores * n_skus, -1),
+                                    quantile_levels=DEFAULT_QUANTILES)
+    plan['store'] = np.repeat(store_names, n_skus)
+    reorder_df = inventory.reorder_recommendations(plan)
+    _atomic_csv(reorder_df, reorder_path)
+    return len(reorder_df)
+
+
+def _previous_config(out):
+    path = os.path.join(out, 'config.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _check_config(out, config):
+    path = os.path.join(out, 'config.json')
+    previous = _previous_config(out)
+    if previous is not None:
+        if previous != config:
+            raise SystemExit(f"{out} holds a run with different settings {previous}; use a new --out")
+    else:
+        with open(path, 'w') as f:
+            json.dump(config, f, indent=2)
+
+
+def run(out, config, seed, end, n_workers=None, log=print):
+    for name in ('model', 'forecasts', 'reorders', 'segments'):
+        os.makedirs(os.path.join(out, name), exist_ok=True)
+    started = time.perf_counter()
+    data = datagen.generate_demo_data(config, seed=seed, end=end)
+    store_names = data['store_data']['name'].to_numpy()
+
+    # Store forecaster, trained once and reused on resume
+    model_path = os.path.join(out, 'model', 'store_forecaster.npz')
+    if os.path.exists(model_path):
+        model = SeasonalForecaster.load(model_path)
+        log("store forecaster: loaded checkpoint")
+    else:
+        start = data['hourly_data']['timestamp'].iloc[0]
+        model = training.train_by_store(data['store_demand'], start, store_names=store_names,
+                                        n_workers=n_workers, artifact_path=model_path)
+        log(f"store forecaster: trained on {config.n_stores:,} stores")
+    forecast = model.predict(HORIZON_HOURS)
+    forecast_index = model.forecast_index(HORIZON_HOURS).strftime('%Y-%m-%d %H:00').to_numpy()
+    quantiles = model.predict_quantiles(HORIZON_HOURS)
+    daily_quantiles = model.predict_quantiles(HORIZON_HOURS, total=True)
+
+    # Inventory plans, one task per block of stores; finished parts are skipped
+    tasks = []
+    for block, lo in enumerate(range(0, config.n_stores, STORE_BLOCK)):
+        hi = min(lo + STORE_BLOCK, config.n_stores)
+        forecast_path = os.path.join(out, 'forecasts', f'part-{block:05d}.csv')
+        reorder_path = os.path.join(out, 'reorders', f'part-{block:05d}.csv')
+        if os.path.exists(forecast_path) and os.path.exists(reorder_path):
+            continue
+        tasks.append((forecast_path, reorder_path, store_names[lo:hi], forecast_index, forecast[lo:hi],
+                      quantiles[lo:hi], daily_quantiles[lo:hi], data['store_demand'][lo:hi],
+                      data['stock_on_hand'][lo:hi], data['product_data']))
+    n_blocks = -(-config.n_stores // STORE_BLOCK)
+    if tasks:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            reorders = sum(pool.map(_plan_block, tasks))
+        log(f"inventory: planned {len(tasks)} of {n_blocks} store blocks ({reorders:,} reorder lines)")
+    else:
+        log(f"inventory: all {n_blocks} store blocks already done")
+
+    # Segment assignments for every customer
+    labels_path = os.path.join(out, 'segments', 'labels.npy')
+    summary_path = os.path.join(out, 'segments', 'summary.csv')
+    if os.path.exists(labels_path) and os.path.exists(summary_path):
+        log("segments: already done")
+    else:
+        features = datagen.generate_customer_features(config, datagen.table_rngs(seed)['customers'])
+        chunks = segmentation.FeatureChunks([features])
+        segments_path = os.path.join(out, 'model', 'segments.npz')
+        if os.path.exists(segments_path):
+            # Saved with its names when it was fit; a resume leaves the file alone
+            kmeans = segmentation.MiniBatchKMeans.load(segments_path)
+            names = segmentation.cluster_names(kmeans.cluster_centers())
+        else:
+            kmeans = segmentation.MiniBatchKMeans(seed=seed).fit(chunks)
+            names = segmentation.cluster_names(kmeans.cluster_centers())
+            kmeans.save(segments_path, names=names)
+        tmp = os.path.join(out, 'segments', 'labels.tmp.npy')
+        labels = segmentation.predict_chunks(kmeans, chunks, out_path=tmp)
+        summary = segmentation.segment_summary(chunks, labels, names)
+        summary.insert(0, 'label', [int(np.flatnonzero(names == name)[0]) for name in summary['name']])
+        del labels
+        os.replace(tmp, labels_path)
+        _atomic_csv(summary, summary_path)
+        log(f"segments: assigned {config.n_customers:,} customers")
+
+    log(f"done in {time.perf_counter() - started:.1f}s -> {out}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', required=True, help='output directory; re-use it to resume')
+    parser.add_argument('--stores', type=int, default=datagen.SizeConfig.n_stores)
+    parser.add_argument('--skus', type=int, default=datagen.SizeConfig.n_skus)
+    parser.add_argument('--days', type=int, default=datagen.SizeConfig.horizon_days)
+    parser.add_argument('--customers', type=int, default=datagen.SizeConfig.n_customers)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--end', help='last hour of the simulated history (default: now, or the resumed run\'s)')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    config = datagen.SizeConfig(n_stores=args.stores, n_skus=args.skus, horizon_days=args.days,
+                                n_customers=args.customers)
+    os.makedirs(args.out, exist_ok=True)
+    if args.end is not None:
+        end = pd.Timestamp(args.end)
+    else:
+        previous = _previous_config(args.out)
+        end = pd.Timestamp(previous['end']) if previous and 'end' in previous else pd.Timestamp.now()
+    end = end.floor('h')
+    _check_config(args.out, {'stores': args.stores, 'skus': args.skus, 'days': args.days,
+                             'customers': args.customers, 'seed': args.seed, 'end': end.isoformat()})
+    run(args.out, config, args.seed, end, n_workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""Shared result cache for page computations across Streamlit reruns.
+
+Entries are keyed by tuples such as ``(page, store, date, data_version)``,
+expire after a TTL and are evicted least-recently-used beyond
+``max_entries``. One instance is meant to be shared by every session (via
+``st.cache_resource``), so a widget change by one user warms the result for
+all of them. An optional directory tier keeps pickled results across
+process restarts.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_MAX_ENTRIES = 512
+
+
+class ResultCache:
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES, disk_dir=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # One lock per key being computed, so concurrent misses compute once
+        self._computing = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_dir, f'{digest}.pkl')
+
+    def _lookup(self, key):
+        """Value for ``key`` from memory; ``(found, value)``. Caller holds the lock."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+            self.expirations += 1
+        return False, None
+
+    def _load_disk(self, key):
+        """``(found, value, ttl left)`` from the disk tier. Called without the lock."""
+        path = self._disk_path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            if age < self.ttl:
+                with open(path, 'rb') as f:
+                    return True, pickle.load(f), self.ttl - age
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+        return False, None, 0
+
+    def _find(self, key):
+        """Value for ``key`` from memory, then disk; ``(found, value)``.
+
+        Only the memory lookup and the insert hold the lock, so a slow disk
+        read never blocks lookups of other keys.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+        if found or not self.disk_dir:
+            return found, value
+        found, value, ttl = self._load_disk(key)
+        if found:
+            with self._lock:
+                self._insert(key, value, ttl)
+                self.disk_hits += 1
+        return found, value
+
+    def _insert(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        found, value = self._find(key)
+        if not found:
+            with self._lock:
+                self.misses += 1
+        return value if found else default
+
+    def put(self, key, value):
+        with self._lock:
+            self._insert(key, value, self.ttl)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            try:
+                with open(tmp, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except (OSError, pickle.PicklingError, TypeError, AttributeError):
+                # Unpicklable results simply stay memory-only
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+    def get_or_compute(self, key, compute):
+        """Cached value for ``key``, calling ``compute()`` on a miss."""
+        found, value = self._find(key)
+        if found:
+            return value
+        with self._lock:
+            key_lock = self._computing.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                # Another session may have filled it while we waited
+                found, value = self._find(key)
+                if not found:
+                    with self._lock:
+                        self.misses += 1
+                    value = compute()
+                    self.put(key, value)
+        finally:
+            # A failed compute must not leave its key lock behind, and a newer caller's lock stays
+            with self._lock:
+                if self._computing.get(key) is key_lock:
+                    del self._computing[key]
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
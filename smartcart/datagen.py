@@ -0,0 +1,376 @@
+"""Vectorized synthetic data generation for the SmartCart demo.
+
+Every table is built in a single NumPy pass (one batched RNG draw per
+table) so the same code serves the 5-store demo and stress-test sizes
+such as 5,000 stores x 20,000 SKUs x 90 days.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Demo dark stores (the first rows of every generated store table)
+STORE_NAMES = ['Indiranagar', 'Koramangala', 'HSR Layout', 'Whitefield', 'Electronic City']
+STORE_CURRENT_INVENTORY = [78, 92, 65, 45, 83]
+STORE_OPTIMAL_INVENTORY = [85, 95, 70, 60, 80]
+STORE_LAT = [12.9784, 12.9316, 12.9141, 12.9698, 12.8499]
+STORE_LON = [77.6408, 77.6271, 77.6380, 77.7499, 77.6699]
+STOCKOUT_RISK_LEVELS = ['Very Low', 'Low', 'Medium', 'High']
+
+# Bengaluru bounding box used to place additional stores
+CITY_LAT_RANGE = (12.85, 13.10)
+CITY_LON_RANGE = (77.50, 77.78)
+
+# Demo catalogue (the first rows of every generated product table)
+PRODUCT_NAMES = ['Milk 1L', 'Bread', 'Eggs 6pk', 'Bananas', 'Tomatoes', 'Chicken', 'Rice 1kg', 'Bottled Water', 'Yogurt']
+PRODUCT_CATEGORIES = ['Dairy', 'Bakery', 'Dairy', 'Fruits', 'Vegetables', 'Meat', 'Groceries', 'Beverages', 'Dairy']
+PRODUCT_REORDER_FREQUENCY = [1, 1, 2, 2, 2, 3, 7, 3, 2]
+PRODUCT_SHELF_LIFE_DAYS = [7, 3, 14, 5, 7, 3, 180, 365, 14]
+PRODUCT_AVG_DAILY_SALES = [42, 35, 28, 31, 25, 18, 12, 45, 22]
+
+# Per-category defaults for generated SKUs: (shelf_life_days, reorder_frequency)
+CATEGORY_DEFAULTS = {
+    'Dairy': (7, 2),
+    'Bakery': (3, 1),
+    'Fruits': (5, 2),
+    'Vegetables': (7, 2),
+    'Meat': (3, 3),
+    'Groceries': (180, 7),
+    'Beverages': (365, 3),
+}
+
+# Customer segments
+SEGMENT_NAMES = ['High-value Shoppers', 'Regular Customers', 'Occasional Buyers', 'New Users']
+SEGMENT_SIZE = [25, 40, 20, 15]
+SEGMENT_AVG_ORDER_VALUE = [520, 320, 180, 220]
+SEGMENT_ORDER_FREQUENCY = [4.5, 2.8, 1.2, 1.0]
+SEGMENT_RETENTION_RATE = [92, 78, 45, 60]
+
+# Relative order volume by hour of day for each segment (night hours are quiet)
+SEGMENT_HOUR_WEIGHTS = np.full((len(SEGMENT_NAMES), 24), 2.0, dtype=np.float32)
+SEGMENT_HOUR_WEIGHTS[0, 6:] = [10] * 12 + [25] * 6
+SEGMENT_HOUR_WEIGHTS[1, 6:] = [12] * 12 + [18] * 3 + [12] * 3
+SEGMENT_HOUR_WEIGHTS[2, 6:] = [5] * 9 + [10] * 6 + [5] * 3
+SEGMENT_HOUR_WEIGHTS[3, 6:] = 8
+
+# Basket categories and each segment's relative preference for them
+ORDER_CATEGORIES = ['Dairy', 'Fresh Produce', 'Snacks', 'Beverages', 'Ready-to-eat']
+SEGMENT_CATEGORY_WEIGHTS = np.array([
+    [65, 85, 65, 65, 85],
+    [75, 60, 60, 75, 60],
+    [50, 50, 70, 70, 50],
+    [45, 45, 60, 60, 45],
+], dtype=np.float32)
+
+# Items per order basket (mean) and the share drawn from the basket's theme category
+BASKET_MEAN_ITEMS = 4.0
+BASKET_THEME_SHARE = 0.6
+
+# RFM feature columns for customer segmentation
+CUSTOMER_FEATURES = ['recency_days', 'orders_per_week', 'avg_order_value']
+
+# Days without an order after which a customer counts as churned
+RETENTION_WINDOW_DAYS = 30
+
+# Most customers live around a dark store; the rest anywhere in the city
+NEAR_STORE_SHARE = 0.8
+NEAR_STORE_KM = 2.5
+
+# Forecast-page categories: (base, amplitude, phase in hours)
+FORECAST_CATEGORIES = ['Dairy', 'Fruits & Vegetables', 'Bakery', 'Beverages', 'Meat & Seafood']
+FORECAST_CATEGORY_CURVES = np.array([
+    [30, 15, 0],
+    [40, 20, 2],
+    [25, 20, 1],
+    [35, 10, 0],
+    [20, 30, 4],
+], dtype=np.float32)
+
+WEEKEND_MULTIPLIER = 1.3
+
+# Names of the per-table random streams spawned from one seed
+TABLE_STREAMS = ('hourly', 'store', 'product', 'store_demand', 'category', 'stock', 'customers', 'orders', 'addresses', 'baskets')
+
+
+@dataclass(frozen=True)
+class SizeConfig:
+    """Size of a generated dataset; the defaults reproduce the demo."""
+    n_stores: int = len(STORE_NAMES)
+    n_skus: int = len(PRODUCT_NAMES)
+    horizon_days: int = 7
+    n_customers: int = 100_000
+    n_orders: int = 50_000
+
+    @property
+    def n_hours(self):
+        return self.horizon_days * 24
+
+
+def hourly_index(n_hours, end=None):
+    """Hourly timestamps ending at ``end`` (default: the current hour)."""
+    end = pd.Timestamp.now() if end is None else pd.Timestamp(end)
+    return pd.date_range(end=end.floor('h'), periods=n_hours, freq='h')
+
+
+def seasonal_profile(hours, days_of_week):
+    """Base demand for each (hour, day-of-week): two daily peaks plus a weekend lift."""
+    hours = np.asarray(hours, dtype=np.float32)
+    base = 20 + 15 * np.sin(np.pi * hours / 12) + 5 * np.sin(np.pi * hours / 6)
+    weekend = np.asarray(days_of_week) >= 5
+    return np.where(weekend, base * WEEKEND_MULTIPLIER, base).astype(np.float32)
+
+
+def generate_hourly_data(config, rng, end=None):
+    timestamps = hourly_index(config.n_hours, end)
+    hours = timestamps.hour.to_numpy(dtype=np.int8)
+    days_of_week = timestamps.dayofweek.to_numpy(dtype=np.int8)
+    base = seasonal_profile(hours, days_of_week)
+
+    # Actuals get 10% noise, the forecast 15%
+    noise = rng.standard_normal((2, config.n_hours), dtype=np.float32)
+    noise *= np.array([[0.1], [0.15]], dtype=np.float32)
+    demand, forecast = np.maximum(0, base * (1 + noise)).astype(np.int32)
+
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'demand': demand,
+        'forecast': forecast,
+        'hour': hours,
+        'day_of_week': days_of_week,
+    })
+
+
+def generate_store_data(config, rng):
+    n = config.n_stores
+    n_fixed = min(n, len(STORE_NAMES))
+    n_extra = n - n_fixed
+
+    draws = rng.random((4, n_extra))
+    names = STORE_NAMES[:n_fixed] + [f'Store {i + 1:04d}' for i in range(n_fixed, n)]
+    lat = np.concatenate([STORE_LAT[:n_fixed], CITY_LAT_RANGE[0] + draws[0] * np.ptp(CITY_LAT_RANGE)])
+    lon = np.concatenate([STORE_LON[:n_fixed], CITY_LON_RANGE[0] + draws[1] * np.ptp(CITY_LON_RANGE)])
+    optimal = np.concatenate([STORE_OPTIMAL_INVENTORY[:n_fixed], 60 + draws[2] * 40]).astype(np.int32)
+    current = np.concatenate([
+        STORE_CURRENT_INVENTORY[:n_fixed],
+        optimal[n_fixed:] * (0.6 + draws[3] * 0.6),
+    ]).astype(np.int32)
+
+    # Risk follows the inventory gap; the demo stores keep their curated labels
+    ratio = current / optimal
+    risk = np.select(
+        [ratio >= 1.0, ratio >= 0.9, ratio >= 0.8],
+        ['Very Low', 'Low', 'Medium'],
+        default='High',
+    )
+    risk[:n_fixed] = ['Low', 'Very Low', 'Medium', 'High', 'Low'][:n_fixed]
+
+    return pd.DataFrame({
+        'name': names,
+        'current_inventory': current,
+        'optimal_inventory': optimal,
+        'stockout_risk': pd.Categorical(risk, categories=STOCKOUT_RISK_LEVELS, ordered=True),
+        'lat': lat.astype(np.float32),
+        'lon': lon.astype(np.float32),
+    })
+
+
+def generate_product_data(config, rng):
+    n = config.n_skus
+    n_fixed = min(n, len(PRODUCT_NAMES))
+    n_extra = n - n_fixed
+
+    category_names = list(CATEGORY_DEFAULTS)
+    category_codes = rng.integers(0, len(category_names), size=n_extra)
+    shelf_life, reorder_frequency = np.array(list(CATEGORY_DEFAULTS.values()), dtype=np.int32).T
+    avg_daily_sales = rng.gamma(2.0, 12.0, size=n_extra)
+
+    names = PRODUCT_NAMES[:n_fixed] + [f'SKU {i + 1:05d}' for i in range(n_fixed, n)]
+    categories = np.concatenate([
+        np.array(PRODUCT_CATEGORIES[:n_fixed], dtype=object),
+        np.array(category_names, dtype=object)[category_codes],
+    ])
+
+    return pd.DataFrame({
+        'name': names,
+        'category': pd.Categorical(categories, categories=category_names),
+        'reorder_frequency': np.concatenate([PRODUCT_REORDER_FREQUENCY[:n_fixed], reorder_frequency[category_codes]]).astype(np.int32),
+        'shelf_life_days': np.concatenate([PRODUCT_SHELF_LIFE_DAYS[:n_fixed], shelf_life[category_codes]]).astype(np.int32),
+        'avg_daily_sales': np.concatenate([PRODUCT_AVG_DAILY_SALES[:n_fixed], np.maximum(1, avg_daily_sales)]).astype(np.int32),
+    })
+
+
+def generate_segment_data():
+    return pd.DataFrame({
+        'name': SEGMENT_NAMES,
+        'size': np.array(SEGMENT_SIZE, dtype=np.int32),
+        'avg_order_value': np.array(SEGMENT_AVG_ORDER_VALUE, dtype=np.int32),
+        'order_frequency': np.array(SEGMENT_ORDER_FREQUENCY, dtype=np.float32),
+        'retention_rate': np.array(SEGMENT_RETENTION_RATE, dtype=np.int32),
+    })
+
+
+def generate_store_scale(config, rng):
+    """Relative demand level of each store (first draws of the store-demand stream)."""
+    scale = 1 + 0.15 * rng.standard_normal(config.n_stores, dtype=np.float32)
+    return np.clip(scale, 0.7, 1.3, out=scale)
+
+
+def generate_store_demand(config, hourly_data, rng):
+    """Hourly demand per store as an (n_stores, n_hours) float32 matrix."""
+    base = seasonal_profile(hourly_data['hour'].to_numpy(), hourly_data['day_of_week'].to_numpy())
+    scale = generate_store_scale(config, rng)
+    noise = rng.standard_normal((config.n_stores, config.n_hours), dtype=np.float32)
+    demand = scale[:, None] * base[None, :] * (1 + 0.1 * noise)
+    return np.maximum(0, demand, out=demand)
+
+
+def generate_category_demand(config, hourly_data, rng):
+    """Hourly demand per forecast-page category as an (n_categories, n_hours) float32 matrix."""
+    hours = hourly_data['hour'].to_numpy(dtype=np.float32)
+    base, amplitude, phase = FORECAST_CATEGORY_CURVES.T
+    curves = base[:, None] + amplitude[:, None] * np.sin(np.pi * (hours[None, :] - phase[:, None]) / 12)
+    weekend = hourly_data['day_of_week'].to_numpy() >= 5
+    curves[:, weekend] *= WEEKEND_MULTIPLIER
+    curves += 3 * rng.standard_normal(curves.shape, dtype=np.float32)
+    return np.maximum(5, curves, out=curves)
+
+
+def generate_stock_on_hand(config, product_data, rng):
+    """Units on hand per store and SKU as an (n_stores, n_skus) int32 matrix.
+
+    Each store holds between a third of a day and four days of each SKU's
+    average sales.
+    """
+    days_of_cover = rng.random((config.n_stores, config.n_skus), dtype=np.float32)
+    days_of_cover *= 3.7
+    days_of_cover += 0.3
+    days_of_cover *= product_data['avg_daily_sales'].to_numpy(dtype=np.float32)
+    return days_of_cover.astype(np.int32)
+
+
+def generate_customer_features(config, rng, n_customers=None):
+    """RFM features per customer as an (n_customers, 3) float32 matrix.
+
+    Customers are drawn from the demo segments in proportion to their size;
+    retained customers ordered within the retention window, churned ones
+    up to six months ago. Columns follow ``CUSTOMER_FEATURES``.
+    """
+    n = config.n_customers if n_customers is None else n_customers
+    share = np.array(SEGMENT_SIZE, dtype=np.float64) / sum(SEGMENT_SIZE)
+    segment = rng.choice(len(SEGMENT_NAMES), size=n, p=share)
+    draws = rng.random((4, n), dtype=np.float32)
+
+    retained = draws[0] * 100 < np.array(SEGMENT_RETENTION_RATE, dtype=np.float32)[segment]
+    recency = np.where(
+        retained,
+        -np.log1p(-draws[1]) * 5,
+        RETENTION_WINDOW_DAYS + draws[1] * 150,
+    )
+    # Lognormal-ish spread via exp of a centred uniform keeps one draw per column
+    frequency = np.array(SEGMENT_ORDER_FREQUENCY, dtype=np.float32)[segment] * np.exp(draws[2] - 0.5)
+    order_value = np.array(SEGMENT_AVG_ORDER_VALUE, dtype=np.float32)[segment] * np.exp(0.6 * (draws[3] - 0.5))
+    return np.column_stack([recency, frequency, order_value]).astype(np.float32)
+
+
+def _sample_rows(weights, codes, u):
+    """Inverse-CDF draw of one column per row from per-code weight rows."""
+    cdf = np.cumsum(weights, axis=1)
+    cdf /= cdf[:, -1:]
+    return (u[:, None] > cdf[codes]).sum(axis=1)
+
+
+def generate_order_log(config, rng, n_orders=None, end=None):
+    """Synthetic orders with customer, segment, timestamp and basket category.
+
+    Segments order in proportion to size x frequency, at their preferred
+    hours and with their category preferences, over the config's horizon.
+    """
+    n = config.n_orders if n_orders is None else n_orders
+    share = np.array(SEGMENT_SIZE, dtype=np.float64) * SEGMENT_ORDER_FREQUENCY
+    segment = rng.choice(len(SEGMENT_NAMES), size=n, p=share / share.sum())
+    draws = rng.random((4, n), dtype=np.float32)
+
+    hour = _sample_rows(SEGMENT_HOUR_WEIGHTS, segment, draws[0])
+    category = _sample_rows(SEGMENT_CATEGORY_WEIGHTS, segment, draws[1])
+    day = (draws[2] * config.horizon_days).astype(np.int64)
+    first_day = hourly_index(config.n_hours, end)[0].normalize()
+    offsets = (day * 3600 * 24 + hour * 3600 + (draws[3] * 3600).astype(np.int64)).astype('timedelta64[s]')
+    timestamps = np.datetime64(first_day, 's') + np.sort(offsets)
+
+    order = np.argsort(offsets, kind='stable')
+    return pd.DataFrame({
+        'customer_id': rng.integers(0, config.n_customers, size=n, dtype=np.int32),
+        'segment': pd.Categorical.from_codes(segment[order], SEGMENT_NAMES),
+        'timestamp': timestamps,
+        'category': pd.Categorical.from_codes(category[order], ORDER_CATEGORIES),
+    })
+
+
+def generate_baskets(config, rng, product_data, n_baskets=None):
+    """Order baskets as CSR-style ``(offsets, sku)`` arrays.
+
+    Basket ``i`` holds ``sku[offsets[i]:offsets[i + 1]]``. Each basket has a
+    theme category; ``BASKET_THEME_SHARE`` of its items come from that
+    category and the rest from the whole catalogue, both weighted by average
+    sales, so SKUs of one category are bought together more often than chance.
+    """
+    n = config.n_orders if n_baskets is None else n_baskets
+    codes = product_data['category'].cat.codes.to_numpy()
+    n_categories = len(product_data['category'].cat.categories)
+    by_category = np.argsort(codes, kind='stable')
+    cdf = np.cumsum(product_data['avg_daily_sales'].to_numpy(dtype=np.float64)[by_category])
+    # Cumulative sales at each category's first SKU, so category c spans [bounds[c], bounds[c + 1])
+    bounds = np.r_[0.0, cdf][np.searchsorted(codes[by_category], np.arange(n_categories + 1))]
+    width = np.diff(bounds)
+
+    sizes = 1 + rng.poisson(BASKET_MEAN_ITEMS - 1, size=n)
+    theme = rng.choice(n_categories, size=n, p=width / cdf[-1])
+    basket = np.repeat(np.arange(n), sizes)
+    draws = rng.random((2, len(basket)))
+    themed = draws[0] < BASKET_THEME_SHARE
+    low = np.where(themed, bounds[theme[basket]], 0.0)
+    span = np.where(themed, width[theme[basket]], cdf[-1])
+    position = np.minimum(np.searchsorted(cdf, low + draws[1] * span, side='right'), len(cdf) - 1)
+    return np.r_[0, np.cumsum(sizes)], by_category[position].astype(np.int32)
+
+
+def generate_customer_addresses(config, rng, store_lat, store_lon, n_customers=None):
+    """Home latitude and longitude per customer as two float32 arrays.
+
+    ``NEAR_STORE_SHARE`` of customers are scattered around a random store
+    (normal, ``NEAR_STORE_KM`` per axis); the rest are uniform over the city.
+    """
+    n = config.n_customers if n_customers is None else n_customers
+    store_lat, store_lon = np.asarray(store_lat, dtype=np.float64), np.asarray(store_lon, dtype=np.float64)
+    store = rng.integers(0, len(store_lat), size=n)
+    offset = rng.standard_normal((2, n)) * NEAR_STORE_KM / 111.195
+    uniform = rng.random((2, n))
+    near = rng.random(n) < NEAR_STORE_SHARE
+    lat = np.where(near, store_lat[store] + offset[0], CITY_LAT_RANGE[0] + uniform[0] * np.ptp(CITY_LAT_RANGE))
+    lon = np.where(near, store_lon[store] + offset[1] / np.cos(np.radians(store_lat[store])),
+                   CITY_LON_RANGE[0] + uniform[1] * np.ptp(CITY_LON_RANGE))
+    return lat.astype(np.float32), lon.astype(np.float32)
+
+
+def table_rngs(seed=None):
+    """One independent generator per table, so resizing one table leaves the others unchanged."""
+    streams = np.random.SeedSequence(seed).spawn(len(TABLE_STREAMS))
+    return {name: np.random.default_rng(s) for name, s in zip(TABLE_STREAMS, streams)}
+
+
+def generate_demo_data(config=None, seed=None, end=None):
+    """Build every demo table; the same ``seed`` and ``end`` give identical data."""
+    config = config or SizeConfig()
+    rngs = table_rngs(seed)
+
+    hourly_data = generate_hourly_data(config, rngs['hourly'], end)
+    product_data = generate_product_data(config, rngs['product'])
+    return {
+        'hourly_data': hourly_data,
+        'store_data': generate_store_data(config, rngs['store']),
+        'product_data': product_data,
+        'segment_data': generate_segment_data(),
+        'store_demand': generate_store_demand(config, hourly_data, rngs['store_demand']),
+        'category_demand': generate_category_demand(config, hourly_data, rngs['category']),
+        'stock_on_hand': generate_stock_on_hand(config, product_data, rngs['stock']),
+    }
@@ -0,0 +1,227 @@
+"""Perishable inventory simulation with FIFO lots and expiry.
+
+Stock for every store x SKU row is a small ring buffer of lots, each with
+its units and the day it expires, held in two ``(n_rows, slots)`` arrays
+plus a head index and lot count per row. A simulated day is a handful of
+array operations over all rows: deliveries are appended at the tail,
+expired lots are written off from the head, demand is filled oldest lot
+first through a cumulative sum across the slots, and a periodic-review
+order-up-to policy places orders that arrive after the lead time. Rows
+are simulated in blocks so temporaries stay bounded at any catalogue size.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Lots held per row; a delivery to a full buffer is merged into its newest lot
+DEFAULT_SLOTS = 8
+
+# Rows simulated together; bounds the (rows, slots) temporaries
+DEFAULT_BLOCK_ROWS = 500_000
+
+DAILY_COLUMNS = ['demand', 'sold', 'lost', 'wasted', 'received', 'on_hand']
+
+
+class LotBuffer:
+    """FIFO lots per row in fixed-size ring buffers."""
+
+    def __init__(self, n_rows, slots=DEFAULT_SLOTS):
+        self.slots = slots
+        self.units = np.zeros((n_rows, slots), dtype=np.int32)
+        self.expiry = np.zeros((n_rows, slots), dtype=np.int16)
+        self.head = np.zeros(n_rows, dtype=np.int16)
+        self.count = np.zeros(n_rows, dtype=np.int16)
+        self._row_start = np.arange(n_rows, dtype=np.int64)[:, None] * slots
+        self._offsets = np.arange(slots, dtype=np.int16)
+
+    def on_hand(self):
+        return self.units.sum(axis=1, dtype=np.int64)
+
+    def push(self, units, expiry_day):
+        """Append a lot to every row with ``units > 0``; returns how many were merged into a full buffer."""
+        rows = np.flatnonzero(units > 0)
+        full = self.count[rows] == self.slots
+        slot = (self.head[rows] + self.count[rows] - full) % self.slots
+        self.units[rows, slot] = np.where(full, self.units[rows, slot], 0) + units[rows]
+        # A merged lot keeps the older expiry, so merging can only overstate wastage
+        self.expiry[rows, slot] = np.where(full, self.expiry[rows, slot], expiry_day[rows])
+        self.count[rows] += ~full
+        return int(full.sum())
+
+    def step(self, day, demand):
+        """Write off lots expiring by ``day``, then fill ``demand`` oldest lot first.
+
+        Returns units sold and units wasted per row.
+        """
+        # Only as many positions as the fullest row holds, oldest lot first
+        depth = int(self.count.max(initial=0))
+        if depth == 0:
+            return np.zeros_like(demand), np.zeros_like(demand)
+        offsets = self._offsets[:depth]
+        flat = self._row_start + (self.head[:, None] + offsets) % self.slots
+        units = self.units.ravel()[flat]
+        live = offsets < self.count[:, None]
+
+        # Lots arrive in expiry order, so expired lots are always a prefix
+        expired = live & (self.expiry.ravel()[flat] <= day)
+        wasted = np.where(expired, units, 0).sum(axis=1, dtype=np.int32)
+        units[expired] = 0
+
+        before = np.cumsum(units, axis=1, dtype=np.int32)
+        before -= units
+        taken = np.clip(demand[:, None] - before, 0, units)
+        units -= taken
+        sold = taken.sum(axis=1, dtype=np.int32)
+
+        # Emptied lots (expired or sold out) are likewise a prefix; pop them
+        popped = self.count - (live & (units > 0)).sum(axis=1, dtype=np.int16)
+        self.units.ravel()[flat] = units
+        self.head = (self.head + popped) % self.slots
+        self.count -= popped
+        return sold, wasted
+
+
+@dataclass
+class SimulationResult:
+    """Per-row totals over the simulated days and network totals per day."""
+    demand: np.ndarray
+    sold: np.ndarray
+    wasted: np.ndarray
+    received: np.ndarray
+    unit_days: np.ndarray
+    stockout_days: np.ndarray
+    daily: pd.DataFrame
+    merged_lots: int
+
+    @property
+    def lost(self):
+        return self.demand - self.sold
+
+    def summary(self):
+        demand = int(self.demand.sum(dtype=np.int64))
+        sold = int(self.sold.sum(dtype=np.int64))
+        wasted = int(self.wasted.sum(dtype=np.int64))
+        received = int(self.received.sum(dtype=np.int64))
+        return {
+            'days': len(self.daily),
+            'demand': demand,
+            'sold': sold,
+            'lost_sales': demand - sold,
+            'wasted': wasted,
+            'fill_rate': sold / max(demand, 1),
+            'wastage_rate': wasted / max(sold + wasted, 1),
+            'in_stock_rate': 1 - int(self.stockout_days.sum(dtype=np.int64)) / max(len(self.stockout_days) * len(self.daily), 1),
+            'received': received,
+            'merged_lots': self.merged_lots,
+        }
+
+
+TOTALS = ('demand', 'sold', 'wasted', 'received', 'unit_days')
+
+
+def _simulate_block(rows, current_stock, shelf_life, demand, reorder_point, order_up_to, review_days,
+                    n_days, lead_time_days, slots, daily):
+    n_rows = len(current_stock)
+    lots = LotBuffer(n_rows, slots)
+    # Opening stock is taken to be halfway through its shelf life
+    lots.push(current_stock, (shelf_life + 1) // 2)
+    pipeline = np.zeros((lead_time_days, n_rows), dtype=np.int32)
+
+    totals = {name: np.zeros(n_rows, dtype=np.int64) for name in TOTALS}
+    stockout_days = np.zeros(n_rows, dtype=np.int16)
+    on_hand = lots.on_hand()
+    on_order = np.zeros(n_rows, dtype=np.int64)
+    merged = 0
+    for day in range(n_days):
+        arriving = pipeline[day % lead_time_days]
+        merged += lots.push(arriving, day + shelf_life)
+        received = arriving.copy()
+        arriving[:] = 0
+        on_order -= received
+
+        wanted = demand(day, rows).astype(np.int32)
+        sold, wasted = lots.step(day, wanted)
+        stockout_days += sold < wanted
+        on_hand += received
+        on_hand -= sold
+        on_hand -= wasted
+
+        position = on_hand + on_order
+        reorder = (day % review_days == 0) & (position <= reorder_point)
+        ordered = np.where(reorder, np.maximum(order_up_to - position, 0), 0)
+        pipeline[day % lead_time_days] = ordered
+        on_order += ordered
+
+        day_totals = {}
+        for name, values in (('demand', wanted), ('sold', sold), ('wasted', wasted), ('received', received)):
+            totals[name] += values
+            day_totals[name] = values.sum(dtype=np.int64)
+        # Holding is charged on stock left at the end of each day
+        totals['unit_days'] += on_hand
+        day_totals['lost'] = day_totals['demand'] - day_totals['sold']
+        day_totals['on_hand'] = on_hand.sum()
+        daily[day] += [day_totals[name] for name in DAILY_COLUMNS]
+    return totals, stockout_days, merged
+
+
+def simulate(current_stock, shelf_life_days, daily_demand, reorder_point, order_up_to, review_days,
+             n_days=90, lead_time_days=1, slots=DEFAULT_SLOTS, block_rows=DEFAULT_BLOCK_ROWS, seed=None,
+             demand=None):
+    """Replay Poisson demand around ``daily_demand`` against a reorder policy per row.
+
+    Every review day (each row's ``review_days``) a row whose stock plus
+    open orders is at or below ``reorder_point`` orders up to
+    ``order_up_to``; orders arrive ``lead_time_days`` later as a fresh lot
+    that expires ``shelf_life_days`` after arrival. Unfilled demand is lost.
+    ``demand(day, rows)`` may supply the demand of a ``rows`` slice instead
+    of the Poisson draws, e.g. to share scenarios between rows.
+    """
+    if lead_time_days < 1:
+        raise ValueError("lead_time_days must be at least 1")
+    columns = [np.asarray(values) for values in (current_stock, shelf_life_days, daily_demand,
+                                                 reorder_point, order_up_to, review_days)]
+    current_stock, shelf_life, mean_demand, reorder_point, order_up_to, review_days = (
+        columns[0].astype(np.int32), columns[1].astype(np.int16), columns[2].astype(np.float64),
+        columns[3].astype(np.int64), columns[4].astype(np.int64), np.maximum(columns[5], 1).astype(np.int16))
+    n_rows = len(current_stock)
+    rng = np.random.default_rng(seed)
+
+    daily = np.zeros((n_days, len(DAILY_COLUMNS)), dtype=np.int64)
+    if demand is None:
+        def demand(day, rows):
+            return rng.poisson(mean_demand[rows])
+
+    totals = {name: np.empty(n_rows, dtype=np.int64) for name in TOTALS}
+    stockout_days = np.empty(n_rows, dtype=np.int16)
+    merged = 0
+    for lo in range(0, n_rows, block_rows):
+        block = slice(lo, lo + block_rows)
+        block_totals, stockout_days[block], block_merged = _simulate_block(
+            block, current_stock[block], shelf_life[block], demand, reorder_point[block],
+            order_up_to[block], review_days[block], n_days, lead_time_days, slots, daily)
+        for name, values in block_totals.items():
+            totals[name][block] = values
+        merged += block_merged
+
+    return SimulationResult(
+        stockout_days=stockout_days,
+        daily=pd.DataFrame(daily, columns=DAILY_COLUMNS).rename_axis('day').reset_index(),
+        merged_lots=merged,
+        **totals,
+    )
+
+
+def simulate_plan(plan, n_days=90, lead_time_days=1, **kwargs):
+    """``simulate`` driven by the columns of an ``inventory.plan_inventory`` frame."""
+    return simulate(
+        plan['current_stock'].to_numpy(),
+        plan['shelf_life_days'].to_numpy(),
+        plan['daily_demand'].to_numpy(),
+        plan['reorder_point'].to_numpy(),
+        plan['optimal_stock'].to_numpy(),
+        plan['reorder_frequency'].to_numpy(),
+        n_days=n_days,
+        lead_time_days=lead_time_days,
+        **kwargs,
+    )
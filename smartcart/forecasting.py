@@ -0,0 +1,291 @@
+"""Batched seasonal demand forecasting over many series at once.
+
+Every series (store, category or store x SKU) is a row of one 2-D matrix.
+The model is multiplicative: an exponentially smoothed level times an
+hour-of-day profile times a day-of-week profile. Profiles come from
+indicator-matrix products and the smoothing recursion steps through time
+with all series updated together, so fitting 100k series is a handful of
+matrix operations rather than 100k model fits.
+
+Quantile forecasts are analytic: each series' one-step errors are taken as
+normal with its in-sample residual standard deviation, so P50/P90/P99 for
+every series and hour come from one broadcast over the point forecast.
+"""
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ALPHA = 0.1
+# Smoothing rates for the seasonal profiles during online updates
+DEFAULT_GAMMA = 0.05
+DEFAULT_DELTA = 0.02
+
+# Floor for seasonal factors so near-zero hours cannot blow up deseasonalized values
+MIN_FACTOR = 0.05
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def quantile_z(quantiles):
+    """Standard normal quantiles for probability levels, e.g. (0.5, 0.9) -> (0, 1.28)."""
+    return np.array([NormalDist().inv_cdf(q) for q in quantiles], dtype=np.float32)
+
+
+def hour_features(timestamps):
+    """Hour-of-day and day-of-week arrays for datetime-like values."""
+    index = pd.DatetimeIndex(np.asarray(timestamps, dtype='datetime64[ns]'))
+    return index.hour.to_numpy(), index.dayofweek.to_numpy()
+
+
+def _period_means(values, labels, n_labels):
+    """Per-row mean of ``values`` for each label via one indicator-matrix product."""
+    indicator = np.zeros((values.shape[1], n_labels), dtype=np.float32)
+    indicator[np.arange(values.shape[1]), labels] = 1
+    counts = indicator.sum(axis=0)
+    means = (values @ indicator) / np.maximum(counts, 1)
+    return means, counts > 0
+
+
+class SeasonalForecaster:
+    """Hour-of-day x day-of-week seasonal model with a smoothed level per series.
+
+    ``fit(history, start)`` takes an ``(n_series, n_hours)`` matrix of hourly
+    demand whose first column is at ``start``; ``predict(horizon)`` returns an
+    ``(n_series, horizon)`` matrix for the hours that follow.
+    """
+
+    def __init__(self, alpha=DEFAULT_ALPHA, gamma=DEFAULT_GAMMA, delta=DEFAULT_DELTA):
+        self.alpha = alpha
+        self.gamma = gamma
+        self.delta = delta
+        self.level = None
+        self.hour_profile = None
+        self.dow_profile = None
+        self.sse = None
+        self.n_obs = 0
+        self.end = None
+
+    @property
+    def n_series(self):
+        return 0 if self.level is None else len(self.level)
+
+    def fit(self, history, start):
+        history = np.asarray(history, dtype=np.float32)
+        if history.ndim == 1:
+            history = history[None, :]
+        n_series, n_hours = history.shape
+        start = np.datetime64(pd.Timestamp(start).floor('h'), 'h')
+        hours, days = hour_features(start + np.arange(n_hours))
+
+        # Seasonal profiles, normalised so each series' factors average to 1
+        series_mean = np.maximum(history.mean(axis=1, keepdims=True), 1e-6)
+        hour_means, _ = _period_means(history, hours, 24)
+        self.hour_profile = np.maximum(hour_means / series_mean, MIN_FACTOR)
+        self.hour_profile /= self.hour_profile.mean(axis=1, keepdims=True)
+
+        without_hours = history / self.hour_profile[:, hours]
+        dow_means, seen = _period_means(without_hours, days, 7)
+        dow_profile = np.where(seen, dow_means / series_mean, 1.0)
+        self.dow_profile = np.maximum(dow_profile, MIN_FACTOR).astype(np.float32)
+        self.dow_profile /= self.dow_profile[:, seen].mean(axis=1, keepdims=True)
+
+        # Simple exponential smoothing of the deseasonalized series, all rows per step
+        season = self.hour_profile[:, hours] * self.dow_profile[:, days]
+        deseasonalized = history / season
+        level = deseasonalized[:, :min(24, n_hours)].mean(axis=1)
+        sse = np.zeros(n_series, dtype=np.float64)
+        for t in range(n_hours):
+            sse += (history[:, t] - level * season[:, t]) ** 2
+            level += self.alpha * (deseasonalized[:, t] - level)
+
+        self.level = level.astype(np.float32)
+        self.sse = sse
+        self.n_obs = n_hours
+        self.end = start + np.timedelta64(n_hours - 1, 'h')
+        return self
+
+    def fit_weekly(self, weekly_means, end, weekly_counts=None, weekly_square_means=None):
+        """Fit from ``(n_series, 168)`` hour-of-week means, e.g. ``stream.WeeklyProfile.mean()``.
+
+        Lets a streamed history of any length be summarized in bounded memory
+        first; the level is the series mean since no sequence is available.
+        With the hours seen and mean squared demand per slot
+        (``WeeklyProfile.counts`` and ``square_mean()``) the in-sample error
+        around the fitted profile is recovered too, so quantile forecasts have
+        a spread; without them ``residual_std`` starts at zero.
+        """
+        weekly = np.asarray(weekly_means, dtype=np.float32).reshape(-1, 7, 24)
+        series_mean = np.maximum(weekly.mean(axis=(1, 2)), 1e-6)
+        self.hour_profile = np.maximum(weekly.mean(axis=1) / series_mean[:, None], MIN_FACTOR)
+        self.hour_profile /= self.hour_profile.mean(axis=1, keepdims=True)
+        dow_profile = (weekly / self.hour_profile[:, None, :]).mean(axis=2) / series_mean[:, None]
+        self.dow_profile = np.maximum(dow_profile, MIN_FACTOR).astype(np.float32)
+        self.dow_profile /= self.dow_profile.mean(axis=1, keepdims=True)
+
+        self.level = series_mean.astype(np.float32)
+        self.sse = np.zeros(len(self.level), dtype=np.float64)
+        self.n_obs = 0
+        if weekly_counts is not None and weekly_square_means is not None:
+            # Sum over a slot's hours of (y - fit)^2, from the slot's moments alone
+            fitted = self.level[:, None, None] * self.dow_profile[:, :, None] * self.hour_profile[:, None, :]
+            fitted = fitted.reshape(len(self.level), -1).astype(np.float64)
+            counts = np.asarray(weekly_counts, dtype=np.float64)
+            means = weekly.reshape(len(self.level), -1).astype(np.float64)
+            square_means = np.asarray(weekly_square_means, dtype=np.float64)
+            self.sse = np.maximum((counts * (square_means - 2 * fitted * means + fitted ** 2)).sum(axis=1), 0)
+            self.n_obs = int(counts.sum(axis=1).max())
+        self.end = np.datetime64(pd.Timestamp(end).floor('h'), 'h')
+        return self
+
+    def update(self, observed):
+        """Fold in the next hour (or hours) of actual demand after ``end``.
+
+        ``observed`` is ``(n_series,)`` for one hour or ``(n_series, k)`` for
+        ``k`` consecutive hours. Each hour updates the level, the matching
+        hour-of-day and day-of-week factors and the error statistics in
+        O(n_series), so the model tracks new orders without a refit.
+        """
+        if self.level is None:
+            raise RuntimeError("SeasonalForecaster must be fit before updating")
+        observed = np.asarray(observed, dtype=np.float32)
+        if observed.ndim == 1:
+            observed = observed[:, None]
+        timestamps = self.end + np.arange(1, observed.shape[1] + 1)
+        hours, days = hour_features(timestamps)
+
+        for t in range(observed.shape[1]):
+            y, h, d = observed[:, t], hours[t], days[t]
+            hour_factor = self.hour_profile[:, h]
+            dow_factor = self.dow_profile[:, d]
+            self.sse += (y - self.level * hour_factor * dow_factor) ** 2
+            self.level += self.alpha * (y / (hour_factor * dow_factor) - self.level)
+
+            level = np.maximum(self.level, 1e-6)
+            self.hour_profile[:, h] += self.gamma * (np.maximum(y / (level * dow_factor), MIN_FACTOR) - hour_factor)
+            self.dow_profile[:, d] += self.delta * (np.maximum(y / (level * self.hour_profile[:, h]), MIN_FACTOR) - dow_factor)
+
+        self.n_obs += observed.shape[1]
+        self.end = timestamps[-1]
+        return self
+
+    def state_dict(self):
+        """Fitted state as plain arrays (what ``save`` writes)."""
+        return {
+            'alpha': np.float32(self.alpha),
+            'gamma': np.float32(self.gamma),
+            'delta': np.float32(self.delta),
+            'level': self.level,
+            'hour_profile': self.hour_profile,
+            'dow_profile': self.dow_profile,
+            'sse': self.sse,
+            'n_obs': np.int64(self.n_obs),
+            'end': np.datetime64(self.end, 'h'),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        model = cls(alpha=float(state['alpha']), gamma=float(state['gamma']), delta=float(state['delta']))
+        model.level = np.asarray(state['level'], dtype=np.float32)
+        model.hour_profile = np.asarray(state['hour_profile'], dtype=np.float32)
+        model.dow_profile = np.asarray(state['dow_profile'], dtype=np.float32)
+        model.sse = np.asarray(state['sse'], dtype=np.float64)
+        model.n_obs = int(state['n_obs'])
+        model.end = np.datetime64(state['end'], 'h')
+        return model
+
+    def save(self, path, **extra):
+        """Write the model (plus any ``extra`` arrays) to a single ``.npz`` artifact.
+
+        The file is written beside ``path`` and renamed into place, so a
+        crash mid-write never leaves a truncated checkpoint behind.
+        """
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **self.state_dict(), **extra)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls.from_state(artifact)
+
+    def residual_std(self):
+        """One-step-ahead in-sample error standard deviation per series."""
+        return np.sqrt(self.sse / max(self.n_obs, 1)).astype(np.float32)
+
+    def forecast_index(self, horizon):
+        """Timestamps of the ``horizon`` hours after the fitted history."""
+        return pd.DatetimeIndex(self.end + np.arange(1, horizon + 1))
+
+    def predict_at(self, timestamps):
+        """Forecast every series at arbitrary future ``timestamps``."""
+        if self.level is None:
+            raise RuntimeError("SeasonalForecaster must be fit before predicting")
+        hours, days = hour_features(timestamps)
+        return self.level[:, None] * self.hour_profile[:, hours] * self.dow_profile[:, days]
+
+    def predict(self, horizon):
+        return self.predict_at(self.forecast_index(horizon))
+
+    def predict_quantiles(self, horizon, quantiles=DEFAULT_QUANTILES, total=False):
+        """Forecast quantiles as an ``(n_series, horizon, n_quantiles)`` array.
+
+        Hourly errors are normal with the series' ``residual_std`` and
+        independent across hours, so ``total=True`` returns ``(n_series,
+        n_quantiles)`` quantiles of demand summed over the horizon instead.
+        Quantiles are floored at zero demand.
+        """
+        if total:
+            spread = np.float32(np.sqrt(horizon)) * self.residual_std()[:, None] * quantile_z(quantiles)
+            return np.maximum(self.predict(horizon).sum(axis=1, keepdims=True) + spread, 0)
+        return self.quantiles_at(self.forecast_index(horizon), quantiles)
+
+    def quantiles_at(self, timestamps, quantiles=DEFAULT_QUANTILES):
+        """Hourly forecast quantiles at ``timestamps`` as an ``(n_series, len(timestamps), n_quantiles)`` array."""
+        forecast = self.predict_at(timestamps)
+        std = self.residual_std()
+        return np.maximum(forecast[:, :, None] + std[:, None, None] * quantile_z(quantiles), 0)
+
+    def summed_quantiles_at(self, timestamps, quantiles=DEFAULT_QUANTILES):
+        """Hourly quantiles of demand summed over all series, ``(len(timestamps), n_quantiles)``.
+
+        Series errors are independent, so their variances add: the spread is
+        ``sqrt(sum of residual_std ** 2)`` around the summed forecast, not the
+        sum of each series' quantiles.
+        """
+        forecast = self.predict_at(timestamps).sum(axis=0)
+        std = np.sqrt(np.square(self.residual_std(), dtype=np.float64).sum()).astype(np.float32)
+        return np.maximum(forecast[:, None] + std * quantile_z(quantiles), 0)
+
+    def predict_frame(self, horizon, series_names=None):
+        """Long-format forecast with one row per series and hour."""
+        index = self.forecast_index(horizon)
+        forecast = self.predict(horizon)
+        names = np.arange(self.n_series) if series_names is None else np.asarray(series_names)
+        return pd.DataFrame({
+            'series': np.repeat(names, horizon),
+            'timestamp': np.tile(index, self.n_series),
+            'forecast': forecast.ravel(),
+        })
+
+
+def load_checkpoint(path, data_key):
+    """The model checkpointed at ``path`` if it was fit on data with ``data_key``, else None.
+
+    ``data_key`` identifies the history the model came from (e.g. seed and
+    size config) and is written as ``save(path, data_key=...)``; a missing,
+    unkeyed or differently keyed file is not loaded.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as artifact:
+        if 'data_key' not in artifact.files or str(artifact['data_key']) != data_key:
+            return None
+        return SeasonalForecaster.from_state(artifact)
+
+
+def day_hours(date):
+    """The 24 hourly timestamps of ``date``."""
+    return pd.date_range(pd.Timestamp(date).normalize(), periods=24, freq='h')
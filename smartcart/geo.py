@@ -0,0 +1,207 @@
+"""Grid spatial index over store locations for batched nearest-store and radius queries.
+
+Stores are bucketed into square cells (at least ``cell_km`` on a side at
+every latitude of the grid) and sorted by cell, so each cell's stores are a
+contiguous slice described by a CSR offset array. A query batch searches
+rings of cells outward from each point: every ring expands the (query,
+cell) pairs into candidate stores with ``np.repeat``, ranks them by planar
+(equirectangular) distance, which at city scale orders stores the same as
+great-circle distance, and keeps the best ``k`` per query. Reported
+distances are haversine. A query is settled
+once its ``k``-th distance is within the ring's guaranteed radius, so most
+queries finish after the first ring or two. Queries that are still open
+after ``MAX_RINGS`` (far outside the grid) are finished by brute force.
+"""
+import numpy as np
+
+from smartcart.allocation import haversine_km
+
+KM_PER_DEGREE_LAT = 111.195
+
+# Orders further than this from every store cannot be served
+SERVICE_RADIUS_KM = 7.0
+
+# Delivery time model: picking and packing, then riding at a city average speed
+PREP_MINUTES = 4.0
+RIDER_SPEED_KMPH = 20.0
+
+DELIVERY_BUCKET_EDGES = [10, 15, 20]
+DELIVERY_BUCKETS = ['<10 min', '10-15 min', '15-20 min', '>20 min']
+
+# Target density of the default grid
+STORES_PER_CELL = 0.5
+
+# Rings searched before the remaining queries fall back to brute force
+MAX_RINGS = 16
+
+# Queries handled per batch; bounds the candidate arrays
+QUERY_BATCH = 250_000
+
+# Above any distance on Earth, for packing (query, km) into one sort key
+MAX_KEY_KM = 32_768.0
+
+# Planar distances may undershoot haversine slightly away from the grid's mean latitude
+PLANAR_SLACK = 1.02
+
+
+class StoreIndex:
+    """Uniform lat/lon grid over store locations."""
+
+    def __init__(self, lat, lon, cell_km=None):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.lat_min, self.lon_min = self.lat.min(), self.lon.min()
+        self.km_per_degree_lon = KM_PER_DEGREE_LAT * np.cos(np.radians(self.lat.mean()))
+        self.x, self.y = self._project(self.lat, self.lon)
+        lat_max = max(abs(self.lat.min()), abs(self.lat.max()))
+        if cell_km is None:
+            # About one store per two cells over the stores' extent; small cells settle queries in fewer candidates
+            extent_km = max(np.ptp(self.lat), np.ptp(self.lon)) * KM_PER_DEGREE_LAT
+            cell_km = max(extent_km * np.sqrt(STORES_PER_CELL / len(self.lat)), 0.1)
+        self.cell_km = cell_km
+        self.cell_lat = cell_km / KM_PER_DEGREE_LAT
+        self.cell_lon = cell_km / (KM_PER_DEGREE_LAT * np.cos(np.radians(min(lat_max, 89.0))))
+        self.cell_width_km = self.cell_lon * self.km_per_degree_lon
+
+        row, col = self._cells(self.lat, self.lon)
+        self.n_rows, self.n_cols = int(row.max()) + 1, int(col.max()) + 1
+        cell = row * self.n_cols + col
+        self.order = np.argsort(cell, kind='stable')
+        self.cell_start = np.searchsorted(cell[self.order], np.arange(self.n_rows * self.n_cols + 1))
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _project(self, lat, lon):
+        return (lon - self.lon_min) * self.km_per_degree_lon, (lat - self.lat_min) * KM_PER_DEGREE_LAT
+
+    def _cells(self, lat, lon):
+        row = np.floor((lat - self.lat_min) / self.cell_lat).astype(np.int64)
+        col = np.floor((lon - self.lon_min) / self.cell_lon).astype(np.int64)
+        return row, col
+
+    def _ring_candidates(self, row, col, ring):
+        """(query position, store) pairs for the stores in each query's ``ring``-th ring of cells."""
+        steps = np.arange(-ring, ring + 1)
+        d_row, d_col = (grid.ravel() for grid in np.meshgrid(steps, steps, indexing='ij'))
+        on_ring = np.maximum(np.abs(d_row), np.abs(d_col)) == ring
+        d_row, d_col = d_row[on_ring], d_col[on_ring]
+
+        cell_row = row[:, None] + d_row
+        cell_col = col[:, None] + d_col
+        inside = (cell_row >= 0) & (cell_row < self.n_rows) & (cell_col >= 0) & (cell_col < self.n_cols)
+        query, offset = np.nonzero(inside)
+        cell = cell_row[query, offset] * self.n_cols + cell_col[query, offset]
+        start = self.cell_start[cell]
+        counts = self.cell_start[cell + 1] - start
+        query = np.repeat(query, counts)
+        # Position inside each cell's slice, then the store at that position
+        within = np.arange(len(query)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return query, self.order[np.repeat(start, counts) + within]
+
+    def _nearest_batch(self, lat, lon, k):
+        n = len(lat)
+        best_km = np.full((n, k), np.inf)
+        best_store = np.full((n, k), -1, dtype=np.int64)
+        row, col = self._cells(lat, lon)
+        x, y = self._project(lat, lon)
+        cell_x = x / self.cell_width_km - col
+        cell_y = y / KM_PER_DEGREE_LAT / self.cell_lat - row
+        edge_km = self.cell_km * np.minimum(np.minimum(cell_x, 1 - cell_x), np.minimum(cell_y, 1 - cell_y))
+        # Rings closer than the grid's edge are empty for points outside it
+        first_ring = np.maximum.reduce([np.zeros_like(row), -row, row - (self.n_rows - 1), -col, col - (self.n_cols - 1)])
+        open_queries = np.arange(n)
+        for ring in range(MAX_RINGS + 1):
+            searching = open_queries[first_ring[open_queries] <= ring]
+            query, store = self._ring_candidates(row[searching], col[searching], ring)
+            if len(query):
+                q = searching[query]
+                km = np.hypot(x[q] - self.x[store], y[q] - self.y[store])
+                self._merge(best_km, best_store, q, km, store, k)
+            # Nothing outside the searched rings is closer than the nearest edge of the searched block
+            settled = best_km[open_queries, -1] <= ring * self.cell_km + edge_km[open_queries]
+            open_queries = open_queries[~settled]
+            if not len(open_queries):
+                break
+        if len(open_queries):
+            km = haversine_km(lat[open_queries, None], lon[open_queries, None], self.lat, self.lon)
+            nearest = np.argsort(km, axis=1)[:, :k]
+            best_store[open_queries] = nearest
+        return haversine_km(lat[:, None], lon[:, None], self.lat[best_store], self.lon[best_store]), best_store
+
+    @staticmethod
+    def _merge(best_km, best_store, query, km, store, k):
+        """Fold candidate (query, km, store) triples, grouped by query, into each query's running top ``k``."""
+        first = np.r_[0, np.flatnonzero(query[1:] != query[:-1]) + 1]
+        sizes = np.diff(np.r_[first, len(query)])
+        touched = query[first]
+        # One padded row per query: its current best followed by this ring's candidates
+        width = k + int(sizes.max())
+        merged_km = np.full((len(touched), width), np.inf)
+        merged_store = np.full((len(touched), width), -1, dtype=np.int64)
+        merged_km[:, :k] = best_km[touched]
+        merged_store[:, :k] = best_store[touched]
+        slot = np.repeat(np.arange(len(touched)), sizes)
+        column = k + np.arange(len(query)) - np.repeat(first, sizes)
+        merged_km[slot, column] = km
+        merged_store[slot, column] = store
+
+        keep = np.argpartition(merged_km, k - 1, axis=1)[:, :k] if width > k else np.arange(k)[None, :]
+        top_km = np.take_along_axis(merged_km, keep, axis=1)
+        order = np.argsort(top_km, axis=1)
+        best_km[touched] = np.take_along_axis(top_km, order, axis=1)
+        best_store[touched] = np.take_along_axis(np.take_along_axis(merged_store, keep, axis=1), order, axis=1)
+
+    def nearest(self, lat, lon, k=1):
+        """Distances (km) and store indices of the ``k`` nearest stores, closest first, as ``(n, k)`` arrays."""
+        lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+        lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+        k = min(k, len(self))
+        km = np.empty((len(lat), k))
+        stores = np.empty((len(lat), k), dtype=np.int64)
+        for lo in range(0, len(lat), QUERY_BATCH):
+            batch = slice(lo, lo + QUERY_BATCH)
+            km[batch], stores[batch] = self._nearest_batch(lat[batch], lon[batch], k)
+        return km, stores
+
+    def within(self, lat, lon, radius_km):
+        """Every store within ``radius_km`` of each point as ``(query, store, km)`` arrays, by query."""
+        lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+        lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+        rings = int(np.ceil(radius_km / self.cell_km))
+        found = []
+        for lo in range(0, len(lat), QUERY_BATCH):
+            batch_lat, batch_lon = lat[lo:lo + QUERY_BATCH], lon[lo:lo + QUERY_BATCH]
+            row, col = self._cells(batch_lat, batch_lon)
+            x, y = self._project(batch_lat, batch_lon)
+            for ring in range(rings + 1):
+                query, store = self._ring_candidates(row, col, ring)
+                # Planar distance screens out most candidates before the haversine check
+                near = np.hypot(x[query] - self.x[store], y[query] - self.y[store]) <= radius_km * PLANAR_SLACK
+                query, store = query[near], store[near]
+                km = haversine_km(batch_lat[query], batch_lon[query], self.lat[store], self.lon[store])
+                hit = km <= radius_km
+                found.append((query[hit] + lo, store[hit], km[hit]))
+        query, store, km = (np.concatenate(parts) for parts in zip(*found))
+        order = np.argsort(query * MAX_KEY_KM + km)
+        return query[order], store[order], km[order]
+
+
+def assign_orders(index, lat, lon, radius_km=SERVICE_RADIUS_KM):
+    """Nearest serviceable store per order (-1 beyond ``radius_km``) and its distance in km."""
+    km, store = index.nearest(lat, lon, k=1)
+    km, store = km[:, 0], store[:, 0]
+    return np.where(km <= radius_km, store, -1), km
+
+
+def delivery_minutes(distance_km, rng=None):
+    """Estimated delivery time; with ``rng``, riding time varies with traffic (mean unchanged)."""
+    ride = np.asarray(distance_km) / RIDER_SPEED_KMPH * 60
+    if rng is not None:
+        ride = ride * rng.gamma(8.0, 1 / 8.0, size=ride.shape)
+    return PREP_MINUTES + ride
+
+
+def delivery_buckets(minutes):
+    """Order counts per ``DELIVERY_BUCKETS`` band."""
+    return np.bincount(np.digitize(minutes, DELIVERY_BUCKET_EDGES), minlength=len(DELIVERY_BUCKETS))
@@ -0,0 +1,314 @@
+"""Asyncio ingestion of order events into the sales store, forecasts and rollups.
+
+Events are fixed-size binary records (``EVENT_DTYPE``) so a whole read is
+decoded with one ``np.frombuffer``. A source yields arrays of records; the
+service queues them in a bounded ``asyncio.Queue`` (a full queue stops the
+source from reading, which is the backpressure), cuts micro-batches by
+size or age, aggregates each batch to (hour, store, SKU) rows and hands it
+to the ``SalesStore`` and to consumers with an ``update(chunk)`` method,
+the same protocol as ``stream.consume``.
+
+Two local stand-ins for a Kafka topic are provided: an append-only record
+file (``FileSource``, with a committed offset for resume) and a TCP
+listener (``SocketSource``).
+"""
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from smartcart.stream import SalesChunk
+
+EVENT_DTYPE = np.dtype([('timestamp', '<i8'), ('store', '<i4'), ('sku', '<i4'), ('units', '<i4')])
+
+DEFAULT_BATCH_EVENTS = 50_000
+DEFAULT_BATCH_SECONDS = 0.5
+
+# Batches of records buffered between the source and the batcher
+DEFAULT_QUEUE_SIZE = 16
+
+READ_EVENTS = 16_384
+
+
+def encode_events(timestamp, store, sku, units):
+    """Records for events given as columns (``timestamp`` in epoch seconds or datetime64)."""
+    timestamp = np.asarray(timestamp)
+    if np.issubdtype(timestamp.dtype, np.datetime64):
+        timestamp = timestamp.astype('datetime64[s]').astype(np.int64)
+    records = np.empty(len(timestamp), dtype=EVENT_DTYPE)
+    records['timestamp'] = timestamp
+    records['store'] = store
+    records['sku'] = sku
+    records['units'] = units
+    return records
+
+
+def decode_events(buffer):
+    return np.frombuffer(buffer, dtype=EVENT_DTYPE)
+
+
+def aggregate_events(records):
+    """Sum units per (hour, store, SKU) into a time-ordered ``SalesChunk``."""
+    hours = records['timestamp'] // 3600
+    store = records['store'].astype(np.int64)
+    sku = records['sku'].astype(np.int64)
+    # One int64 key ordered by (hour, store, SKU)
+    first_hour, n_stores, n_skus = hours.min(), store.max() + 1, sku.max() + 1
+    keys, inverse = np.unique(((hours - first_hour) * n_stores + store) * n_skus + sku, return_inverse=True)
+    units = np.bincount(inverse.ravel(), weights=records['units'], minlength=len(keys))
+    return SalesChunk(
+        timestamp=(keys // (n_stores * n_skus) + first_hour).astype('datetime64[h]'),
+        store=(keys // n_skus % n_stores).astype(np.int32),
+        sku=(keys % n_skus).astype(np.int32),
+        units=units.astype(np.int32),
+    )
+
+
+class FileSource:
+    """Records appended to a local log file, read from a committed byte offset.
+
+    With ``follow=True`` the source keeps polling for new records like a
+    consumer on a live topic; otherwise it stops at the end of the file.
+    """
+
+    def __init__(self, path, follow=False, offset_path=None, read_events=READ_EVENTS, poll_seconds=0.05):
+        self.path = path
+        self.follow = follow
+        self.offset_path = offset_path
+        self.read_bytes = read_events * EVENT_DTYPE.itemsize
+        self.poll_seconds = poll_seconds
+        self.offset = 0
+        if offset_path and os.path.exists(offset_path):
+            with open(offset_path) as f:
+                self.offset = int(f.read() or 0)
+        self.position = self.offset
+
+    async def batches(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.position)
+            pending = b''
+            while True:
+                data = f.read(self.read_bytes)
+                if not data:
+                    if not self.follow:
+                        return
+                    await asyncio.sleep(self.poll_seconds)
+                    continue
+                data = pending + data
+                usable = len(data) - len(data) % EVENT_DTYPE.itemsize
+                pending = data[usable:]
+                self.position += usable
+                if usable:
+                    yield decode_events(data[:usable]), self.position
+
+    def commit(self, position):
+        """Record that everything before ``position`` has been persisted."""
+        self.offset = position
+        if self.offset_path:
+            tmp = f'{self.offset_path}.tmp'
+            with open(tmp, 'w') as f:
+                f.write(str(position))
+            os.replace(tmp, self.offset_path)
+
+
+class SocketSource:
+    """TCP listener that accepts producers streaming raw records.
+
+    Each connection's reader awaits the service's bounded queue, so when
+    ingestion falls behind the socket stops being read and TCP flow control
+    slows the producers down. The source ends once ``expected_connections``
+    producers have connected and closed (runs forever when None).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, read_events=READ_EVENTS, expected_connections=None):
+        self.host = host
+        self.port = port
+        self.read_bytes = read_events * EVENT_DTYPE.itemsize
+        self.expected_connections = expected_connections
+        self.ready = asyncio.Event()
+        self._queue = None
+        self._closed = 0
+
+    async def _handle(self, reader, writer):
+        pending = b''
+        try:
+            while True:
+                data = await reader.read(self.read_bytes)
+                if not data:
+                    break
+                data = pending + data
+                usable = len(data) - len(data) % EVENT_DTYPE.itemsize
+                pending = data[usable:]
+                if usable:
+                    await self._queue.put(decode_events(data[:usable]))
+        finally:
+            writer.close()
+            self._closed += 1
+            if self.expected_connections is not None and self._closed >= self.expected_connections:
+                await self._queue.put(None)
+
+    async def batches(self):
+        self._queue = asyncio.Queue(maxsize=DEFAULT_QUEUE_SIZE)
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.ready.set()
+        async with server:
+            while True:
+                records = await self._queue.get()
+                if records is None:
+                    return
+                yield records, None
+
+    def commit(self, position):
+        pass
+
+
+async def send_events(host, port, records, rate=None, chunk_events=READ_EVENTS):
+    """Stream records to a ``SocketSource``, optionally paced to ``rate`` events/s."""
+    _, writer = await asyncio.open_connection(host, port)
+    started = time.perf_counter()
+    for lo in range(0, len(records), chunk_events):
+        writer.write(records[lo:lo + chunk_events].tobytes())
+        await writer.drain()
+        if rate:
+            ahead = (lo + chunk_events) / rate - (time.perf_counter() - started)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+    writer.close()
+    await writer.wait_closed()
+
+
+class OnlineUpdater:
+    """Closes finished hours into the online forecaster and the rollup cubes.
+
+    Store rollups are updated with every batch; an hour is handed to
+    ``forecaster.update`` (and the network cube, with the forecast that was
+    made for it) once events for a later hour arrive. Events for hours the
+    forecaster has already absorbed are counted as ``late_events``. With a
+    ``checkpoint`` path the forecaster is saved (keyed by ``data_key``)
+    after every update, so a restart resumes from the last closed hour.
+    """
+
+    def __init__(self, forecaster, cubes=None, checkpoint=None, data_key=''):
+        self.forecaster = forecaster
+        self.cubes = cubes
+        self.checkpoint = checkpoint
+        self.data_key = data_key
+        self.n_series = len(forecaster.level)
+        self.pending = np.zeros((self.n_series, 0))
+        self.late_events = 0
+
+    def update(self, chunk):
+        if self.cubes is not None:
+            self.cubes.store.update(chunk.timestamp, chunk.store, chunk.units)
+
+        offset = (chunk.timestamp - self.forecaster.end).astype(np.int64) - 1
+        late = offset < 0
+        self.late_events += int(late.sum())
+        offset, store, units = offset[~late], chunk.store[~late], chunk.units[~late]
+        if not len(offset):
+            return
+        width = max(self.pending.shape[1], int(offset.max()) + 1)
+        if width > self.pending.shape[1]:
+            self.pending = np.pad(self.pending, ((0, 0), (0, width - self.pending.shape[1])))
+        flat = np.bincount(store.astype(np.int64) * width + offset, weights=units, minlength=self.n_series * width)
+        self.pending += flat.reshape(self.n_series, width)
+
+        # Every hour before the newest one is complete
+        closed = self.pending.shape[1] - 1
+        if closed > 0:
+            self.close_hours(closed)
+
+    def close_hours(self, n_hours):
+        observed, self.pending = self.pending[:, :n_hours], self.pending[:, n_hours:]
+        hours = self.forecaster.end + np.arange(1, n_hours + 1)
+        forecast = self.forecaster.predict_at(hours)
+        self.forecaster.update(observed)
+        if self.checkpoint:
+            self.forecaster.save(self.checkpoint, data_key=np.array(self.data_key))
+        if self.cubes is not None:
+            self.cubes.network.update_matrix(hours, np.stack([observed.sum(axis=0), forecast.sum(axis=0)]))
+
+
+class IngestionService:
+    def __init__(self, source, store=None, consumers=(), batch_events=DEFAULT_BATCH_EVENTS,
+                 batch_seconds=DEFAULT_BATCH_SECONDS, queue_size=DEFAULT_QUEUE_SIZE):
+        self.source = source
+        self.store = store
+        self.consumers = list(consumers)
+        self.batch_events = batch_events
+        self.batch_seconds = batch_seconds
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = {
+            'events': 0,
+            'rows_written': 0,
+            'batches': 0,
+            'size_flushes': 0,
+            'time_flushes': 0,
+            'max_queue_depth': 0,
+            'flush_seconds': 0.0,
+        }
+
+    async def _read(self):
+        async for records, position in self.source.batches():
+            # Blocks while the batcher is behind: backpressure on the source
+            await self.queue.put((records, position))
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue.qsize())
+        await self.queue.put(None)
+
+    def flush(self, pieces, position):
+        started = time.perf_counter()
+        records = np.concatenate(pieces)
+        chunk = aggregate_events(records)
+        if self.store is not None:
+            self.store.append(chunk)
+        for consumer in self.consumers:
+            consumer.update(chunk)
+        if position is not None:
+            self.source.commit(position)
+        self.stats['events'] += len(records)
+        self.stats['rows_written'] += len(chunk)
+        self.stats['batches'] += 1
+        self.stats['flush_seconds'] += time.perf_counter() - started
+
+    async def _batch(self):
+        pieces, size, position, deadline = [], 0, None, None
+        loop = asyncio.get_running_loop()
+        while True:
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                self.flush(pieces, position)
+                self.stats['time_flushes'] += 1
+                pieces, size, deadline = [], 0, None
+                continue
+            if item is None:
+                if pieces:
+                    self.flush(pieces, position)
+                return
+            records, position = item
+            if not pieces:
+                deadline = loop.time() + self.batch_seconds
+            pieces.append(records)
+            size += len(records)
+            if size >= self.batch_events:
+                self.flush(pieces, position)
+                self.stats['size_flushes'] += 1
+                pieces, size, deadline = [], 0, None
+
+    async def run(self):
+        """Ingest until the source ends; returns throughput statistics."""
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(self._read()), asyncio.ensure_future(self._batch())]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Either side failing stops the other; a reader left blocked on a full queue would never return
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        seconds = time.perf_counter() - started
+        return dict(self.stats, seconds=seconds, events_per_s=self.stats['events'] / seconds if seconds else 0.0)
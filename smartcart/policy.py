@@ -0,0 +1,238 @@
+"""Monte Carlo evaluation and search of per-SKU reorder policies.
+
+A candidate is a (reorder point, order-up-to) pair for one catalogue row.
+Candidates are scored by replaying demand scenarios through the FIFO
+expiry simulator, and every candidate of a row sees the same scenarios, so
+differences between candidates are not sampling noise. Scenarios are drawn
+in batches that run in a ``ProcessPoolExecutor``; each batch seeds its
+generator from its own child of one ``SeedSequence``, so results do not
+depend on the worker count.
+
+``search_policies`` is a successive-halving search: each round scores the
+surviving candidates on a fresh batch of scenarios, drops those clearly
+dominated by their row's best (paired cost difference above zero by
+``DOMINANCE_Z`` standard errors), keeps the best ``1 / eta`` of the rest,
+and grows the scenario budget for the next round.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from smartcart import expiry
+from smartcart.allocation import STOCKOUT_COST_PER_UNIT
+
+WASTE_COST_PER_UNIT = 20.0
+HOLDING_COST_PER_UNIT_DAY = 0.5
+
+DEFAULT_HORIZON_DAYS = 28
+
+# Scenarios per worker task
+DEFAULT_BATCH_SCENARIOS = 64
+
+# Multiples of the current plan's reorder point and order-up-to level tried by default
+REORDER_POINT_SCALES = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+ORDER_UP_TO_SCALES = (0.75, 1.0, 1.25, 1.5, 2.0)
+
+# Grid position of the unscaled plan policy
+PLAN_CANDIDATE = REORDER_POINT_SCALES.index(1.0) * len(ORDER_UP_TO_SCALES) + ORDER_UP_TO_SCALES.index(1.0)
+
+# A candidate is dropped once its paired excess cost over the row's best is this many standard errors above zero
+DOMINANCE_Z = 3.0
+
+OUTCOMES = ['stockout_units', 'wasted_units', 'holding_cost', 'total_cost']
+
+
+def candidate_grid(reorder_point, order_up_to, reorder_point_scales=REORDER_POINT_SCALES,
+                   order_up_to_scales=ORDER_UP_TO_SCALES):
+    """``(n_rows, n_candidates)`` reorder points and order-up-to levels around a current plan."""
+    rp_scale, up_scale = (grid.ravel() for grid in np.meshgrid(reorder_point_scales, order_up_to_scales, indexing='ij'))
+    reorder_points = np.ceil(np.asarray(reorder_point, dtype=np.float64)[:, None] * rp_scale).astype(np.int64)
+    order_up_to = np.ceil(np.asarray(order_up_to, dtype=np.float64)[:, None] * up_scale).astype(np.int64)
+    return reorder_points, np.maximum(order_up_to, reorder_points)
+
+
+@dataclass(frozen=True)
+class ScenarioBatch:
+    """Every active candidate, scored on ``n_scenarios`` scenarios from ``seed``."""
+    mean_demand: np.ndarray
+    pair_row: np.ndarray
+    current_stock: np.ndarray
+    shelf_life_days: np.ndarray
+    review_days: np.ndarray
+    reorder_point: np.ndarray
+    order_up_to: np.ndarray
+    n_scenarios: int
+    n_days: int
+    lead_time_days: int
+    seed: np.random.SeedSequence
+
+
+def _run_batch(batch):
+    """Stockout units, wasted units and held unit-days per candidate and scenario."""
+    rng = np.random.default_rng(batch.seed)
+    n = batch.n_scenarios
+    rows_active, pair_active = np.unique(batch.pair_row, return_inverse=True)
+    row_mean = batch.mean_demand[rows_active, None]
+
+    def demand(day, rows):
+        # One draw per row and scenario, shared by all of the row's candidates
+        draws = rng.poisson(row_mean, (len(rows_active), n))
+        return draws[pair_active].ravel()[rows]
+
+    pair_row = batch.pair_row
+    result = expiry.simulate(
+        np.repeat(batch.current_stock[pair_row], n),
+        np.repeat(batch.shelf_life_days[pair_row], n),
+        np.repeat(batch.mean_demand[pair_row], n),
+        np.repeat(batch.reorder_point, n),
+        np.repeat(batch.order_up_to, n),
+        np.repeat(batch.review_days[pair_row], n),
+        n_days=batch.n_days,
+        lead_time_days=batch.lead_time_days,
+        block_rows=len(pair_row) * n,
+        demand=demand,
+    )
+    return np.stack([result.lost, result.wasted, result.unit_days], axis=-1).reshape(len(pair_row), n, 3).astype(np.float32)
+
+
+def _score(pool, inputs, pair_row, reorder_point, order_up_to, n_scenarios, batch_scenarios, seeds):
+    batches = [
+        ScenarioBatch(**inputs, pair_row=pair_row, reorder_point=reorder_point, order_up_to=order_up_to,
+                      n_scenarios=min(batch_scenarios, n_scenarios - lo), seed=seeds.spawn(1)[0])
+        for lo in range(0, n_scenarios, batch_scenarios)
+    ]
+    outcomes = np.concatenate(list(pool.map(_run_batch, batches)), axis=1)
+    lost, wasted, unit_days = np.moveaxis(outcomes, -1, 0)
+    holding = unit_days * HOLDING_COST_PER_UNIT_DAY
+    return np.stack([lost, wasted, holding, lost * STOCKOUT_COST_PER_UNIT + wasted * WASTE_COST_PER_UNIT + holding])
+
+
+def _summarize(pair_row, pair_candidate, reorder_point, order_up_to, samples, eliminated_round):
+    frame = pd.DataFrame({
+        'row': pair_row,
+        'candidate': pair_candidate,
+        'reorder_point': reorder_point,
+        'order_up_to': order_up_to,
+        'scenarios': samples.shape[2],
+        'eliminated_round': eliminated_round,
+    })
+    for name, values in zip(OUTCOMES, samples):
+        frame[f'{name}_mean'] = values.mean(axis=1)
+        p50, p95 = np.percentile(values, [50, 95], axis=1)
+        frame[f'{name}_p50'] = p50
+        frame[f'{name}_p95'] = p95
+    return frame
+
+
+def _row_ranks(pair_row, mean_cost):
+    """Rank of each pair's mean cost within its row (0 = best) and the best pair of each pair's row."""
+    order = np.lexsort((mean_cost, pair_row))
+    rows = pair_row[order]
+    first = np.r_[0, np.flatnonzero(rows[1:] != rows[:-1]) + 1]
+    starts = np.repeat(first, np.diff(np.r_[first, len(order)]))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order)) - starts
+    best = np.empty(len(order), dtype=np.int64)
+    best[order] = order[starts]
+    return rank, best
+
+
+@dataclass
+class PolicySearch:
+    """Outcome distributions per candidate; ``eliminated_round`` is -1 for survivors."""
+    candidates: pd.DataFrame
+    rounds: list
+
+    def best(self):
+        """The lowest mean-cost candidate of each row among the survivors."""
+        survivors = self.candidates[self.candidates['eliminated_round'] < 0]
+        best = survivors.loc[survivors.groupby('row')['total_cost_mean'].idxmin()]
+        return best.sort_values('row', ignore_index=True)
+
+
+def search_policies(daily_demand, current_stock, shelf_life_days, review_days, reorder_points, order_up_to,
+                    n_scenarios=64, max_scenarios=1024, eta=2, n_days=DEFAULT_HORIZON_DAYS, lead_time_days=1,
+                    batch_scenarios=DEFAULT_BATCH_SCENARIOS, n_workers=None, seed=None):
+    """Successive-halving search over ``(n_rows, n_candidates)`` policy candidates.
+
+    The first round scores every candidate on ``n_scenarios`` scenarios;
+    each later round adds ``eta`` times as many for the survivors until a
+    row has one candidate left or ``max_scenarios`` is spent. Pass
+    ``max_scenarios=n_scenarios`` to score every candidate on the same
+    budget without elimination.
+    """
+    reorder_points = np.asarray(reorder_points, dtype=np.int64)
+    order_up_to = np.asarray(order_up_to, dtype=np.int64)
+    n_rows, n_candidates = reorder_points.shape
+    inputs = {
+        'mean_demand': np.asarray(daily_demand, dtype=np.float64),
+        'current_stock': np.asarray(current_stock, dtype=np.int32),
+        'shelf_life_days': np.asarray(shelf_life_days, dtype=np.int16),
+        'review_days': np.asarray(review_days, dtype=np.int16),
+        'n_days': n_days,
+        'lead_time_days': lead_time_days,
+    }
+    seeds = np.random.SeedSequence(seed)
+    n_workers = n_workers or os.cpu_count() or 1
+
+    pair_row = np.repeat(np.arange(n_rows), n_candidates)
+    pair_candidate = np.tile(np.arange(n_candidates), n_rows)
+    samples = np.empty((len(OUTCOMES), len(pair_row), 0), dtype=np.float32)
+    finished, rounds = [], []
+    spent, round_scenarios = 0, n_scenarios
+
+    def retire(mask, eliminated_round):
+        finished.append(_summarize(pair_row[mask], pair_candidate[mask], reorder_points[pair_row[mask], pair_candidate[mask]],
+                                   order_up_to[pair_row[mask], pair_candidate[mask]], samples[:, mask], eliminated_round))
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        while len(pair_row) and spent < max_scenarios:
+            round_index = len(rounds)
+            round_scenarios = min(round_scenarios, max_scenarios - spent)
+            scored = _score(pool, inputs, pair_row, reorder_points[pair_row, pair_candidate],
+                            order_up_to[pair_row, pair_candidate], round_scenarios, batch_scenarios, seeds)
+            samples = np.concatenate([samples, scored], axis=2)
+            spent += round_scenarios
+            rounds.append({'round': round_index, 'candidates': len(pair_row), 'scenarios': round_scenarios})
+            if spent >= max_scenarios:
+                break
+
+            cost = samples[-1]
+            rank, best = _row_ranks(pair_row, cost.mean(axis=1))
+            excess = cost - cost[best]
+            stderr = excess.std(axis=1) / math.sqrt(cost.shape[1])
+            dominated = excess.mean(axis=1) - DOMINANCE_Z * stderr > 0
+            row_size = np.bincount(pair_row, minlength=n_rows)[pair_row]
+            keep = ~dominated & (rank < np.ceil(row_size / eta))
+            retire(~keep, round_index)
+            pair_row, pair_candidate, samples = pair_row[keep], pair_candidate[keep], samples[:, keep]
+
+            # Rows down to one candidate are settled and leave the search
+            settled = np.bincount(pair_row, minlength=n_rows)[pair_row] == 1
+            retire(settled, -1)
+            pair_row, pair_candidate, samples = pair_row[~settled], pair_candidate[~settled], samples[:, ~settled]
+            round_scenarios *= eta
+
+    retire(np.ones(len(pair_row), dtype=bool), -1)
+    candidates = pd.concat(finished, ignore_index=True).sort_values(['row', 'candidate'], ignore_index=True)
+    return PolicySearch(candidates, rounds)
+
+
+def search_plan(plan, n_days=DEFAULT_HORIZON_DAYS, lead_time_days=1, **kwargs):
+    """``search_policies`` over a grid around an ``inventory.plan_inventory`` frame's policy."""
+    reorder_points, order_up_to = candidate_grid(plan['reorder_point'].to_numpy(), plan['optimal_stock'].to_numpy())
+    return search_policies(
+        plan['daily_demand'].to_numpy(),
+        plan['current_stock'].to_numpy(),
+        plan['shelf_life_days'].to_numpy(),
+        plan['reorder_frequency'].to_numpy(),
+        reorder_points,
+        order_up_to,
+        n_days=n_days,
+        lead_time_days=lead_time_days,
+        **kwargs,
+    )
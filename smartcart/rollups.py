@@ -0,0 +1,195 @@
+"""Incrementally maintained rollup cubes behind the dashboard charts.
+
+Each ``HourCube`` keeps, for a fixed set of series (stores, categories,
+segments, ...), running sums by hour of day and by day of week plus a ring
+of the most recent hourly totals. Updates fold in new time-ordered rows in
+O(batch), and chart reads touch only these small arrays, so render cost no
+longer depends on how much history has been seen.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOW_HOURS = 168
+
+# Segment heatmap buckets: labels and their [start, stop) hours
+HOUR_RANGES = ['6-9 AM', '9-12 PM', '12-3 PM', '3-6 PM', '6-9 PM', '9-12 AM']
+HOUR_RANGE_EDGES = [6, 9, 12, 15, 18, 21, 24]
+
+
+def _epoch_hours(timestamps):
+    return np.asarray(timestamps, dtype='datetime64[h]').astype(np.int64)
+
+
+class HourCube:
+    def __init__(self, keys, window_hours=DEFAULT_WINDOW_HOURS):
+        self.keys = list(keys)
+        self.window_hours = window_hours
+        n = len(self.keys)
+        self.hour_sums = np.zeros((n, 24))
+        self.dow_sums = np.zeros((n, 7))
+        # Hours seen per hour of day / day of week, the denominators for the means
+        self.hour_counts = np.zeros(24, dtype=np.int64)
+        self.dow_counts = np.zeros(7, dtype=np.int64)
+        self.timeline = np.zeros((n, window_hours))
+        self.last_hour = None
+        self.version = 0
+
+    def update(self, timestamps, key_codes, values):
+        """Fold in rows (timestamp, series code, value); batches must not go back in time."""
+        hours = _epoch_hours(timestamps)
+        if not len(hours):
+            return self
+        key_codes = np.asarray(key_codes, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        n = len(self.keys)
+        hour_of_day = hours % 24
+        # 1970-01-01 was a Thursday (day_of_week 3 with Monday = 0)
+        day_of_week = (hours // 24 + 3) % 7
+
+        self.hour_sums += np.bincount(key_codes * 24 + hour_of_day, weights=values, minlength=n * 24).reshape(n, 24)
+        self.dow_sums += np.bincount(key_codes * 7 + day_of_week, weights=values, minlength=n * 7).reshape(n, 7)
+
+        # Count each new clock hour once, whatever the batch size
+        new_hours = np.unique(hours if self.last_hour is None else hours[hours > self.last_hour])
+        self.hour_counts += np.bincount(new_hours % 24, minlength=24)
+        self.dow_counts += np.bincount((new_hours // 24 + 3) % 7, minlength=7)
+
+        self._update_timeline(hours, key_codes, values)
+        self.version += 1
+        return self
+
+    def _update_timeline(self, hours, key_codes, values):
+        newest = int(hours.max())
+        if self.last_hour is None:
+            self.last_hour = newest
+        elif newest > self.last_hour:
+            shift = newest - self.last_hour
+            if shift >= self.window_hours:
+                self.timeline[:] = 0
+            else:
+                self.timeline[:, :-shift] = self.timeline[:, shift:]
+                self.timeline[:, -shift:] = 0
+            self.last_hour = newest
+        slot = self.window_hours - 1 - (self.last_hour - hours)
+        keep = slot >= 0
+        flat = key_codes[keep] * self.window_hours + slot[keep]
+        self.timeline += np.bincount(flat, weights=values[keep], minlength=self.timeline.size).reshape(self.timeline.shape)
+
+    def update_matrix(self, timestamps, matrix):
+        """Fold in a wide ``(n_keys, n_hours)`` block of hourly values."""
+        matrix = np.asarray(matrix)
+        n_keys, n_hours = matrix.shape
+        return self.update(np.tile(np.asarray(timestamps), n_keys), np.repeat(np.arange(n_keys), n_hours), matrix.ravel())
+
+    def by_hour(self):
+        """Mean value per occurrence of each hour of day, as a keys x 24 frame."""
+        return pd.DataFrame(self.hour_sums / np.maximum(self.hour_counts, 1), index=self.keys, columns=range(24))
+
+    def by_hour_range(self, edges=HOUR_RANGE_EDGES, labels=HOUR_RANGES):
+        """Daily totals within each hour range, as a keys x ranges frame."""
+        per_hour = self.by_hour().to_numpy()
+        totals = np.stack([per_hour[:, lo:hi].sum(axis=1) for lo, hi in zip(edges[:-1], edges[1:])], axis=1)
+        return pd.DataFrame(totals, index=self.keys, columns=labels)
+
+    def by_day_of_week(self):
+        """Mean daily total for each day of week (Monday first), as a keys x 7 frame.
+
+        Averaged per hour seen and scaled to 24 hours, so partial days at
+        either end of the history do not drag their weekday down.
+        """
+        return pd.DataFrame(24 * self.dow_sums / np.maximum(self.dow_counts, 1), index=self.keys, columns=range(7))
+
+    def recent(self, hours=24):
+        """Hourly totals for the last ``hours`` hours, one column per key."""
+        hours = min(hours, self.window_hours)
+        if self.last_hour is None:
+            return pd.DataFrame(columns=['timestamp'] + self.keys)
+        stamps = (self.last_hour - np.arange(hours - 1, -1, -1)).astype('datetime64[h]').astype('datetime64[ns]')
+        frame = pd.DataFrame(self.timeline[:, -hours:].T, columns=self.keys)
+        frame.insert(0, 'timestamp', stamps)
+        return frame
+
+
+class SegmentBehavior:
+    """Order counts per segment x hour range x category, folded in from an order log.
+
+    Backs the Behavioral Analysis heatmap and category preference chart.
+    Each row lands in one cell of the count cube through a single
+    ``np.bincount`` over combined (segment, hour range, category) codes,
+    with hour ranges from ``np.digitize``. Every ``update`` folds in one
+    order-log frame, so a log streamed in chunks (``stream.consume`` over
+    ``stream.iter_order_chunks``) never has to be in memory at once.
+    """
+
+    def __init__(self, segment_names, category_names, edges=HOUR_RANGE_EDGES, labels=HOUR_RANGES):
+        self.segments = list(segment_names)
+        self.categories = list(category_names)
+        self.edges = np.asarray(edges)
+        self.labels = list(labels)
+        # Bins before the first edge and after the last one are kept, so category totals cover every order
+        self.counts = np.zeros((len(self.segments), len(self.edges) + 1, len(self.categories)), dtype=np.int64)
+        self.first_hour = None
+        self.last_hour = None
+        self.version = 0
+
+    def update(self, orders):
+        """Fold in orders with ``timestamp``, ``segment`` and ``category`` columns; rows of unknown names are skipped."""
+        hours = _epoch_hours(orders['timestamp'].to_numpy())
+        if not len(hours):
+            return self
+        n_ranges, n_categories = self.counts.shape[1:]
+        segment = pd.Categorical(orders['segment'], categories=self.segments).codes.astype(np.int64)
+        category = pd.Categorical(orders['category'], categories=self.categories).codes
+        known = (segment >= 0) & (category >= 0)
+        code = (segment * n_ranges + np.digitize(hours % 24, self.edges)) * n_categories + category
+        self.counts += np.bincount(code[known], minlength=self.counts.size).reshape(self.counts.shape)
+
+        first, last = int(hours.min()), int(hours.max())
+        self.first_hour = first if self.first_hour is None else min(self.first_hour, first)
+        self.last_hour = last if self.last_hour is None else max(self.last_hour, last)
+        self.version += 1
+        return self
+
+    def days(self):
+        """Days spanned by the orders seen so far."""
+        return 0.0 if self.first_hour is None else (self.last_hour - self.first_hour + 1) / 24
+
+    def by_hour_range(self):
+        """Orders per day within each hour range, as a segments x ranges frame."""
+        per_range = self.counts[:, 1:len(self.edges)].sum(axis=2) / max(self.days(), 1)
+        return pd.DataFrame(per_range, index=self.segments, columns=self.labels)
+
+    def category_preferences(self):
+        """Long (segment, category, preference) frame; a segment's favourite category scores 100."""
+        counts = self.counts.sum(axis=1)
+        preference = 100 * counts / np.maximum(counts.max(axis=1, keepdims=True), 1)
+        return pd.DataFrame({
+            'segment': np.repeat(self.segments, len(self.categories)),
+            'category': np.tile(self.categories, len(self.segments)),
+            'preference': np.rint(preference).astype(np.int64).ravel(),
+        })
+
+
+class RollupCubes:
+    """The dashboard's cubes: network demand/forecast, store, category and segment."""
+
+    def __init__(self, store_names, category_names, segment_names, window_hours=DEFAULT_WINDOW_HOURS):
+        self.network = HourCube(['demand', 'forecast'], window_hours)
+        self.store = HourCube(store_names, window_hours)
+        self.category = HourCube(category_names, window_hours)
+        self.segment = HourCube(segment_names, window_hours)
+
+    @property
+    def version(self):
+        """Changes whenever any cube is updated, for cache keys."""
+        return sum(cube.version for cube in (self.network, self.store, self.category, self.segment))
+
+    def update_hourly(self, hourly_data):
+        """Fold in network rows shaped like ``hourly_data`` (timestamp, demand, forecast)."""
+        timestamps = hourly_data['timestamp'].to_numpy()
+        values = np.stack([hourly_data['demand'].to_numpy(), hourly_data['forecast'].to_numpy()])
+        self.network.update_matrix(timestamps, values)
+
+    def update_orders(self, orders):
+        """Fold in an order log with ``timestamp`` and categorical ``segment`` columns."""
+        self.segment.update(orders['timestamp'].to_numpy(), orders['segment'].cat.codes.to_numpy(), np.ones(len(orders)))
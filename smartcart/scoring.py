@@ -0,0 +1,138 @@
+"""Low-latency assignment of live customers to segments.
+
+Centroids are loaded once; single customers and batches share the same
+vectorized distance computation. Labels are cached per (customer id,
+features) in an LRU that is dropped whenever the model version changes, so
+a customer whose features change is scored afresh, and every call is timed
+so throughput and tail latency can be reported.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from smartcart.segmentation import MiniBatchKMeans, squared_distances
+
+DEFAULT_CACHE_SIZE = 100_000
+
+# Most recent call latencies kept for percentile reporting
+LATENCY_WINDOW = 10_000
+
+
+def model_version(model):
+    """Content hash of a fitted model, so refits get a new version automatically."""
+    digest = hashlib.sha1()
+    for array in (model.mean, model.scale, model.centroids):
+        digest.update(np.ascontiguousarray(array, dtype=np.float32).tobytes())
+    return digest.hexdigest()[:12]
+
+
+class SegmentScorer:
+    def __init__(self, model, names, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._calls = 0
+        self._rows = 0
+        self._busy_seconds = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.set_model(model, names)
+
+    @classmethod
+    def load(cls, path, cache_size=DEFAULT_CACHE_SIZE):
+        """Load centroids saved by ``MiniBatchKMeans.save(path, names=...)``."""
+        model = MiniBatchKMeans.load(path)
+        with np.load(path, allow_pickle=False) as artifact:
+            names = artifact['names']
+        return cls(model, names, cache_size=cache_size)
+
+    def set_model(self, model, names):
+        """Swap in a new model; cached labels from the old version are dropped."""
+        with self._lock:
+            self.names = np.asarray(names, dtype=object)
+            self._mean = model.mean.astype(np.float32)
+            self._scale = model.scale.astype(np.float32)
+            self._centroids = model.centroids.astype(np.float32)
+            self.version = model_version(model)
+            self._cache.clear()
+
+    def _nearest(self, features):
+        x = (np.asarray(features, dtype=np.float32).reshape(-1, len(self._mean)) - self._mean) / self._scale
+        return squared_distances(x, self._centroids).argmin(axis=1)
+
+    @staticmethod
+    def _key(customer_id, features):
+        return customer_id, tuple(np.asarray(features, dtype=np.float32).ravel().tolist())
+
+    def _record(self, started, rows):
+        elapsed = time.perf_counter() - started
+        self._latencies.append(elapsed)
+        self._calls += 1
+        self._rows += rows
+        self._busy_seconds += elapsed
+
+    def assign(self, customer_id, features):
+        """Segment name for one customer, served from the LRU when possible."""
+        started = time.perf_counter()
+        key = self._key(customer_id, features)
+        with self._lock:
+            label = self._cache.get(key)
+            if label is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+                label = int(self._nearest(features)[0])
+                self._store(key, label)
+            self._record(started, 1)
+            return self.names[label]
+
+    def assign_batch(self, customer_ids, features):
+        """Segment names for many customers; only cache misses are scored."""
+        started = time.perf_counter()
+        features = np.asarray(features, dtype=np.float32)
+        keys = [self._key(customer_id, row) for customer_id, row in zip(customer_ids, features)]
+        with self._lock:
+            labels = np.empty(len(customer_ids), dtype=np.int64)
+            missing = []
+            for i, key in enumerate(keys):
+                label = self._cache.get(key)
+                if label is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    labels[i] = label
+            self.hits += len(customer_ids) - len(missing)
+            self.misses += len(missing)
+
+            if missing:
+                missing = np.asarray(missing)
+                labels[missing] = self._nearest(features[missing])
+                for i in missing:
+                    self._store(keys[i], int(labels[i]))
+            self._record(started, len(customer_ids))
+            return self.names[labels]
+
+    def _store(self, key, label):
+        self._cache[key] = label
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def metrics(self):
+        with self._lock:
+            latencies_ms = np.asarray(self._latencies) * 1000
+            lookups = self.hits + self.misses
+            return {
+                'model_version': self.version,
+                'calls': self._calls,
+                'rows_scored': self._rows,
+                'throughput_rows_per_s': self._rows / self._busy_seconds if self._busy_seconds else 0.0,
+                'p50_latency_ms': float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else 0.0,
+                'p99_latency_ms': float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else 0.0,
+                'cache_hit_rate': self.hits / lookups if lookups else 0.0,
+                'cache_entries': len(self._cache),
+            }
@@ -0,0 +1,229 @@
+"""Out-of-core mini-batch K-means customer segmentation.
+
+Features are read chunk by chunk (in-memory arrays or memory-mapped
+``.npy`` files), standardized with streamed statistics, seeded with
+k-means++ on a sample and refined with mini-batch updates in float32.
+Labels are written chunk by chunk too, so tens of millions of customers
+never need to be resident at once.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from smartcart.datagen import CUSTOMER_FEATURES, RETENTION_WINDOW_DAYS, SEGMENT_NAMES
+
+DEFAULT_BATCH_SIZE = 65_536
+DEFAULT_EPOCHS = 2
+
+# Rows drawn (across all chunks) to seed k-means++
+INIT_SAMPLE = 20_000
+
+# Segment names in the order cluster_names ranks clusters
+SEGMENT_NAMES_BY_RANK = ('High-value Shoppers', 'Regular Customers', 'New Users', 'Occasional Buyers')
+
+
+class FeatureChunks:
+    """Re-iterable view over feature chunks given as arrays or ``.npy`` paths."""
+
+    def __init__(self, sources):
+        self.sources = list(sources)
+
+    @classmethod
+    def from_directory(cls, directory):
+        names = sorted(n for n in os.listdir(directory) if n.endswith('.npy'))
+        return cls(os.path.join(directory, n) for n in names)
+
+    def __iter__(self):
+        for source in self.sources:
+            if isinstance(source, (str, os.PathLike)):
+                yield np.load(source, mmap_mode='r')
+            else:
+                yield np.asarray(source)
+
+
+def write_feature_chunks(directory, features, chunk_rows=1_000_000):
+    """Split a feature matrix into ``.npy`` chunk files; returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i, lo in enumerate(range(0, len(features), chunk_rows)):
+        path = os.path.join(directory, f'features_{i:05d}.npy')
+        np.save(path, np.asarray(features[lo:lo + chunk_rows], dtype=np.float32))
+        paths.append(path)
+    return paths
+
+
+def squared_distances(x, centroids):
+    """(n, k) squared Euclidean distances via ||x||^2 - 2 x.c + ||c||^2."""
+    d = (x * x).sum(axis=1, keepdims=True) - 2 * (x @ centroids.T) + (centroids * centroids).sum(axis=1)
+    return np.maximum(d, 0, out=d)
+
+
+def kmeans_plus_plus(x, k, rng):
+    centroids = np.empty((k, x.shape[1]), dtype=np.float32)
+    centroids[0] = x[rng.integers(len(x))]
+    closest = squared_distances(x, centroids[:1])[:, 0]
+    for i in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(x), p=closest / total) if total > 0 else rng.integers(len(x))
+        centroids[i] = x[index]
+        closest = np.minimum(closest, squared_distances(x, centroids[i:i + 1])[:, 0])
+    return centroids
+
+
+class MiniBatchKMeans:
+    def __init__(self, n_clusters=len(SEGMENT_NAMES), batch_size=DEFAULT_BATCH_SIZE,
+                 epochs=DEFAULT_EPOCHS, seed=None):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.seed = seed
+        self.mean = None
+        self.scale = None
+        self.centroids = None
+        self.counts = None
+
+    def _standardize(self, x):
+        return (np.asarray(x, dtype=np.float32) - self.mean) / self.scale
+
+    def fit(self, chunks):
+        """Fit over a re-iterable of ``(n, n_features)`` chunks (see ``FeatureChunks``)."""
+        rng = np.random.default_rng(self.seed)
+
+        # Pass 1: streamed mean/std plus a size-weighted row sample for seeding
+        n, total, total_sq = 0, 0.0, 0.0
+        sample, weights = [], []
+        for chunk in chunks:
+            chunk = np.asarray(chunk, dtype=np.float64)
+            n += len(chunk)
+            total = total + chunk.sum(axis=0)
+            total_sq = total_sq + (chunk * chunk).sum(axis=0)
+            picked = chunk[rng.permutation(len(chunk))[:INIT_SAMPLE]]
+            sample.append(picked)
+            weights.append(np.full(len(picked), len(chunk) / max(len(picked), 1)))
+        self.mean = (total / n).astype(np.float32)
+        self.scale = np.sqrt(np.maximum(total_sq / n - (total / n) ** 2, 1e-12)).astype(np.float32)
+
+        sample = np.concatenate(sample)
+        weights = np.concatenate(weights)
+        sample = sample[rng.choice(len(sample), size=min(INIT_SAMPLE, len(sample)), replace=False, p=weights / weights.sum())]
+        self.centroids = kmeans_plus_plus(self._standardize(sample), self.n_clusters, rng)
+        self.counts = np.zeros(self.n_clusters, dtype=np.float64)
+
+        # Mini-batch passes with per-centre learning rate 1 / (points seen)
+        for _ in range(self.epochs):
+            for chunk in chunks:
+                order = rng.permutation(len(chunk))
+                for lo in range(0, len(chunk), self.batch_size):
+                    self.partial_fit(np.asarray(chunk)[np.sort(order[lo:lo + self.batch_size])], standardized=False)
+        return self
+
+    def partial_fit(self, batch, standardized=False):
+        x = batch if standardized else self._standardize(batch)
+        labels = squared_distances(x, self.centroids).argmin(axis=1)
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        sums = np.stack([np.bincount(labels, weights=x[:, j], minlength=self.n_clusters)
+                         for j in range(x.shape[1])], axis=1).astype(np.float32)
+
+        self.counts += batch_counts
+        seen = batch_counts > 0
+        rate = (batch_counts[seen] / self.counts[seen]).astype(np.float32)[:, None]
+        self.centroids[seen] += rate * (sums[seen] / batch_counts[seen, None] - self.centroids[seen])
+        return self
+
+    def predict(self, x):
+        return squared_distances(self._standardize(x), self.centroids).argmin(axis=1).astype(np.int8)
+
+    def cluster_centers(self):
+        """Centroids in original feature units."""
+        return self.centroids * self.scale + self.mean
+
+    def save(self, path, names=None):
+        """Write the model (and segment ``names``) to ``path``, renamed into place once complete."""
+        extra = {} if names is None else {'names': np.asarray(names, dtype=str)}
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, mean=self.mean, scale=self.scale, centroids=self.centroids, counts=self.counts, **extra)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as artifact:
+            model = cls(n_clusters=len(artifact['centroids']))
+            model.mean = artifact['mean']
+            model.scale = artifact['scale']
+            model.centroids = artifact['centroids']
+            model.counts = artifact['counts']
+        return model
+
+
+def predict_chunks(model, chunks, out_path=None):
+    """Label every row of every chunk, optionally into a memory-mapped ``.npy`` file."""
+    lengths = [len(chunk) for chunk in chunks]
+    if out_path is None:
+        labels = np.empty(sum(lengths), dtype=np.int8)
+    else:
+        labels = np.lib.format.open_memmap(out_path, mode='w+', dtype=np.int8, shape=(sum(lengths),))
+    lo = 0
+    for chunk in chunks:
+        labels[lo:lo + len(chunk)] = model.predict(chunk)
+        lo += len(chunk)
+    if out_path is not None:
+        labels.flush()
+    return labels
+
+
+def cluster_names(centers):
+    """Map clusters to segment names from their RFM centroids.
+
+    The two highest-spend clusters (frequency x order value) are the
+    High-value and Regular shoppers; of the rest, the more recently active
+    cluster holds the New Users and the other the Occasional Buyers. With
+    fewer clusters only the leading names are used; any beyond four are
+    numbered.
+    """
+    recency, frequency, order_value = np.asarray(centers).T
+    by_value = np.argsort(-(frequency * order_value))
+    rest = by_value[2:]
+    ranked = np.r_[by_value[:2], rest[np.argsort(recency[rest])]]
+    names = np.empty(len(centers), dtype=object)
+    for i, cluster in enumerate(ranked):
+        names[cluster] = SEGMENT_NAMES_BY_RANK[i] if i < len(SEGMENT_NAMES_BY_RANK) else f'Segment {cluster + 1}'
+    return names
+
+
+def segment_summary(chunks, labels, names):
+    """``segment_data``-shaped metrics per segment, streamed over the feature chunks.
+
+    ``size`` is the share of customers in percent and ``retention_rate`` the
+    percent who ordered within the retention window.
+    """
+    k = len(names)
+    counts = np.zeros(k)
+    value_sum = np.zeros(k)
+    frequency_sum = np.zeros(k)
+    retained = np.zeros(k)
+    recency_col, frequency_col, value_col = range(len(CUSTOMER_FEATURES))
+
+    lo = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        chunk_labels = np.asarray(labels[lo:lo + len(chunk)])
+        lo += len(chunk)
+        counts += np.bincount(chunk_labels, minlength=k)
+        value_sum += np.bincount(chunk_labels, weights=chunk[:, value_col], minlength=k)
+        frequency_sum += np.bincount(chunk_labels, weights=chunk[:, frequency_col], minlength=k)
+        retained += np.bincount(chunk_labels, weights=chunk[:, recency_col] <= RETENTION_WINDOW_DAYS, minlength=k)
+
+    per_customer = np.maximum(counts, 1)
+    summary = pd.DataFrame({
+        'name': names,
+        'size': np.round(100 * counts / max(counts.sum(), 1)).astype(np.int32),
+        'avg_order_value': np.round(value_sum / per_customer).astype(np.int32),
+        'order_frequency': np.round(frequency_sum / per_customer, 1).astype(np.float32),
+        'retention_rate': np.round(100 * retained / per_customer).astype(np.int32),
+    })
+    # Keep the dashboard's segment order
+    order = {name: i for i, name in enumerate(SEGMENT_NAMES)}
+    summary['_order'] = summary['name'].map(lambda name: order.get(name, len(order)))
+    return summary.sort_values('_order').drop(columns='_order').reset_index(drop=True)
@@ -0,0 +1,256 @@
+"""Columnar on-disk store for hourly sales history.
+
+Rows are partitioned by day and store, and each partition holds one
+``.npy`` file per column (timestamps as hours since the epoch, sorted).
+Reads prune partitions by directory name, open only the requested columns
+memory-mapped and binary-search the timestamp column for the time range,
+so "last 24h for one store" touches a few pages of two files no matter
+how long the history is.
+
+    root/date=2024-05-01/store=00003/part-00000/{timestamp,sku,units}.npy
+
+Compaction writes the merged part under a fresh name with a ``supersedes``
+list of the parts it replaces and renames it in, so readers skip the old
+parts from that moment; the old parts are deleted afterwards. A crash at
+any point leaves every row readable exactly once.
+"""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ('timestamp', 'store', 'sku', 'units')
+# Columns written to disk; ``store`` is implied by the partition
+STORED_COLUMNS = ('timestamp', 'sku', 'units')
+COLUMN_DTYPES = {'timestamp': np.int64, 'store': np.int32, 'sku': np.int32, 'units': np.int32}
+
+# File inside a compacted part naming the parts it replaces
+SUPERSEDES = 'supersedes'
+
+# Re-reads of a partition whose parts vanished mid-read (a concurrent compaction) before giving up
+READ_RETRIES = 5
+
+
+def _date_dir(day):
+    return f"date={np.datetime64(int(day), 'D')}"
+
+
+def _store_dir(store):
+    return f'store={int(store):05d}'
+
+
+def _hours(value):
+    """Hours since the epoch for a timestamp-like value (None passes through)."""
+    if value is None:
+        return None
+    return int(np.datetime64(pd.Timestamp(value).floor('h'), 'h').astype(np.int64))
+
+
+class SalesStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    # Writing
+
+    def append(self, chunk):
+        """Write a batch of rows (``SalesChunk`` or a mapping of columns) as new parts."""
+        columns = chunk._asdict() if hasattr(chunk, '_asdict') else dict(chunk)
+        hours = np.asarray(columns['timestamp']).astype('datetime64[h]').astype(np.int64)
+        store = np.asarray(columns['store'], dtype=np.int32)
+        day = hours // 24
+
+        order = np.lexsort((hours, store, day))
+        hours, store, day = hours[order], store[order], day[order]
+        values = {
+            'timestamp': hours,
+            'sku': np.asarray(columns['sku'], dtype=np.int32)[order],
+            'units': np.asarray(columns['units'], dtype=np.int32)[order],
+        }
+
+        # One contiguous run per (day, store) after the sort
+        key = day * (np.iinfo(np.int32).max + 1) + store
+        boundaries = np.flatnonzero(np.diff(key)) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(key)]])
+        for lo, hi in zip(starts, stops):
+            self._write_part(day[lo], store[lo], {name: col[lo:hi] for name, col in values.items()})
+
+    def _write_part(self, day, store, values):
+        partition = os.path.join(self.root, _date_dir(day), _store_dir(store))
+        os.makedirs(partition, exist_ok=True)
+        self._publish_part(partition, values)
+
+    @staticmethod
+    def _publish_part(partition, values, supersedes=()):
+        """Write a part beside the partition, then rename it in, so readers never see half a part."""
+        taken = [int(n[len('part-'):]) for n in os.listdir(partition) if n.startswith('part-')]
+        part = f'part-{max(taken, default=-1) + 1:05d}'
+        tmp = os.path.join(partition, f'.{part}.tmp')
+        os.makedirs(tmp, exist_ok=True)
+        for name, column in values.items():
+            np.save(os.path.join(tmp, f'{name}.npy'), column)
+        if supersedes:
+            with open(os.path.join(tmp, SUPERSEDES), 'w') as f:
+                f.write('\n'.join(os.path.basename(p) for p in supersedes))
+        os.rename(tmp, os.path.join(partition, part))
+
+    def write_history(self, chunks):
+        """Persist a whole stream of chunks (e.g. ``stream.iter_sales_chunks``)."""
+        for chunk in chunks:
+            self.append(chunk)
+        self.compact()
+
+    def compact(self):
+        """Merge each partition's parts into one, sorted by timestamp."""
+        for partition in self._partitions():
+            parts = self._parts(partition)
+            if len(parts) <= 1:
+                self._remove_superseded(partition)
+                continue
+            merged = {name: np.concatenate([np.load(os.path.join(p, f'{name}.npy')) for p in parts])
+                      for name in STORED_COLUMNS}
+            order = np.argsort(merged['timestamp'], kind='stable')
+            self._publish_part(partition, {name: column[order] for name, column in merged.items()}, supersedes=parts)
+            self._remove_superseded(partition)
+
+    # Reading
+
+    def dates(self):
+        return sorted(name[len('date='):] for name in os.listdir(self.root) if name.startswith('date='))
+
+    def _partitions(self, stores=None, start_hour=None, end_hour=None):
+        """Partition directories overlapping the store set and hour range."""
+        first_day = None if start_hour is None else start_hour // 24
+        last_day = None if end_hour is None else end_hour // 24
+        for date in self.dates():
+            day = int(np.datetime64(date, 'D').astype(np.int64))
+            if (first_day is not None and day < first_day) or (last_day is not None and day > last_day):
+                continue
+            date_path = os.path.join(self.root, f'date={date}')
+            if stores is None:
+                names = sorted(n for n in os.listdir(date_path) if n.startswith('store='))
+            else:
+                names = [_store_dir(s) for s in stores]
+            for name in names:
+                path = os.path.join(date_path, name)
+                if os.path.isdir(path):
+                    yield path
+
+    @staticmethod
+    def _part_names(partition):
+        names = sorted(n for n in os.listdir(partition) if n.startswith('part-'))
+        superseded = set()
+        for name in names:
+            path = os.path.join(partition, name, SUPERSEDES)
+            if os.path.exists(path):
+                with open(path) as f:
+                    superseded.update(f.read().split())
+        return names, superseded
+
+    @classmethod
+    def _parts(cls, partition):
+        """Live parts of a partition: every part not replaced by a compacted one."""
+        names, superseded = cls._part_names(partition)
+        return [os.path.join(partition, n) for n in names if n not in superseded]
+
+    @classmethod
+    def _remove_superseded(cls, partition):
+        # Readers skip superseded parts from the moment the merged part is renamed in, so they
+        # can go at leisure; this also clears parts left behind by an interrupted compaction
+        names, superseded = cls._part_names(partition)
+        for name in names:
+            if name in superseded:
+                shutil.rmtree(os.path.join(partition, name), ignore_errors=True)
+
+    def read(self, columns=COLUMNS, stores=None, start=None, end=None):
+        """Rows for ``stores`` with ``start <= timestamp < end`` as a dict of arrays.
+
+        Only the requested columns are opened (memory-mapped); ``store`` is
+        rebuilt from partition names rather than read from disk.
+        """
+        start_hour, end_hour = _hours(start), _hours(end)
+        wanted = [c for c in columns if c in STORED_COLUMNS]
+        pieces = {c: [] for c in columns}
+
+        for partition in self._partitions(stores, start_hour, None if end_hour is None else end_hour - 1):
+            store = int(os.path.basename(partition)[len('store='):])
+            for attempt in range(READ_RETRIES):
+                try:
+                    slices = self._read_partition(partition, wanted, start_hour, end_hour)
+                    break
+                except FileNotFoundError:
+                    # A compaction removed a part listed a moment ago; its rows are in the merged part
+                    # now. Anything still missing after a few tries is gone for good
+                    if attempt == READ_RETRIES - 1:
+                        raise
+            for n_rows, part_columns in slices:
+                for name in wanted:
+                    pieces[name].append(part_columns[name])
+                if 'store' in pieces:
+                    pieces['store'].append(np.full(n_rows, store, dtype=np.int32))
+
+        result = {}
+        for name in columns:
+            dtype = COLUMN_DTYPES[name]
+            result[name] = np.concatenate(pieces[name]) if pieces[name] else np.empty(0, dtype=dtype)
+        if 'timestamp' in result:
+            result['timestamp'] = result['timestamp'].astype('datetime64[h]')
+        return result
+
+    def _read_partition(self, partition, wanted, start_hour, end_hour):
+        """``(row count, columns)`` of each live part's rows in ``[start_hour, end_hour)``."""
+        slices = []
+        for part in self._parts(partition):
+            timestamps = np.load(os.path.join(part, 'timestamp.npy'), mmap_mode='r')
+            lo = 0 if start_hour is None else int(np.searchsorted(timestamps, start_hour, 'left'))
+            hi = len(timestamps) if end_hour is None else int(np.searchsorted(timestamps, end_hour, 'left'))
+            if hi <= lo:
+                continue
+            columns = {}
+            for name in wanted:
+                column = timestamps if name == 'timestamp' else np.load(os.path.join(part, f'{name}.npy'), mmap_mode='r')
+                columns[name] = np.asarray(column[lo:hi])
+            slices.append((hi - lo, columns))
+        return slices
+
+    def read_frame(self, columns=COLUMNS, stores=None, start=None, end=None):
+        return pd.DataFrame(self.read(columns, stores, start, end))
+
+    def hourly_demand(self, stores=None, start=None, end=None):
+        """Units per hour summed over SKUs (and ``stores``) in ``[start, end)``."""
+        rows = self.read(('timestamp', 'units'), stores, start, end)
+        hours = rows['timestamp'].astype(np.int64)
+        first = hours.min() if len(hours) else 0
+        # Hours are a dense range, so a bincount over the offsets beats sorting the rows
+        offset = hours - first
+        demand = np.bincount(offset, weights=rows['units'])
+        seen = np.flatnonzero(np.bincount(offset))
+        timestamps = (first + seen).astype('datetime64[h]').astype('datetime64[ns]')
+        return pd.DataFrame({'timestamp': timestamps, 'demand': demand[seen].astype(np.int64)})
+
+    def recent_hourly_demand(self, stores=None, hours=24, end=None):
+        """The last ``hours`` hours of demand up to and including ``end`` (default: latest stored)."""
+        if end is None:
+            end = self.latest_timestamp(stores)
+            if end is None:
+                return self.hourly_demand(stores, start=pd.Timestamp(0), end=pd.Timestamp(0))
+        end_hour = _hours(end) + 1
+        return self.hourly_demand(stores, start=pd.Timestamp((end_hour - hours) * 3600, unit='s'),
+                                  end=pd.Timestamp(end_hour * 3600, unit='s'))
+
+    def latest_timestamp(self, stores=None):
+        """Newest stored hour, read from the last date's timestamp columns only."""
+        for date in reversed(self.dates()):
+            day_start = pd.Timestamp(date)
+            latest = None
+            for partition in self._partitions(stores, _hours(day_start), _hours(day_start) + 23):
+                for part in self._parts(partition):
+                    timestamps = np.load(os.path.join(part, 'timestamp.npy'), mmap_mode='r')
+                    # Parts are sorted, so the last value is the newest
+                    if len(timestamps):
+                        latest = int(timestamps[-1]) if latest is None else max(latest, int(timestamps[-1]))
+            if latest is not None:
+                return pd.Timestamp(latest * 3600, unit='s')
+        return None
@@ -0,0 +1,173 @@
+"""Streaming generation of hourly store x SKU sales in fixed-size columnar chunks.
+
+Chunks are yielded in time order (hour, then store, then SKU) and each one
+is a set of NumPy columns of ``chunk_rows`` rows (the final chunk may be
+shorter). Consumers fold chunks into bounded-size aggregates, so histories
+of a billion rows never have to be materialized as a DataFrame.
+``iter_order_chunks`` streams the customer order log the same way, as
+order-log frames of bounded size.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from smartcart import datagen
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+# Slots in the weekly hour-of-day x day-of-week profile
+WEEK_HOURS = 168
+
+
+class SalesChunk(NamedTuple):
+    """A columnar batch of hourly sales rows."""
+    timestamp: np.ndarray  # datetime64[h]
+    store: np.ndarray      # int32 store index
+    sku: np.ndarray        # int32 SKU index
+    units: np.ndarray      # int32 units sold
+
+    def __len__(self):
+        return len(self.units)
+
+    def to_frame(self):
+        return pd.DataFrame(self._asdict())
+
+
+def week_hour(timestamps):
+    """Slot in the weekly profile (day_of_week * 24 + hour) for datetime64 values."""
+    hours = np.asarray(timestamps).astype('datetime64[h]').astype(np.int64)
+    # 1970-01-01 was a Thursday (day_of_week 3 with Monday = 0)
+    return ((hours + 3 * 24) % WEEK_HOURS).astype(np.int16)
+
+
+def iter_sales_chunks(config=None, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS, end=None):
+    """Yield time-ordered ``SalesChunk`` batches covering ``config``'s full history.
+
+    Demand per row is Poisson around the SKU's ``avg_daily_sales`` scaled by
+    the store level and the weekly seasonal profile, using the same per-table
+    random streams as ``datagen.generate_demo_data`` so both views agree.
+    """
+    config = config or datagen.SizeConfig()
+    rngs = datagen.table_rngs(seed)
+    product_data = datagen.generate_product_data(config, rngs['product'])
+    store_scale = datagen.generate_store_scale(config, rngs['store_demand'])
+
+    start = datagen.hourly_index(config.n_hours, end)[0].to_datetime64().astype('datetime64[h]')
+    slots = np.arange(WEEK_HOURS)
+    profile = datagen.seasonal_profile(slots % 24, slots // 24)
+    profile /= profile.mean()
+    sku_rate = product_data['avg_daily_sales'].to_numpy(dtype=np.float32) / 24
+
+    n_skus = config.n_skus
+    rows_per_hour = config.n_stores * n_skus
+    total_rows = rows_per_hour * config.n_hours
+    first_slot = int(week_hour(start))
+    # Unseeded runs draw fresh entropy once; every chunk stream derives from it
+    base_seed = np.random.SeedSequence().entropy if seed is None else seed
+
+    for chunk_index, lo in enumerate(range(0, total_rows, chunk_rows)):
+        row = np.arange(lo, min(lo + chunk_rows, total_rows), dtype=np.int64)
+        hour = row // rows_per_hour
+        store = ((row // n_skus) % config.n_stores).astype(np.int32)
+        sku = (row % n_skus).astype(np.int32)
+
+        rate = profile[(first_slot + hour) % WEEK_HOURS] * store_scale[store] * sku_rate[sku]
+        # Seeding per chunk keeps chunks reproducible and independently regenerable
+        rng = np.random.default_rng([base_seed, chunk_index])
+        yield SalesChunk(
+            timestamp=start + hour.astype('timedelta64[h]'),
+            store=store,
+            sku=sku,
+            units=rng.poisson(rate).astype(np.int32),
+        )
+
+
+def iter_order_chunks(config=None, seed=None, n_orders=None, chunk_rows=DEFAULT_CHUNK_ROWS, end=None):
+    """Yield ``datagen.generate_order_log`` frames of up to ``chunk_rows`` orders, ``n_orders`` in all.
+
+    Every chunk covers the config's whole horizon and is time ordered within itself.
+    """
+    config = config or datagen.SizeConfig()
+    n = config.n_orders if n_orders is None else n_orders
+    # One child generator per chunk keeps chunks reproducible and independently regenerable
+    chunk_rngs = datagen.table_rngs(seed)['orders'].spawn(-(-n // chunk_rows))
+    for rng, lo in zip(chunk_rngs, range(0, n, chunk_rows)):
+        yield datagen.generate_order_log(config, rng, min(chunk_rows, n - lo), end)
+
+
+def consume(chunks, *consumers):
+    """Feed every chunk to each consumer's ``update`` and return the consumers."""
+    for chunk in chunks:
+        for consumer in consumers:
+            consumer.update(chunk)
+    return consumers
+
+
+class WeeklyProfile:
+    """Per-series sums and counts for each of the 168 weekly hour slots.
+
+    Memory is ``n_series x 168`` regardless of history length, which is what
+    lets the forecasting path be fit from a stream (``fit_weekly``). Per
+    store x SKU every row is one series-hour, so squared units are summed as
+    well and give the forecaster its error spread.
+    """
+
+    def __init__(self, n_stores, n_skus, by='store'):
+        self.n_skus = n_skus
+        self.by = by
+        n_series = series_count(n_stores, n_skus, by)
+        self.sums = np.zeros((n_series, WEEK_HOURS), dtype=np.float64)
+        self.square_sums = np.zeros((n_series, WEEK_HOURS), dtype=np.float64) if by == 'store_sku' else None
+        self.counts = np.zeros((n_series, WEEK_HOURS), dtype=np.int64)
+        self.last_hour = np.full(n_series, np.iinfo(np.int64).min)
+
+    def update(self, chunk):
+        series = series_index(chunk, self.n_skus, self.by)
+        flat = series.astype(np.int64) * WEEK_HOURS + week_hour(chunk.timestamp)
+        size = self.sums.size
+        units = chunk.units.astype(np.float64)
+        self.sums += np.bincount(flat, weights=units, minlength=size).reshape(self.sums.shape)
+        if self.square_sums is not None:
+            self.square_sums += np.bincount(flat, weights=units ** 2, minlength=size).reshape(self.sums.shape)
+        first = distinct_hours(chunk, series, self.last_hour)
+        self.counts += np.bincount(flat[first], minlength=size).reshape(self.counts.shape)
+
+    def mean(self):
+        """Mean units per hour for each series and weekly slot."""
+        return (self.sums / np.maximum(self.counts, 1)).astype(np.float32)
+
+    def square_mean(self):
+        """Mean squared units per hour for each series and weekly slot (store x SKU series only)."""
+        if self.square_sums is None:
+            raise ValueError("square_mean needs one row per series and hour (by='store_sku')")
+        return self.square_sums / np.maximum(self.counts, 1)
+
+
+def series_count(n_stores, n_skus, by='store_sku'):
+    return {'store_sku': n_stores * n_skus, 'store': n_stores, 'sku': n_skus}[by]
+
+
+def series_index(chunk, n_skus, by='store_sku'):
+    if by == 'store_sku':
+        return chunk.store.astype(np.int64) * n_skus + chunk.sku
+    if by == 'store':
+        return chunk.store
+    if by == 'sku':
+        return chunk.sku
+    raise ValueError(f"Unknown series grouping: {by!r}")
+
+
+def distinct_hours(chunk, series, last_hour):
+    """Row positions of the first row of each new (hour, series) pair in a chunk.
+
+    Aggregated series (per store or per SKU) see many rows per hour, and an
+    hour can straddle two chunks, so ``last_hour`` (per-series, updated in
+    place) remembers the latest hour already counted.
+    """
+    hours = chunk.timestamp.astype(np.int64)
+    key = hours * len(last_hour) + series
+    _, first = np.unique(key, return_index=True)
+    first = first[hours[first] > last_hour[series[first]]]
+    np.maximum.at(last_hour, series[first], hours[first])
+    return first
@@ -0,0 +1,151 @@
+"""Parallel forecast training sharded by store.
+
+The parent process copies the history matrix once into shared memory,
+ordered so each store's series are contiguous rows. Workers in a
+``ProcessPoolExecutor`` attach to that block by name and fit their row
+range, so only shard bounds go out and only small fitted-state arrays come
+back. Failed shards are retried, on a fresh pool if a worker died, and the
+per-shard states are merged into one ``SeasonalForecaster`` written as a
+single artifact.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from smartcart.forecasting import DEFAULT_ALPHA, SeasonalForecaster
+
+DEFAULT_MAX_RETRIES = 2
+
+# Shards per worker; more shards even out stores of uneven size
+SHARDS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """Everything a worker needs to locate and fit its rows."""
+    shm_name: str
+    shape: tuple
+    dtype: str
+    row_start: int
+    row_stop: int
+    start: np.datetime64
+    alpha: float
+
+
+def _fit_shard(spec):
+    shm = shared_memory.SharedMemory(name=spec.shm_name)
+    try:
+        history = np.ndarray(spec.shape, dtype=spec.dtype, buffer=shm.buf)
+        rows = history[spec.row_start:spec.row_stop]
+        model = SeasonalForecaster(alpha=spec.alpha).fit(rows, spec.start)
+        return model.state_dict()
+    finally:
+        shm.close()
+
+
+def shard_rows(series_store, n_shards):
+    """Row bounds of shards that each hold whole stores, for rows sorted by store."""
+    stores, first_row = np.unique(series_store, return_index=True)
+    groups = np.array_split(np.arange(len(stores)), min(n_shards, len(stores)))
+    bounds = [int(first_row[g[0]]) for g in groups if len(g)] + [len(series_store)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def merge_states(states, order):
+    """Concatenate per-shard states (in shard order) and undo the store sort."""
+    merged = dict(states[0])
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    for key in ('level', 'hour_profile', 'dow_profile', 'sse'):
+        merged[key] = np.concatenate([s[key] for s in states])[inverse]
+    return SeasonalForecaster.from_state(merged)
+
+
+def train_by_store(history, start, series_store=None, store_names=None, n_workers=None,
+                   max_retries=DEFAULT_MAX_RETRIES, alpha=DEFAULT_ALPHA, artifact_path=None):
+    """Fit one forecaster over ``history`` with stores sharded across processes.
+
+    ``history`` is ``(n_series, n_hours)``; ``series_store`` gives each
+    series' store index (defaults to one series per store, as in
+    ``store_data``). Returns the merged model, also saved to
+    ``artifact_path`` with the store mapping when given.
+    """
+    history = np.asarray(history, dtype=np.float32)
+    series_store = np.arange(len(history)) if series_store is None else np.asarray(series_store)
+    n_workers = n_workers or os.cpu_count() or 1
+
+    order = np.argsort(series_store, kind='stable')
+    shards = shard_rows(series_store[order], n_workers * SHARDS_PER_WORKER)
+
+    shm = shared_memory.SharedMemory(create=True, size=history.nbytes)
+    try:
+        shared = np.ndarray(history.shape, dtype=history.dtype, buffer=shm.buf)
+        np.take(history, order, axis=0, out=shared)
+        specs = [
+            ShardSpec(shm.name, history.shape, history.dtype.str, lo, hi, np.datetime64(start, 'h'), alpha)
+            for lo, hi in shards
+        ]
+        states = _run_shards(specs, n_workers, max_retries)
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    model = merge_states(states, order)
+    if artifact_path is not None:
+        extra = {'series_store': series_store}
+        if store_names is not None:
+            extra['store_names'] = np.asarray(store_names, dtype=str)
+        model.save(artifact_path, **extra)
+    return model
+
+
+def _shard_failed(spec, attempts, max_retries, error):
+    if attempts > max_retries:
+        raise RuntimeError(
+            f"Shard rows {spec.row_start}-{spec.row_stop} failed after {attempts} attempts"
+        ) from error
+
+
+def _run_shards(specs, n_workers, max_retries):
+    states = [None] * len(specs)
+    attempts = [0] * len(specs)
+    pending = list(range(len(specs)))
+
+    pool = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        while pending:
+            submitted, pending = pending, []
+            futures = {}
+            broken = None
+            try:
+                for i in submitted:
+                    futures[i] = pool.submit(_fit_shard, specs[i])
+            except BrokenProcessPool as error:
+                broken = error
+            for i, future in futures.items():
+                try:
+                    states[i] = future.result()
+                except BrokenProcessPool as error:
+                    broken = error
+                except Exception as error:
+                    attempts[i] += 1
+                    _shard_failed(specs[i], attempts[i], max_retries, error)
+                    pending.append(i)
+            if broken is not None:
+                # A dead worker breaks the whole pool: replace it and resubmit every shard still
+                # without a result, which counts as one attempt for each of them
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=n_workers)
+                for i in submitted:
+                    if states[i] is None and i not in pending:
+                        attempts[i] += 1
+                        _shard_failed(specs[i], attempts[i], max_retries, broken)
+                        pending.append(i)
+    finally:
+        pool.shutdown()
+    return states
@@ -0,0 +1,18 @@
+import os
+
+from smartcart import batch
+
+
+def test_resume_leaves_the_segment_model_untouched(tmp_path):
+    out = str(tmp_path)
+    args = ['--out', out, '--customers', '5000', '--end', '2026-01-01 00:00', '--workers', '1']
+    batch.main(args)
+    model_path = os.path.join(out, 'model', 'segments.npz')
+    written = os.stat(model_path).st_mtime_ns
+    labels = os.path.join(out, 'segments', 'labels.npy')
+    os.remove(labels)
+
+    batch.main(args)
+    assert os.path.exists(labels)
+    assert os.stat(model_path).st_mtime_ns == written
+    assert not [n for n in os.listdir(os.path.join(out, 'model')) if n.endswith('.tmp')]
@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from smartcart.cache import ResultCache
+
+
+def test_get_or_compute_releases_the_key_when_compute_fails():
+    cache = ResultCache()
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('key', fail)
+    assert cache._computing == {}
+    assert cache.get_or_compute('key', lambda: 42) == 42
+
+
+def test_get_or_compute_keeps_a_newer_callers_key_lock():
+    cache = ResultCache()
+    newer = threading.Lock()
+
+    def compute():
+        # The key was invalidated mid-compute and a later caller registered its own lock
+        cache._computing['key'] = newer
+        return 1
+
+    cache.get_or_compute('key', compute)
+    assert cache._computing['key'] is newer
+
+
+def test_slow_disk_read_does_not_block_other_keys(tmp_path, monkeypatch):
+    cache = ResultCache(disk_dir=str(tmp_path))
+    cache.put('slow', 1)
+    cache.put('fast', 2)
+    cache._entries.clear()
+    reading, release = threading.Event(), threading.Event()
+    load_disk = cache._load_disk
+
+    def slow_load(key):
+        if key == 'slow':
+            reading.set()
+            release.wait(5)
+        return load_disk(key)
+
+    monkeypatch.setattr(cache, '_load_disk', slow_load)
+    reader = threading.Thread(target=cache.get, args=('slow',))
+    reader.start()
+    assert reading.wait(5)
+    started = time.monotonic()
+    assert cache.get('fast') == 2
+    assert time.monotonic() - started < 1
+    release.set()
+    reader.join()
+    assert cache.get('slow') == 1 and cache.disk_hits == 2
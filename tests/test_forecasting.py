@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from smartcart import forecasting
+
+
+def _forecaster(n_series=25, days=21, seed=0):
+    rng = np.random.default_rng(seed)
+    hours = np.arange(days * 24)
+    base = 20 + 10 * np.sin(2 * np.pi * hours / 24)
+    history = (base * rng.uniform(0.5, 2, (n_series, 1)) + rng.normal(0, 3, (n_series, len(hours)))).astype(np.float32)
+    return forecasting.SeasonalForecaster().fit(history, pd.Timestamp('2026-01-05'))
+
+
+def test_summed_quantiles_add_variances_not_quantiles():
+    model = _forecaster()
+    timestamps = model.forecast_index(24)
+    summed = model.summed_quantiles_at(timestamps, (0.5, 0.99))
+    per_series = model.quantiles_at(timestamps, (0.5, 0.99))
+
+    np.testing.assert_allclose(summed[:, 0], per_series[:, :, 0].sum(axis=0), rtol=1e-5)
+    spread = summed[:, 1] - summed[:, 0]
+    expected = forecasting.quantile_z((0.99,))[0] * np.sqrt((model.residual_std() ** 2).sum())
+    np.testing.assert_allclose(spread, expected, rtol=1e-4)
+    assert (spread < (per_series[:, :, 1] - per_series[:, :, 0]).sum(axis=0)).all()
+
+
+def test_checkpoint_round_trips_an_updated_model(tmp_path):
+    model = _forecaster()
+    model.update(np.full((model.n_series, 5), 30, dtype=np.float32))
+    path = str(tmp_path / 'store_forecaster.npz')
+    model.save(path, data_key=np.array('42:small'))
+
+    loaded = forecasting.load_checkpoint(path, '42:small')
+    assert loaded.end == model.end and loaded.n_obs == model.n_obs
+    np.testing.assert_array_equal(loaded.predict(48), model.predict(48))
+    np.testing.assert_array_equal(loaded.predict_quantiles(48), model.predict_quantiles(48))
+
+    # Further updates continue from the checkpoint exactly as from the live model
+    hour = np.linspace(10, 40, model.n_series, dtype=np.float32)
+    np.testing.assert_array_equal(loaded.update(hour).predict(24), model.update(hour).predict(24))
+
+
+def test_checkpoint_for_other_data_is_not_loaded(tmp_path):
+    path = str(tmp_path / 'store_forecaster.npz')
+    _forecaster().save(path, data_key=np.array('42:small'))
+    assert forecasting.load_checkpoint(path, '7:small') is None
+    assert forecasting.load_checkpoint(str(tmp_path / 'missing.npz'), '42:small') is None
+    _forecaster().save(path)
+    assert forecasting.load_checkpoint(path, '42:small') is None
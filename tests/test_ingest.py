@@ -0,0 +1,27 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from smartcart import ingest
+
+
+class _FailingConsumer:
+    def update(self, chunk):
+        raise RuntimeError('consumer failed')
+
+
+def test_run_stops_reading_when_the_batcher_fails(tmp_path):
+    n = 200_000
+    records = ingest.encode_events(np.arange(n) + 1_700_000_000, np.zeros(n), np.arange(n) % 7, np.ones(n))
+    path = tmp_path / 'orders.log'
+    path.write_bytes(records.tobytes())
+    source = ingest.FileSource(str(path), read_events=1_000)
+    service = ingest.IngestionService(source, consumers=[_FailingConsumer()], batch_events=1_000, queue_size=2)
+
+    async def run():
+        return await asyncio.wait_for(service.run(), 10)
+
+    with pytest.raises(RuntimeError, match='consumer failed'):
+        asyncio.run(run())
+    assert source.offset == 0
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from smartcart import datagen, rollups, stream
+
+
+def _behavior():
+    return rollups.SegmentBehavior(datagen.SEGMENT_NAMES, datagen.ORDER_CATEGORIES)
+
+
+def test_segment_behavior_folds_a_chunked_log_like_the_whole_log():
+    config = datagen.SizeConfig(n_orders=25_000)
+    end = pd.Timestamp('2026-01-01')
+    chunks = list(stream.iter_order_chunks(config, 5, chunk_rows=4_000, end=end))
+    streamed, = stream.consume(iter(chunks), _behavior())
+    whole = _behavior().update(pd.concat(chunks, ignore_index=True))
+
+    np.testing.assert_array_equal(streamed.counts, whole.counts)
+    assert streamed.counts.sum() == config.n_orders
+    pd.testing.assert_frame_equal(streamed.by_hour_range(), whole.by_hour_range())
+    pd.testing.assert_frame_equal(streamed.category_preferences(), whole.category_preferences())
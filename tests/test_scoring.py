@@ -0,0 +1,28 @@
+from smartcart import datagen, segmentation
+from smartcart.scoring import SegmentScorer
+
+
+def _scorer():
+    config = datagen.SizeConfig(n_customers=20_000)
+    features = datagen.generate_customer_features(config, datagen.table_rngs(0)['customers'])
+    model = segmentation.MiniBatchKMeans(seed=0).fit(segmentation.FeatureChunks([features]))
+    return SegmentScorer(model, segmentation.cluster_names(model.cluster_centers()))
+
+
+def test_assign_rescores_a_known_customer_with_new_features():
+    scorer = _scorer()
+    engaged, lapsed = [4.0, 2.5, 300.0], [120.0, 0.2, 100.0]
+    fresh = scorer.assign('CUST-2002', lapsed)
+
+    scorer.assign('CUST-1001', engaged)
+    assert scorer.assign('CUST-1001', lapsed) == fresh
+    assert scorer.assign('CUST-1001', lapsed) == fresh
+    assert scorer.hits == 1
+
+
+def test_assign_batch_shares_the_cache_with_assign():
+    scorer = _scorer()
+    rows = [[4.0, 2.5, 300.0], [120.0, 0.2, 100.0]]
+    labels = scorer.assign_batch(['A', 'A'], rows)
+    assert list(labels) == [scorer.assign('A', rows[0]), scorer.assign('A', rows[1])]
+    assert scorer.hits == 2
@@ -0,0 +1,13 @@
+import numpy as np
+import pytest
+
+from smartcart import segmentation
+
+
+@pytest.mark.parametrize('k', [1, 2, 3, 4, 6])
+def test_cluster_names_names_every_cluster(k):
+    rng = np.random.default_rng(k)
+    centers = np.c_[rng.uniform(1, 90, k), rng.uniform(0.1, 3, k), rng.uniform(50, 500, k)]
+    names = segmentation.cluster_names(centers)
+    assert len(set(names)) == k
+    assert names[np.argmax(centers[:, 1] * centers[:, 2])] == 'High-value Shoppers'
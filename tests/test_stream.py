@@ -0,0 +1,39 @@
+import numpy as np
+
+from smartcart import datagen, forecasting, stream
+
+CONFIG = datagen.SizeConfig(n_stores=3, n_skus=20, horizon_days=2)
+END = np.datetime64('2026-01-01T00')
+
+
+def _units(seed):
+    return np.concatenate([chunk.units for chunk in stream.iter_sales_chunks(CONFIG, seed, chunk_rows=500, end=END)])
+
+
+def test_seeded_sales_chunks_are_reproducible():
+    assert np.array_equal(_units(7), _units(7))
+
+
+def test_unseeded_sales_chunks_draw_fresh_entropy(monkeypatch):
+    # Same catalogue and store levels either way, so only the chunk streams can differ
+    table_rngs = datagen.table_rngs
+    monkeypatch.setattr(datagen, 'table_rngs', lambda seed: table_rngs(0))
+    assert not np.array_equal(_units(None), _units(None))
+
+
+def test_weekly_profile_fits_the_forecaster_without_materializing():
+    config = datagen.SizeConfig(n_stores=3, n_skus=20, horizon_days=14)
+    chunks = list(stream.iter_sales_chunks(config, 3, chunk_rows=777, end=END))
+    profile, = stream.consume(chunks, stream.WeeklyProfile(config.n_stores, config.n_skus, by='store_sku'))
+    model = forecasting.SeasonalForecaster().fit_weekly(profile.mean(), END, profile.counts, profile.square_mean())
+
+    # The same in-sample error computed over the materialized history
+    history = np.zeros((config.n_stores * config.n_skus, config.n_hours))
+    hours = np.concatenate([chunk.timestamp for chunk in chunks])
+    series = np.concatenate([chunk.store.astype(np.int64) * config.n_skus + chunk.sku for chunk in chunks])
+    column = (hours - hours.min()).astype(np.int64)
+    history[series, column] = np.concatenate([chunk.units for chunk in chunks])
+    fitted = model.predict_at(np.unique(hours))
+    np.testing.assert_allclose(model.residual_std(), np.sqrt(((history - fitted) ** 2).mean(axis=1)), rtol=1e-3)
+    assert model.n_obs == config.n_hours
+    assert model.predict_quantiles(24, total=True).shape == (config.n_stores * config.n_skus, 3)
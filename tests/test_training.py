@@ -0,0 +1,46 @@
+import os
+from functools import partial
+
+import numpy as np
+import pytest
+
+from smartcart import training
+
+_fit_shard = training._fit_shard
+
+
+def _crash_once(marker, spec):
+    """Kill the worker the first time any shard runs, then fit normally."""
+    try:
+        fd = os.open(marker, os.O_CREAT | os.O_EXCL)
+    except FileExistsError:
+        return _fit_shard(spec)
+    os.close(fd)
+    os._exit(1)
+
+
+def _always_crash(spec):
+    os._exit(1)
+
+
+def _history(n_series=6, n_hours=24 * 14, seed=0):
+    rng = np.random.default_rng(seed)
+    return (20 + rng.standard_normal((n_series, n_hours))).astype(np.float32)
+
+
+def test_train_by_store_recovers_from_worker_crash(tmp_path, monkeypatch):
+    history = _history()
+    start = np.datetime64('2026-01-01T00', 'h')
+    expected = training.train_by_store(history, start, n_workers=2)
+
+    monkeypatch.setattr(training, '_fit_shard', partial(_crash_once, str(tmp_path / 'crashed')))
+    model = training.train_by_store(history, start, n_workers=2, max_retries=2)
+
+    assert (tmp_path / 'crashed').exists()
+    np.testing.assert_allclose(model.state_dict()['level'], expected.state_dict()['level'])
+
+
+def test_train_by_store_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(training, '_fit_shard', _always_crash)
+    with pytest.raises(RuntimeError, match='failed after 1 attempts'):
+        training.train_by_store(_history(), np.datetime64('2026-01-01T00', 'h'), n_workers=2, max_retries=0)
@@ -0,0 +1,39 @@
+"""Page registry for the Streamlit app.
+
+Each page lives in its own module and is imported on first visit, so a
+session only pays for the libraries, data and models of the pages it opens.
+"""
+import importlib
+from typing import NamedTuple
+
+
+class PageSpec(NamedTuple):
+    module: str
+    hidden: bool = False
+
+
+PAGES = {}
+
+
+def register_page(title, module, hidden=False):
+    """Register a page module exposing ``render()``; hidden pages stay out of the sidebar."""
+    PAGES[title] = PageSpec(module, hidden)
+
+
+def page_titles(include_hidden=False):
+    return [title for title, spec in PAGES.items() if include_hidden or not spec.hidden]
+
+
+def load_page(title):
+    return importlib.import_module(PAGES[title].module)
+
+
+def render(title):
+    load_page(title).render()
+
+
+register_page("Dashboard", "views.dashboard")
+register_page("Demand Forecasting", "views.forecasting")
+register_page("Inventory Optimization", "views.inventory")
+register_page("Customer Segmentation", "views.segmentation")
+register_page("Performance", "views.performance", hidden=True)
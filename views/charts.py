@@ -0,0 +1,84 @@
+"""Time-series charts with server-side downsampling and payload accounting.
+
+Long series are cut down to about the chart's pixel width before they are
+turned into traces, and switch to WebGL (``Scattergl``) once the raw series
+is too long for SVG. ``plotly_chart`` wraps ``st.plotly_chart`` and, in
+sessions that record spans, notes each chart's point count, JSON size and
+serialization time for the admin panel.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from smartcart.downsample import downsample_indices
+from views import instrument
+
+# Roughly the pixel width of a full-width chart
+MAX_POINTS = 1500
+
+# Raw series longer than this are drawn with WebGL
+WEBGL_THRESHOLD = 5000
+
+
+def line_traces(x, series, max_points=MAX_POINTS, method='lttb', colors=None, mode='lines', align=False):
+    """Downsampled line traces, one per ``series`` entry (name -> values) over a shared ``x``.
+
+    Each series keeps its own points unless ``align`` is set, in which case
+    all of them keep the points chosen for the first series, so fills
+    between the traces (bands) line up.
+    """
+    x = np.asarray(x)
+    colors = colors or {}
+    trace_type = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    traces = []
+    keep = None
+    for name, values in series.items():
+        values = np.asarray(values)
+        if keep is None or not align:
+            keep = downsample_indices(x, values, max_points, method)
+        traces.append(trace_type(
+            x=x[keep],
+            y=values[keep],
+            mode=mode,
+            name=name,
+            line=dict(color=colors.get(name))
+        ))
+    return traces
+
+
+def zoom_window(timestamps, default_hours, key):
+    """Time-range slider; the chart re-aggregates whatever range it selects."""
+    timestamps = pd.to_datetime(timestamps)
+    if len(timestamps) < 2:
+        return timestamps.min(), timestamps.max()
+    first, last = timestamps.min().to_pydatetime(), timestamps.max().to_pydatetime()
+    start = max(first, (timestamps.max() - pd.Timedelta(hours=default_hours - 1)).to_pydatetime())
+    return st.slider("Zoom", min_value=first, max_value=last, value=(start, last),
+                     step=pd.Timedelta(hours=1).to_pytimedelta(), format="MM-DD HH:00", key=key)
+
+
+def plotly_chart(fig, name, **kwargs):
+    """``st.plotly_chart`` plus, while the session records, payload size and serialization time for ``name``."""
+    with instrument.span(f'{name}: plotly_chart'):
+        # Measuring serializes the figure a second time, so only recording sessions pay for it
+        if instrument.recording():
+            start = time.perf_counter()
+            payload = pio.to_json(fig, validate=False)
+            seconds = time.perf_counter() - start
+            st.session_state.setdefault('chart_payloads', {})[name] = {
+                'points': sum(len(trace.x) for trace in fig.data if getattr(trace, 'x', None) is not None),
+                'kb': len(payload) / 1024,
+                'serialize_ms': seconds * 1000,
+            }
+        st.plotly_chart(fig, **kwargs)
+
+
+def payload_report():
+    """Per-chart payload stats recorded in this session, largest first."""
+    payloads = st.session_state.get('chart_payloads', {})
+    report = pd.DataFrame.from_dict(payloads, orient='index').rename_axis('chart').reset_index()
+    return report.sort_values('kb', ascending=False, ignore_index=True) if len(report) else report
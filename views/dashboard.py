@@ -0,0 +1,188 @@
+"""Dashboard page."""
+from collections import deque
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from smartcart import geo
+from views import charts, instrument, state
+
+LIVE_REFRESH_SECONDS = 1
+
+# Live order points kept per viewer (five minutes at one point per second)
+LIVE_CHART_POINTS = 300
+
+KPI_TILES = [
+    ('inventory_accuracy', 'Inventory Accuracy', '{:.1f}%'),
+    ('avg_delivery_minutes', 'Avg Delivery Time', '{:.1f} min'),
+    ('stockout_rate', 'Stockout Rate', '{:.1f}%'),
+    ('avg_order_value', 'Avg Order Value', '₹{:.0f}'),
+]
+
+
+def live_kpis(live_mode):
+    """KPI tiles (and the live order chart) patched with the feed's changes since this viewer's last run."""
+    delta = state.live_feed().changes_since(st.session_state.get('live_seq', 0))
+    st.session_state['live_seq'] = delta.seq
+    kpis = st.session_state.setdefault('live_kpis', {})
+    kpis.update(delta.kpis)
+    
+    columns = st.columns(4)
+    for column, (name, label, value_format) in zip(columns, KPI_TILES):
+        with column:
+            st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
+            st.markdown(f"<div class='metric-value'>{value_format.format(kpis[name])}</div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='metric-label'>{label}</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+    
+    if not live_mode:
+        return
+    
+    # Append only the new points to this viewer's figure
+    points = st.session_state.setdefault('live_points', deque(maxlen=LIVE_CHART_POINTS))
+    points.extend(delta.points)
+    fig = st.session_state.get('live_figure')
+    if fig is None:
+        fig = go.Figure(go.Scatter(mode='lines', name='orders', line=dict(color='#3498db')))
+        fig.update_layout(height=220, margin=dict(t=10, b=10), xaxis_title='', yaxis_title='Orders / s')
+        st.session_state['live_figure'] = fig
+    if delta.points:
+        with fig.batch_update():
+            fig.data[0].x = [timestamp for timestamp, _ in points]
+            fig.data[0].y = [orders for _, orders in points]
+    charts.plotly_chart(fig, 'Live Orders', use_container_width=True)
+
+
+def render():
+    with instrument.span('Dashboard: data'):
+        data = state.generate_demo_data()
+    
+    st.markdown("<h1 class='main-header'>SmartCart AI Dashboard</h1>", unsafe_allow_html=True)
+    
+    # KPI Metrics, refreshed in place by a fragment while live mode is on
+    live_mode = st.toggle("Live mode", key='dashboard_live')
+    st.fragment(live_kpis, run_every=LIVE_REFRESH_SECONDS if live_mode else None)(live_mode)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Main dashboard charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.markdown("<h2 class='sub-header'>Demand Forecast vs Actual</h2>", unsafe_allow_html=True)
+        
+        # Everything the store cube holds; the zoom range is re-downsampled server-side
+        with instrument.span('Demand Forecast vs Actual: prep'):
+            store_cube = state.build_rollups().store
+            history = store_cube.recent(store_cube.window_hours)
+            start, end = charts.zoom_window(history['timestamp'], 24, key='dashboard_zoom')
+            forecast_chart = history[history['timestamp'].between(start, end)]
+            timestamps = forecast_chart['timestamp']
+            demand = forecast_chart.drop(columns='timestamp').to_numpy().sum(axis=1)
+        
+            # Network P50/P90/P99 of the store forecasts summed over stores
+            quantiles = state.fit_demand_forecasters()['store'].summed_quantiles_at(timestamps)
+        
+        # Create Plotly chart; P90 is shaded down to the forecast (the P50)
+        with instrument.span('Demand Forecast vs Actual: figure'):
+            # The band traces share one set of points so the fill between them lines up
+            forecast_trace, p90_trace, p99_trace = charts.line_traces(
+                timestamps,
+                {'forecast': quantiles[:, 0], 'P90': quantiles[:, 1], 'P99': quantiles[:, 2]},
+                colors={'forecast': '#e74c3c', 'P90': 'rgba(231, 76, 60, 0.4)', 'P99': 'rgba(231, 76, 60, 0.4)'},
+                align=True
+            )
+            demand_trace, = charts.line_traces(timestamps, {'demand': demand}, colors={'demand': '#3498db'})
+            p90_trace.update(fill='tonexty', fillcolor='rgba(231, 76, 60, 0.15)')
+            p99_trace.update(line_dash='dot')
+            fig = go.Figure([forecast_trace, p90_trace, p99_trace, demand_trace])
+            fig.update_layout(
+                legend_title_text='',
+                xaxis_title='',
+                yaxis_title='Orders',
+                xaxis=dict(tickformat='%m-%d %H:00'),
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            )
+        charts.plotly_chart(fig, 'Demand Forecast vs Actual', use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.markdown("<h2 class='sub-header'>Store Inventory Status</h2>", unsafe_allow_html=True)
+        
+        # Prepare store inventory data
+        inventory_df = data['store_data'][['name', 'current_inventory', 'optimal_inventory']]
+        
+        # Create Plotly chart
+        with instrument.span('Store Inventory Status: figure'):
+            fig = px.bar(
+                inventory_df,
+                x='name',
+                y=['current_inventory', 'optimal_inventory'],
+                barmode='group',
+                labels={'name': 'Store', 'value': 'Units'},
+                color_discrete_map={'current_inventory': '#2ecc71', 'optimal_inventory': '#3498db'}
+            )
+            fig.update_layout(
+                legend_title_text='',
+                xaxis_title='',
+                yaxis_title='Inventory Units',
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            )
+        charts.plotly_chart(fig, 'Store Inventory Status', use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Second row
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.markdown("<h2 class='sub-header'>Customer Segments</h2>", unsafe_allow_html=True)
+        
+        # Prepare segment data
+        with instrument.span('Customer Segments: prep'):
+            segment_df = state.fit_customer_segments()['summary']
+        
+        # Create pie chart
+        with instrument.span('Customer Segments: figure'):
+            fig = px.pie(
+                segment_df,
+                values='size',
+                names='name',
+                hole=0.4,
+                color_discrete_sequence=px.colors.qualitative.Set2
+            )
+            fig.update_layout(
+                legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5)
+            )
+        charts.plotly_chart(fig, 'Customer Segments', use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.markdown("<h2 class='sub-header'>Delivery Times</h2>", unsafe_allow_html=True)
+        
+        # Orders routed to their nearest serviceable store, bucketed by estimated delivery time
+        with instrument.span('Delivery Times: prep'):
+            delivery_df, unserviceable = state.estimate_deliveries()
+        
+        # Create bar chart
+        with instrument.span('Delivery Times: figure'):
+            fig = px.bar(
+                delivery_df,
+                x='time',
+                y='count',
+                color='count',
+                color_continuous_scale=['#3498db', '#2ecc71', '#f1c40f', '#e74c3c'],
+                labels={'time': 'Delivery Time', 'count': 'Number of Orders'}
+            )
+            fig.update_layout(
+                xaxis_title='',
+                yaxis_title='Number of Orders',
+                coloraxis_showscale=False
+            )
+        charts.plotly_chart(fig, 'Delivery Times', use_container_width=True)
+        st.caption(f"{unserviceable:.1%} of orders are beyond {geo.SERVICE_RADIUS_KM:.0f} km of every store.")
+        st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,137 @@
+"""Demand Forecasting page."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from smartcart import datagen, forecasting
+from views import charts, instrument, state
+
+
+def render():
+    with instrument.span('Demand Forecasting: data'):
+        data = state.generate_demo_data()
+    
+    st.markdown("<h1 class='main-header'>Demand Forecasting Engine</h1>", unsafe_allow_html=True)
+    
+    st.markdown("""
+    The SmartCart demand forecasting system uses LSTM neural networks to predict product demand with high accuracy. 
+    It factors in historical sales data, time patterns, seasonality, local events, and even weather conditions.
+    """)
+    
+    # Interactive date selector
+    forecast_date = st.date_input("Select forecast date:", datetime.now().date())
+    
+    # Tabs for different views
+    forecast_tab1, forecast_tab2, forecast_tab3 = st.tabs(["Store Level", "Product Level", "Time Patterns"])
+    
+    with forecast_tab1:
+        st.subheader("Store-Level Demand Forecast")
+        
+        # Forecast every store for the selected date in one batched prediction
+        with instrument.span('Store-Level Demand Forecast: prep'):
+            store_names = data['store_data']['name'].tolist()
+            forecasters = state.fit_demand_forecasters()
+            forecast_hours = forecasting.day_hours(forecast_date)
+        
+            # Create heatmap
+            heatmap_df = state.cached(
+                'forecast/store',
+                lambda: pd.DataFrame(forecasters['store'].predict_at(forecast_hours).astype(int), index=store_names, columns=range(24)),
+                date=forecast_date
+            )
+        
+        with instrument.span('Store-Level Demand Forecast: figure'):
+            fig = px.imshow(
+                heatmap_df,
+                labels=dict(x="Hour of Day", y="Store", color="Demand"),
+                x=[f"{h}:00" for h in range(24)],
+                y=store_names,
+                color_continuous_scale="Viridis"
+            )
+            fig.update_layout(
+                xaxis_title="Hour of Day",
+                yaxis_title="Store",
+                coloraxis_colorbar=dict(title="Orders")
+            )
+        charts.plotly_chart(fig, 'Store-Level Demand Forecast', use_container_width=True)
+        
+        st.markdown("""
+        **Insights:**
+        - Indiranagar and Koramangala show higher demand during evening hours (6-9 PM)
+        - Weekend demand is 30% higher across all stores
+        - Weather affects demand by 15-20% (rainy days show higher order volumes)
+        """)
+    
+    with forecast_tab2:
+        st.subheader("Product-Level Demand Patterns")
+        
+        # Category-level forecast for the selected date
+        with instrument.span('Category Forecast: prep'):
+            categories = datagen.FORECAST_CATEGORIES
+            category_forecast = state.cached(
+                'forecast/category',
+                lambda: np.maximum(5, forecasters['category'].predict_at(forecast_hours)).astype(int),
+                date=forecast_date
+            )
+        
+        # Create line chart
+        with instrument.span('Category Forecast: figure'):
+            fig = go.Figure(charts.line_traces(np.arange(category_forecast.shape[1]), dict(zip(categories, category_forecast)), mode='lines+markers'))
+            fig.update_layout(
+                xaxis=dict(tickmode='array', tickvals=list(range(24)), ticktext=[f"{h}:00" for h in range(24)]),
+                xaxis_title="Hour of Day",
+                yaxis_title="Predicted Orders",
+                legend_title="Category"
+            )
+        charts.plotly_chart(fig, 'Category Forecast', use_container_width=True)
+        
+        st.markdown("""
+        **Product Insights:**
+        - Dairy peaks in morning (6-8 AM) and evening (5-7 PM)
+        - Bakery items peak in morning hours
+        - Meat & Seafood show highest demand in evening hours
+        - Beverages maintain steady demand throughout the day with slight evening peak
+        """)
+    
+    with forecast_tab3:
+        st.subheader("Temporal Patterns in Demand")
+        
+        # Create weekly pattern data
+        with instrument.span('Weekly Demand Pattern: prep'):
+            days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        
+            # Daily demand by weekday from the network cube, relative to the weekly average
+            daily_demand = state.build_rollups().network.by_day_of_week().loc['demand']
+            weekly_data = pd.DataFrame({
+                'day': days,
+                'demand': (100 * daily_demand / daily_demand[daily_demand > 0].mean()).round().astype(int).to_numpy(),
+                'day_num': list(range(7))
+            })
+        
+        with instrument.span('Weekly Demand Pattern: figure'):
+            fig = px.bar(
+                weekly_data,
+                x='day',
+                y='demand',
+                color='demand',
+                color_continuous_scale=['#3498db', '#2ecc71', '#f1c40f', '#e74c3c'],
+                labels={'day': 'Day of Week', 'demand': 'Relative Demand'}
+            )
+            fig.update_layout(
+                xaxis_title="",
+                yaxis_title="Relative Demand (%)",
+                coloraxis_showscale=False
+            )
+        charts.plotly_chart(fig, 'Weekly Demand Pattern', use_container_width=True)
+        
+        st.markdown("""
+        **Temporal Insights:**
+        - Weekend demand is 30-40% higher than weekdays
+        - Friday shows ~15% higher demand than earlier weekdays
+        - Order volumes tend to peak between 6-9 PM across all days
+        - Monday mornings show higher than average breakfast item orders
+        """)
@@ -0,0 +1,148 @@
+"""Timing spans around page sections, feeding the hidden Performance page.
+
+``rerun(page)`` wraps one script run and ``span(name)`` wraps a section
+inside it. Whether a session records is read once per rerun; when it does
+not, ``span`` returns a shared no-op context manager, so instrumented code
+pays one thread-local lookup per section. Sessions can additionally
+capture a cProfile of each rerun and tracemalloc allocation figures per
+section.
+"""
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import streamlit as st
+
+# Samples kept per section and reruns kept overall
+SECTION_SAMPLES = 1000
+RERUN_SAMPLES = 500
+
+SLOWEST_RERUNS = 10
+PROFILE_LINES = 30
+
+_NOOP = nullcontext()
+_local = threading.local()
+
+
+class SpanRecorder:
+    """Process-wide span samples, shared by every session that records."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sections = defaultdict(lambda: deque(maxlen=SECTION_SAMPLES))
+        self.reruns = deque(maxlen=RERUN_SAMPLES)
+
+    def add_span(self, name, seconds, allocated):
+        with self._lock:
+            self.sections[name].append((seconds, allocated))
+
+    def add_rerun(self, page, seconds, spans):
+        with self._lock:
+            self.reruns.append({'page': page, 'ms': seconds * 1000, 'spans': spans})
+
+    def section_stats(self):
+        """Per-section count, p50/p95 latency and mean allocation (KB, when traced)."""
+        rows = []
+        with self._lock:
+            items = [(name, list(samples)) for name, samples in self.sections.items()]
+        for name, samples in items:
+            seconds = np.array([s for s, _ in samples]) * 1000
+            allocated = [a for _, a in samples if a is not None]
+            rows.append({
+                'section': name,
+                'count': len(samples),
+                'p50_ms': float(np.percentile(seconds, 50)),
+                'p95_ms': float(np.percentile(seconds, 95)),
+                'alloc_kb': float(np.mean(allocated)) / 1024 if allocated else None,
+            })
+        return sorted(rows, key=lambda row: -row['p95_ms'])
+
+    def slowest_reruns(self, n=SLOWEST_RERUNS):
+        with self._lock:
+            return sorted(self.reruns, key=lambda run: -run['ms'])[:n]
+
+    def clear(self):
+        with self._lock:
+            self.sections.clear()
+            self.reruns.clear()
+
+
+@st.cache_resource
+def recorder():
+    return SpanRecorder()
+
+
+class _Span:
+    __slots__ = ('run', 'name', 'started', 'memory')
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.memory = tracemalloc.get_traced_memory()[0] if self.run['trace_memory'] else None
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.started
+        allocated = None
+        if self.memory is not None:
+            allocated = max(tracemalloc.get_traced_memory()[0] - self.memory, 0)
+        self.run['spans'].append((self.name, seconds * 1000))
+        self.run['recorder'].add_span(self.name, seconds, allocated)
+        return False
+
+
+def recording():
+    """Whether this session is recording the current rerun."""
+    return getattr(_local, 'run', None) is not None
+
+
+def span(name):
+    """Time the enclosed section if this session is recording."""
+    run = getattr(_local, 'run', None)
+    return _NOOP if run is None else _Span(run, name)
+
+
+@contextmanager
+def rerun(page):
+    """Wrap one script run; records nothing unless the session turned recording on."""
+    settings = st.session_state.get('perf_settings', {})
+    if not settings.get('spans'):
+        yield
+        return
+
+    run = {
+        'recorder': recorder(),
+        'spans': [],
+        'trace_memory': settings.get('tracemalloc', False),
+    }
+    started_tracing = run['trace_memory'] and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if settings.get('cprofile') else None
+    _local.run = run
+    started = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        seconds = time.perf_counter() - started
+        _local.run = None
+        if started_tracing:
+            tracemalloc.stop()
+        run['recorder'].add_rerun(page, seconds, run['spans'])
+        if profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_LINES)
+            st.session_state['perf_profile'] = out.getvalue()
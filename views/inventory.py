@@ -0,0 +1,263 @@
+"""Inventory Optimization page."""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from smartcart import forecasting, inventory, policy
+from views import charts, instrument, state
+
+
+def render():
+    with instrument.span('Inventory Optimization: data'):
+        data = state.generate_demo_data()
+    
+    st.markdown("<h1 class='main-header'>Inventory Optimization System</h1>", unsafe_allow_html=True)
+    
+    st.markdown("""
+    SmartCart's inventory optimization system ensures the right products are available at the right stores at the right time.
+    It calculates optimal inventory levels, generates reorder recommendations, and allocates stock across dark stores.
+    """)
+    
+    # Interactive store selector
+    selected_store = st.selectbox("Select Store:", data['store_data']['name'].tolist())
+    
+    # Tabs for different views
+    inv_tab1, inv_tab2, inv_tab3, inv_tab4 = st.tabs(["Inventory Health", "Product Optimization", "Reorder Recommendations", "Stock Transfers"])
+    
+    with inv_tab1:
+        st.subheader(f"Inventory Health for {selected_store}")
+        
+        # In-stock and wastage rates from replaying the store's plan with FIFO expiry
+        with instrument.span('Inventory Health: simulation'):
+            store_health = state.simulate_expiry()[0].loc[selected_store]
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
+            st.markdown(f"<div class='metric-value'>{store_health['in_stock_rate']:.1%}</div>", unsafe_allow_html=True)
+            st.markdown("<div class='metric-label'>In-stock Rate</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
+            st.markdown("<div class='metric-value'>92.5%</div>", unsafe_allow_html=True)
+            st.markdown("<div class='metric-label'>Inventory Accuracy</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
+            st.markdown(f"<div class='metric-value'>{store_health['wastage_rate']:.1%}</div>", unsafe_allow_html=True)
+            st.markdown("<div class='metric-label'>Wastage Rate</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        st.caption(f"In-stock and wastage rates over a {state.SIMULATION_DAYS}-day simulation of the current plan, "
+                   f"with stock sold oldest lot first and written off at expiry.")
+        
+        # Inventory health by category
+        st.subheader("Category-level Inventory Health")
+        
+        # Create sample data for category-level inventory
+        categories = ['Dairy', 'Fruits', 'Vegetables', 'Bakery', 'Beverages', 'Meat', 'Grocery']
+        
+        category_inventory = pd.DataFrame({
+            'category': categories,
+            'current': [92, 85, 88, 95, 97, 90, 99],
+            'target': [95, 90, 90, 95, 95, 95, 98],
+            'status': ['Good', 'Low', 'Good', 'Optimal', 'Optimal', 'Low', 'Optimal']
+        })
+        
+        # Color map for status
+        color_map = {
+            'Optimal': '#2ecc71',
+            'Good': '#3498db',
+            'Low': '#f1c40f',
+            'Critical': '#e74c3c'
+        }
+        
+        status_colors = [color_map[status] for status in category_inventory['status']]
+        
+        with instrument.span('Category-level Inventory Health: figure'):
+            fig = go.Figure()
+        
+            fig.add_trace(go.Bar(
+                x=category_inventory['category'],
+                y=category_inventory['current'],
+                name='Current Inventory Level',
+                marker_color=status_colors
+            ))
+        
+            fig.add_trace(go.Scatter(
+                x=category_inventory['category'],
+                y=category_inventory['target'],
+                mode='markers',
+                name='Target Level',
+                marker=dict(
+                    color='rgba(0, 0, 0, 0.8)',
+                    size=10,
+                    symbol='line-ns'
+                )
+            ))
+        
+            fig.update_layout(
+                xaxis_title='',
+                yaxis_title='Inventory Level (%)',
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
+            )
+        
+        charts.plotly_chart(fig, 'Category-level Inventory Health', use_container_width=True)
+    
+    with inv_tab2:
+        st.subheader("Product-level Optimization")
+        
+        # Plan inventory for the selected store from its store x SKU demand forecast
+        def plan_store_inventory():
+            store_index = data['store_data']['name'].tolist().index(selected_store)
+            n_stores, n_skus = data['stock_on_hand'].shape
+            daily_quantiles = state.fit_sku_forecaster().predict_quantiles(24, total=True).reshape(n_stores, n_skus, -1)
+            plan = inventory.plan_inventory(
+                data['product_data'],
+                data['stock_on_hand'][store_index],
+                daily_quantiles=daily_quantiles[store_index],
+                quantile_levels=forecasting.DEFAULT_QUANTILES
+            )
+            plan['days_to_stockout'] = plan['days_to_stockout'].round(1)
+            return plan
+        
+        with instrument.span('Product Optimization: prep'):
+            products = state.cached('inventory/products', plan_store_inventory, store=selected_store)
+        
+        # Display as dataframe
+        st.dataframe(
+            products[['name', 'category', 'current_stock', 'optimal_stock', 'days_to_stockout', 'stock_status']],
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        # Create a chart for critical/low items
+        critical_low = products[products['stock_status'].isin(['Critical', 'Low'])]
+        
+        if not critical_low.empty:
+            st.subheader("Products Requiring Attention")
+            
+            with instrument.span('Products Requiring Attention: figure'):
+                fig = px.bar(
+                    critical_low,
+                    x='name',
+                    y=['current_stock', 'optimal_stock'],
+                    barmode='group',
+                    color_discrete_map={'current_stock': '#e74c3c', 'optimal_stock': '#3498db'},
+                    labels={'name': 'Product', 'value': 'Units'}
+                )
+                fig.update_layout(
+                    xaxis_title='',
+                    yaxis_title='Stock Units',
+                    legend_title=''
+                )
+            charts.plotly_chart(fig, 'Products Requiring Attention', use_container_width=True)
+    
+    with inv_tab3:
+        st.subheader("Reorder Recommendations")
+        
+        # Build reorder recommendations from the inventory plan
+        with instrument.span('Reorder Recommendations: prep'):
+            reorder_df = inventory.reorder_recommendations(products)
+        
+        if not reorder_df.empty:
+            # Display reorder recommendations
+            st.dataframe(
+                reorder_df,
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            # Summary
+            total_items = len(reorder_df)
+            total_quantity = reorder_df['reorder_quantity'].sum()
+            high_priority = len(reorder_df[reorder_df['priority'] == 'High'])
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("Items to Reorder", total_items)
+            
+            with col2:
+                st.metric("Total Quantity", total_quantity)
+            
+            with col3:
+                st.metric("High Priority Items", high_priority)
+        
+        else:
+            st.info("No reorder recommendations at this time.")
+        
+        # Reorder points and order-up-to levels tuned by Monte Carlo simulation
+        st.subheader("Policy Tuning")
+        
+        if st.toggle("Tune reorder policies by simulation", key='inventory_tune_policies'):
+            def tune_store_policies():
+                search = policy.search_plan(products, seed=state.DEMO_SEED)
+                plan_policy = search.candidates[search.candidates['candidate'] == policy.PLAN_CANDIDATE].set_index('row')
+                best = search.best()
+                current = products['current_stock'].to_numpy()[best['row']]
+                reorder_point = best['reorder_point'].to_numpy()
+                return pd.DataFrame({
+                    'product': products['name'].to_numpy()[best['row']],
+                    'plan_reorder_point': plan_policy.loc[best['row'], 'reorder_point'].to_numpy(),
+                    'tuned_reorder_point': reorder_point,
+                    'plan_order_up_to': plan_policy.loc[best['row'], 'order_up_to'].to_numpy(),
+                    'tuned_order_up_to': best['order_up_to'].to_numpy(),
+                    'tuned_reorder_quantity': np.where(current <= reorder_point, best['order_up_to'].to_numpy() - current, 0),
+                    'plan_cost': plan_policy.loc[best['row'], 'total_cost_mean'].to_numpy().round(0),
+                    'tuned_cost': best['total_cost_mean'].round(0).to_numpy(),
+                    'tuned_cost_p95': best['total_cost_p95'].round(0).to_numpy(),
+                    'scenarios': best['scenarios'].to_numpy(),
+                })
+            
+            with instrument.span('Policy Tuning: search'):
+                tuned = state.cached('inventory/policies', tune_store_policies, store=selected_store)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.metric("Expected Cost (plan)", f"₹{tuned['plan_cost'].sum():,.0f}")
+            
+            with col2:
+                st.metric("Expected Cost (tuned)", f"₹{tuned['tuned_cost'].sum():,.0f}",
+                          delta=f"{tuned['tuned_cost'].sum() - tuned['plan_cost'].sum():,.0f}", delta_color="inverse")
+            
+            st.dataframe(tuned, use_container_width=True, hide_index=True)
+            st.caption(f"Costs over {policy.DEFAULT_HORIZON_DAYS} days of simulated demand: lost sales, expired stock "
+                       f"and holding. Candidates clearly beaten on early scenarios are dropped before more are drawn.")
+    
+    with inv_tab4:
+        st.subheader("Inter-store Transfers & Warehouse Dispatch")
+        
+        with instrument.span('Stock Transfers: prep'):
+            transfers, transfer_summary = state.plan_store_transfers()
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Network Shortfall (units)", transfer_summary['shortfall_before'],
+                      delta=transfer_summary['shortfall_after'] - transfer_summary['shortfall_before'],
+                      delta_color="inverse")
+        
+        with col2:
+            st.metric("Units from Nearby Stores", transfer_summary['store_transfer_units'])
+        
+        with col3:
+            st.metric("Units from Warehouse", transfer_summary['warehouse_units'])
+        
+        # Transfers touching the selected store
+        store_transfers = transfers[(transfers['from'] == selected_store) | (transfers['to'] == selected_store)]
+        
+        if not store_transfers.empty:
+            st.dataframe(
+                store_transfers.sort_values(['from', 'units'], ascending=[True, False]),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info(f"No transfers planned for {selected_store}.")
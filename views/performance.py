@@ -0,0 +1,61 @@
+"""Performance page (hidden): per-section latency, allocations and slowest reruns."""
+import pandas as pd
+import streamlit as st
+
+from views import instrument
+
+
+def render():
+    st.markdown("<h1 class='main-header'>Performance</h1>", unsafe_allow_html=True)
+
+    st.markdown("""
+    Timing spans wrap each page's data loading, data preparation, figure building and chart
+    serialization. Recording is per session; samples from every recording session are pooled.
+    """)
+
+    # Session settings, applied from the next rerun on. Widget state is dropped while
+    # this page is not shown, so the toggles are re-seeded from the saved settings.
+    settings = st.session_state.setdefault('perf_settings', {})
+    toggles = [
+        ('spans', "Record timing spans"),
+        ('tracemalloc', "Track allocations (tracemalloc)"),
+        ('cprofile', "Capture cProfile"),
+    ]
+    for column, (name, label) in zip(st.columns(len(toggles)), toggles):
+        key = f'perf_{name}'
+        if key not in st.session_state:
+            st.session_state[key] = settings.get(name, False)
+        with column:
+            settings[name] = st.toggle(label, key=key, disabled=name != 'spans' and not settings.get('spans'))
+
+    recorder = instrument.recorder()
+    if st.button("Reset samples"):
+        recorder.clear()
+        st.session_state.pop('perf_profile', None)
+
+    # Latency by section
+    st.subheader("Sections")
+
+    sections = pd.DataFrame(recorder.section_stats())
+    if sections.empty:
+        st.info("No samples yet. Turn on recording and browse the other pages.")
+    else:
+        st.dataframe(sections.round(2), use_container_width=True, hide_index=True)
+
+    # Slowest reruns with their top sections
+    st.subheader("Slowest Reruns")
+
+    slowest = recorder.slowest_reruns()
+    if slowest:
+        st.dataframe(pd.DataFrame({
+            'page': [run['page'] for run in slowest],
+            'total_ms': [round(run['ms'], 1) for run in slowest],
+            'top_sections': [
+                ', '.join(f"{name} {ms:.0f} ms" for name, ms in sorted(run['spans'], key=lambda s: -s[1])[:3])
+                for run in slowest
+            ],
+        }), use_container_width=True, hide_index=True)
+
+    if 'perf_profile' in st.session_state:
+        st.subheader("Last cProfile Capture")
+        st.code(st.session_state['perf_profile'], language=None)
@@ -0,0 +1,276 @@
+"""Customer Segmentation page."""
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from smartcart import rollups
+from views import charts, instrument, state
+
+
+def render():
+    st.markdown("<h1 class='main-header'>Customer Segmentation & Personalization</h1>", unsafe_allow_html=True)
+    
+    st.markdown("""
+    SmartCart uses K-means clustering and behavioral analysis to segment customers into meaningful groups,
+    enabling personalized recommendations and targeted marketing strategies.
+    """)
+    
+    # Tabs for different views
+    segment_tab1, segment_tab2, segment_tab3 = st.tabs(["Segment Overview", "Behavioral Analysis", "Recommendation Strategies"])
+    
+    with segment_tab1:
+        st.subheader("Customer Segment Overview")
+        
+        # Use segment data from earlier
+        with instrument.span('Customer Segmentation: data'):
+            segment_df = state.fit_customer_segments()['summary']
+        
+        # Pie chart for segment distribution
+        with instrument.span('Segment Distribution: figure'):
+            fig = px.pie(
+                segment_df,
+                values='size',
+                names='name',
+                hole=0.4,
+                color_discrete_sequence=px.colors.qualitative.Set2
+            )
+            fig.update_layout(
+                legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5)
+            )
+        charts.plotly_chart(fig, 'Segment Distribution', use_container_width=True)
+        
+        # Segment characteristics
+        st.subheader("Segment Characteristics")
+        
+        # Create a radar chart for each segment
+        metrics = ['order_frequency', 'avg_order_value', 'retention_rate']
+        
+        # Normalize values for radar chart
+        with instrument.span('Segment Characteristics: prep'):
+            normalized_df = segment_df.copy()
+            for metric in metrics:
+                normalized_df[metric] = normalized_df[metric] / normalized_df[metric].max() * 100
+        
+        # Create radar chart
+        with instrument.span('Segment Characteristics: figure'):
+            fig = go.Figure()
+        
+            for i, row in normalized_df.iterrows():
+                fig.add_trace(go.Scatterpolar(
+                    r=[row[metric] for metric in metrics],
+                    theta=['Order Frequency', 'Order Value', 'Retention Rate'],
+                    fill='toself',
+                    name=row['name']
+                ))
+        
+            fig.update_layout(
+                polar=dict(
+                    radialaxis=dict(
+                        visible=True,
+                        range=[0, 100]
+                    )
+                ),
+                showlegend=True,
+                legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5)
+            )
+        
+        charts.plotly_chart(fig, 'Segment Characteristics', use_container_width=True)
+    
+    with segment_tab2:
+        st.subheader("Customer Behavioral Analysis")
+        
+        # Orders per day by segment and time of day from the order log
+        hour_ranges = rollups.HOUR_RANGES
+        with instrument.span('Behavioral Heatmap: prep'):
+            behavior = state.build_segment_behavior()
+            heatmap_df = state.cached('segments/heatmap', lambda: behavior.by_hour_range().loc[segment_df['name']],
+                                      version=behavior.version)
+        
+        with instrument.span('Behavioral Heatmap: figure'):
+            fig = px.imshow(
+                heatmap_df,
+                labels=dict(x="Time of Day", y="Customer Segment", color="Order Volume"),
+                x=hour_ranges,
+                y=segment_df['name'],
+                color_continuous_scale="Viridis"
+            )
+            fig.update_layout(
+                xaxis_title="Time of Day",
+                yaxis_title="Customer Segment",
+                coloraxis_colorbar=dict(title="Order Volume")
+            )
+        charts.plotly_chart(fig, 'Behavioral Heatmap', use_container_width=True)
+        
+        st.markdown("""
+        **Behavioral Insights:**
+        - High-value shoppers show strong evening purchasing patterns (6 PM - midnight)
+        - Regular customers peak during evening hours (6-9 PM)
+        - New users show more distributed purchasing patterns throughout the day
+        - Weekend purchasing is 35% higher across all segments
+        """)
+        
+        # Category preferences by segment
+        st.subheader("Category Preferences by Segment")
+        
+        # Share of each segment's orders per category, 100 for its favourite
+        with instrument.span('Category Preferences: prep'):
+            category_pref_df = state.cached('segments/categories', lambda: (
+                behavior.category_preferences()
+                .set_index('segment').loc[segment_df['name']].reset_index()
+            ), version=behavior.version)
+        
+        # Create grouped bar chart
+        with instrument.span('Category Preferences: figure'):
+            fig = px.bar(
+                category_pref_df,
+                x='category',
+                y='preference',
+                color='segment',
+                barmode='group',
+                labels={'category': 'Product Category', 'preference': 'Preference Score'},
+                color_discrete_sequence=px.colors.qualitative.Set2
+            )
+            fig.update_layout(
+                xaxis_title='',
+                yaxis_title='Preference Score',
+                legend_title=''
+            )
+        charts.plotly_chart(fig, 'Category Preferences', use_container_width=True)
+    
+    with segment_tab3:
+        st.subheader("Personalization Strategies")
+        
+        # Sample personalization strategies
+        st.markdown("""
+        <div class='card' style='margin-bottom: 1rem;'>
+            <h3>High-value Shoppers</h3>
+            <p><strong>Strategy:</strong> Premium Product Recommendations & Early Access</p>
+            <p>Target with premium products, organic options, and early access to new items. 
+            Personalized notifications for restocking of frequently purchased items.</p>
+            <p><strong>Engagement Rate:</strong> <span class='highlight'>78%</span></p>
+        </div>
+        
+        <div class='card' style='margin-bottom: 1rem;'>
+            <h3>Regular Customers</h3>
+            <p><strong>Strategy:</strong> Subscription Offers & Bundle Discounts</p>
+            <p>Encourage recurring purchases with subscription offers for regular items.
+            Bundle recommendations based on purchase history to increase basket size.</p>
+            <p><strong>Engagement Rate:</strong> <span class='highlight'>65%</span></p>
+        </div>
+        
+        <div class='card' style='margin-bottom: 1rem;'>
+            <h3>Occasional Buyers</h3>
+            <p><strong>Strategy:</strong> Limited-time Offers & Re-engagement Campaigns</p>
+            <p>Flash sales and limited-time offers aligned with previous purchase categories.
+            Re-engagement campaigns with targeted incentives during typical purchase times.</p>
+            <p><strong>Engagement Rate:</strong> <span class='highlight'>42%</span></p>
+        </div>
+        
+        <div class='card'>
+            <h3>New Users</h3>
+            <p><strong>Strategy:</strong> Onboarding Promotions & Discovery Suggestions</p>
+            <p>First-time purchase incentives and guided product discovery based on initial browsing behavior.
+            Educational content about quick commerce benefits and express delivery options.</p>
+            <p><strong>Engagement Rate:</strong> <span class='highlight'>53%</span></p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Bundle candidates: products bought together more often than chance
+        st.subheader("Frequently Bought Together")
+        
+        product_names = state.generate_demo_data()['product_data']['name']
+        product = st.selectbox("Product:", product_names.tolist())
+        with instrument.span('Frequently Bought Together: prep'):
+            related_df = state.build_product_affinity().frame(product_names.tolist().index(product), product_names)
+        
+        with instrument.span('Frequently Bought Together: figure'):
+            fig = px.bar(
+                related_df,
+                x='name',
+                y='lift',
+                hover_data=['baskets'],
+                labels={'name': 'Product', 'lift': 'Lift', 'baskets': 'Baskets'},
+                color_discrete_sequence=['#2ecc71']
+            )
+            fig.add_hline(y=1, line_dash='dot', line_color='grey')
+            fig.update_layout(
+                xaxis_title='',
+                yaxis_title='Lift'
+            )
+        charts.plotly_chart(fig, 'Frequently Bought Together', use_container_width=True)
+        st.caption("Lift is how much more often two products share a basket than if they were bought independently; "
+                   "above the dotted line they make bundle candidates.")
+        
+        # ROI and impact visualization
+        st.subheader("Personalization Impact")
+        
+        with instrument.span('Personalization Impact: prep'):
+            impact_data = pd.DataFrame({
+                'segment': segment_df['name'],
+                'engagement_lift': [78, 65, 42, 53],
+                'revenue_lift': [35, 28, 15, 22],
+                'retention_lift': [25, 18, 12, 15]
+            })
+        
+            # Melt the dataframe for grouped bar chart
+            impact_melted = impact_data.melt(
+                id_vars='segment',
+                value_vars=['engagement_lift', 'revenue_lift', 'retention_lift'],
+                var_name='metric',
+                value_name='percentage'
+            )
+        
+            # Clean up the metric names
+            impact_melted['metric'] = impact_melted['metric'].apply(lambda x: x.replace('_lift', '').title())
+        
+        # Create grouped bar chart
+        with instrument.span('Personalization Impact: figure'):
+            fig = px.bar(
+                impact_melted,
+                x='segment',
+                y='percentage',
+                color='metric',
+                barmode='group',
+                labels={'segment': 'Customer Segment', 'percentage': 'Lift (%)'},
+                color_discrete_sequence=['#3498db', '#2ecc71', '#9b59b6']
+            )
+            fig.update_layout(
+                xaxis_title='',
+                yaxis_title='Improvement (%)',
+                legend_title=''
+            )
+        charts.plotly_chart(fig, 'Personalization Impact', use_container_width=True)
+        
+        # Live lookup through the checkout scoring service
+        st.subheader("Live Segment Lookup")
+        
+        scorer = state.load_segment_scorer()
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            customer_id = st.text_input("Customer ID", "CUST-1001")
+        
+        with col2:
+            recency = st.number_input("Days since last order", min_value=0.0, value=4.0)
+        
+        with col3:
+            frequency = st.number_input("Orders per week", min_value=0.0, value=2.5)
+        
+        with col4:
+            order_value = st.number_input("Avg order value (₹)", min_value=0.0, value=300.0)
+        
+        segment = scorer.assign(customer_id, [recency, frequency, order_value])
+        st.markdown(f"**{customer_id}** belongs to <span class='highlight'>{segment}</span>", unsafe_allow_html=True)
+        
+        scorer_metrics = scorer.metrics()
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("p99 Latency", f"{scorer_metrics['p99_latency_ms']:.3f} ms")
+        
+        with col2:
+            st.metric("Throughput", f"{scorer_metrics['throughput_rows_per_s']:,.0f} /s")
+        
+        with col3:
+            st.metric("Cache Hit Rate", f"{scorer_metrics['cache_hit_rate']:.0%}")
@@ -0,0 +1,218 @@
+"""Cached data and models shared by the page modules.
+
+Everything here is built once per process (``st.cache_data`` /
+``st.cache_resource``) on the first page that asks for it.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from smartcart import affinity, allocation, cache, datagen, expiry, forecasting, geo, inventory, live, rollups, scoring, segmentation, stream
+
+# Seed for the simulated demo data
+DEMO_SEED = 42
+
+# Optional directory for forecaster checkpoints; a restarted app resumes from them
+CHECKPOINT_DIR = os.environ.get('SMARTCART_CHECKPOINT_DIR')
+
+# Optional directory for the page cache's disk tier, shared across restarts
+CACHE_DIR = os.environ.get('SMARTCART_CACHE_DIR')
+
+# Days replayed by the expiry and wastage simulation
+SIMULATION_DAYS = 90
+
+
+# Generate sample data for demo
+@st.cache_data
+def generate_demo_data():
+    return datagen.generate_demo_data(datagen.SizeConfig(), seed=DEMO_SEED)
+
+# Fit the seasonal forecasters once per process; every session reads from them.
+# A checkpoint from the same seed and size config is warm-started with only the
+# hours since it was saved, and re-saved after that update
+@st.cache_resource
+def fit_demand_forecasters():
+    data = generate_demo_data()
+    start = np.datetime64(data['hourly_data']['timestamp'].iloc[0], 'h')
+    histories = {'store': data['store_demand'], 'category': data['category_demand']}
+    data_key = f'{DEMO_SEED}:{datagen.SizeConfig()}'
+    
+    forecasters = {}
+    for name, history in histories.items():
+        checkpoint = os.path.join(CHECKPOINT_DIR, f'{name}_forecaster.npz') if CHECKPOINT_DIR else None
+        model = forecasting.load_checkpoint(checkpoint, data_key) if checkpoint else None
+        # Hours of this history the checkpoint has already absorbed
+        seen = 0 if model is None else int((model.end - start).astype(np.int64)) + 1
+        if 0 < seen <= history.shape[1]:
+            if seen < history.shape[1]:
+                model.update(history[:, seen:])
+        else:
+            model = forecasting.SeasonalForecaster().fit(history, start)
+        if checkpoint:
+            os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+            model.save(checkpoint, data_key=np.array(data_key))
+        forecasters[name] = model
+    return forecasters
+
+# Store x SKU forecaster fit from the streamed sales history, which is never materialized
+@st.cache_resource
+def fit_sku_forecaster():
+    config = datagen.SizeConfig()
+    end = generate_demo_data()['hourly_data']['timestamp'].iloc[-1]
+    profile, = stream.consume(
+        stream.iter_sales_chunks(config, DEMO_SEED, end=end),
+        stream.WeeklyProfile(config.n_stores, config.n_skus, by='store_sku')
+    )
+    return forecasting.SeasonalForecaster().fit_weekly(profile.mean(), end, profile.counts, profile.square_mean())
+
+# Inventory plan for every store x SKU from the store x SKU forecast quantiles
+@st.cache_data
+def plan_network_inventory():
+    data = generate_demo_data()
+    product_data = data['product_data']
+    n_stores, n_skus = data['stock_on_hand'].shape
+    
+    rows = product_data.iloc[np.tile(np.arange(n_skus), n_stores)].reset_index(drop=True)
+    plan = inventory.plan_inventory(
+        rows,
+        data['stock_on_hand'].ravel(),
+        daily_quantiles=fit_sku_forecaster().predict_quantiles(24, total=True),
+        quantile_levels=forecasting.DEFAULT_QUANTILES
+    )
+    plan['store'] = np.repeat(data['store_data']['name'].to_numpy(), n_skus)
+    return plan
+
+# Plan inter-store transfers and warehouse dispatch for the whole network
+@st.cache_data
+def plan_store_transfers():
+    data = generate_demo_data()
+    n_stores, n_skus = data['stock_on_hand'].shape
+    target = plan_network_inventory()['optimal_stock'].to_numpy().reshape(n_stores, n_skus)
+    
+    allocation_plan = allocation.plan_allocation(
+        data['store_data']['lat'],
+        data['store_data']['lon'],
+        data['stock_on_hand'],
+        target
+    )
+    transfers = allocation.label_transfers(allocation_plan.transfers, data['store_data']['name'], data['product_data']['name'])
+    return transfers, allocation_plan.summary()
+
+# Replay the network plan with FIFO expiry; per-store fill, in-stock and wastage rates
+@st.cache_data
+def simulate_expiry(n_days=SIMULATION_DAYS):
+    plan = plan_network_inventory()
+    result = expiry.simulate_plan(plan, n_days=n_days, seed=DEMO_SEED)
+    by_store = pd.DataFrame({
+        'store': plan['store'],
+        'demand': result.demand,
+        'sold': result.sold,
+        'wasted': result.wasted,
+        'stockout_days': result.stockout_days.astype(np.int64),
+    }).groupby('store', sort=False).sum()
+    by_store['fill_rate'] = by_store['sold'] / by_store['demand'].clip(lower=1)
+    by_store['in_stock_rate'] = 1 - by_store['stockout_days'] / (n_days * plan.groupby('store', sort=False).size())
+    by_store['wastage_rate'] = by_store['wasted'] / (by_store['sold'] + by_store['wasted']).clip(lower=1)
+    return by_store, result.daily
+
+# Segment the simulated customer base with mini-batch K-means
+@st.cache_resource
+def fit_customer_segments():
+    config = datagen.SizeConfig()
+    features = datagen.generate_customer_features(config, datagen.table_rngs(DEMO_SEED)['customers'])
+    chunks = segmentation.FeatureChunks([features])
+    model = segmentation.MiniBatchKMeans(seed=DEMO_SEED).fit(chunks)
+    labels = segmentation.predict_chunks(model, chunks)
+    names = segmentation.cluster_names(model.cluster_centers())
+    return {
+        'model': model,
+        'names': names,
+        'summary': segmentation.segment_summary(chunks, labels, names)
+    }
+
+# Checkout-time segment scorer shared by every session
+@st.cache_resource
+def load_segment_scorer():
+    segments = fit_customer_segments()
+    return scoring.SegmentScorer(segments['model'], segments['names'])
+
+# Rollup cubes the charts read from; new data is folded in incrementally
+@st.cache_resource
+def build_rollups():
+    data = generate_demo_data()
+    cubes = rollups.RollupCubes(
+        data['store_data']['name'],
+        datagen.FORECAST_CATEGORIES,
+        datagen.SEGMENT_NAMES
+    )
+    timestamps = data['hourly_data']['timestamp'].to_numpy()
+    cubes.update_hourly(data['hourly_data'])
+    cubes.store.update_matrix(timestamps, data['store_demand'])
+    cubes.category.update_matrix(timestamps, data['category_demand'])
+    cubes.update_orders(load_order_log())
+    return cubes
+
+# Simulated order log (customer, segment, timestamp, basket category), the same orders
+# build_segment_behavior streams
+@st.cache_data
+def load_order_log():
+    chunks = stream.iter_order_chunks(datagen.SizeConfig(), DEMO_SEED)
+    return pd.concat(chunks, ignore_index=True).sort_values('timestamp', kind='stable', ignore_index=True)
+
+# Segment x hour range x category order counts behind the Behavioral Analysis charts,
+# folded in chunk by chunk so the log is never held whole
+@st.cache_resource
+def build_segment_behavior():
+    behavior, = stream.consume(
+        stream.iter_order_chunks(datagen.SizeConfig(), DEMO_SEED),
+        rollups.SegmentBehavior(datagen.SEGMENT_NAMES, datagen.ORDER_CATEGORIES)
+    )
+    return behavior
+
+# Nearest serviceable store and estimated delivery time for every order
+@st.cache_data
+def estimate_deliveries():
+    config = datagen.SizeConfig()
+    store_data = generate_demo_data()['store_data']
+    rngs = datagen.table_rngs(DEMO_SEED)
+    home_lat, home_lon = datagen.generate_customer_addresses(config, rngs['addresses'], store_data['lat'], store_data['lon'])
+    customers = load_order_log()['customer_id'].to_numpy()
+    
+    index = geo.StoreIndex(store_data['lat'], store_data['lon'])
+    store, distance_km = geo.assign_orders(index, home_lat[customers], home_lon[customers])
+    served = store >= 0
+    minutes = geo.delivery_minutes(distance_km[served], rngs['addresses'])
+    buckets = pd.DataFrame({'time': geo.DELIVERY_BUCKETS, 'count': geo.delivery_buckets(minutes)})
+    return buckets, float(1 - served.mean())
+
+# Related-product index from basket co-occurrence in the simulated orders
+@st.cache_resource
+def build_product_affinity():
+    config = datagen.SizeConfig()
+    matrix = affinity.build_cooccurrence(affinity.iter_basket_chunks(config, DEMO_SEED), config.n_skus)
+    return matrix.top_k(k=5)
+
+# Page results shared by every session, keyed by (page, store, date, data version).
+# The version is that of the data the result is computed from: the rollup cubes
+# unless the caller passes another source's
+@st.cache_resource
+def page_cache():
+    return cache.ResultCache(disk_dir=CACHE_DIR)
+
+def cached(page, compute, store=None, date=None, version=None):
+    version = build_rollups().version if version is None else version
+    key = (page, store, None if date is None else str(date), f'{DEMO_SEED}:{version}')
+    return page_cache().get_or_compute(key, compute)
+
+# Live KPI feed polled by one background thread per process and shared by every viewer
+@st.cache_resource
+def live_feed():
+    source = live.SimulatedOrderSource(seed=DEMO_SEED)
+    feed = live.LiveFeed(source)
+    # Back-fill one KPI window so the tiles are steady from the first view
+    now = np.datetime64('now', 's')
+    for seconds_ago in range(live.KPI_WINDOW_TICKS, 0, -1):
+        feed.publish(source.poll(now - np.timedelta64(seconds_ago, 's')))
+    return feed.start()